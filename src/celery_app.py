@@ -1,8 +1,9 @@
 from celery import Celery
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 from helpers.config import get_settings
+from helpers.database import create_db_engine
 from stores.llm.LLMProviderFactory import LLMProviderFactory
 from stores.llm.templates.template_parser import TemplateParser
 from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
@@ -13,8 +14,7 @@ settings = get_settings()
 async def get_startup_setup():
     settings = get_settings()
 
-    postgres_conn = f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
-    db_engine = create_async_engine(postgres_conn)
+    db_engine = create_db_engine(settings)
     db_client = sessionmaker(
         db_engine,
         class_=AsyncSession,
@@ -66,6 +66,8 @@ celery_app = Celery(
         "tasks.data_indexing",
         "tasks.process_workflow",
         "tasks.maintenance",
+        "tasks.vector_indexing",
+        "tasks.collection_snapshots",
     ],
 )
 
@@ -91,6 +93,15 @@ celery_app.conf.update(
     task_routes={
         "tasks.file_processing.process_project_files": {"queue": "file_processing"},
         "tasks.data_indexing.task_index_project": {"queue": "index_project"},
+        "tasks.vector_indexing.task_build_vector_index": {"queue": "vector_index"},
+        "tasks.vector_indexing.task_swap_collection_alias": {"queue": "vector_index"},
+        "tasks.vector_indexing.task_drop_collection": {"queue": "vector_index"},
+        "tasks.collection_snapshots.task_export_collection_snapshot": {
+            "queue": "vector_index"
+        },
+        "tasks.collection_snapshots.task_import_collection_snapshot": {
+            "queue": "vector_index"
+        },
         "tasks.process_workflow.process_and_push_workflow": {
             "queue": "process_push_workflow"
         },
@@ -1,16 +1,42 @@
+import hashlib
 import json
+import logging
 import time
+import uuid
 import asyncio
 
-from models.db_schemas import DataChunk, Project
+import numpy as np
+
+from models import CollectionAliasModel, EmbeddingCacheModel
+from models.db_schemas import DataChunk, Project, RetrievedDocument
 from stores.llm.LLMEnums import DocumentTypeEnum
+from stores.vectordb.VectorDBEnums import SearchQualityEnums
+from stores.vectordb.SearchResultCache import SearchResultCache
+from utils.metrics import (
+    EMBEDDING_CACHE_REQUESTS,
+    SEARCH_CACHE_REQUESTS,
+    SEARCH_LATENCY,
+)
 
 from .BaseController import BaseController
 
 
 class NLPController(BaseController):
+    # ANN recall/latency presets: HNSW ef_search and IVFFlat probes
+    search_quality_presets = {
+        SearchQualityEnums.FAST.value: {"ef_search": 20, "probes": 1},
+        SearchQualityEnums.BALANCED.value: {"ef_search": 64, "probes": 10},
+        SearchQualityEnums.ACCURATE.value: {"ef_search": 200, "probes": 40},
+    }
+
     def __init__(
-        self, vectordb_client, generation_client, embedding_client, template_parser
+        self,
+        vectordb_client,
+        generation_client,
+        embedding_client,
+        template_parser,
+        search_cache: SearchResultCache | None = None,
+        db_client=None,
     ):
         super().__init__()
 
@@ -18,57 +44,309 @@ class NLPController(BaseController):
         self.generation_client = generation_client
         self.embedding_client = embedding_client
         self.template_parser = template_parser
+        self.search_cache = search_cache
+        # Without the app database, collections are never aliased
+        self.collection_alias_model = (
+            CollectionAliasModel(db_client) if db_client is not None else None
+        )
+        self.embedding_cache_model = (
+            EmbeddingCacheModel(db_client)
+            if db_client is not None and self.app_settings.EMBEDDING_CACHE_ENABLED
+            else None
+        )
+        # Lookups of this controller, reported by the indexing tasks
+        self.embedding_cache_stats = {"hits": 0, "misses": 0}
+
+        self.logger = logging.getLogger("uvicorn")
 
     def create_collection_name(self, project_id: str):
         return f"collection_{self.vectordb_client.default_vector_size}_{project_id}".strip()
 
-    def reset_vector_db_collection(self, project: Project):
-        collection_name = self.create_collection_name(project_id=project.project_id)
-        return self.vectordb_client.delete_collection(collection_name=collection_name)
+    def create_collection_alias_name(self, project_id: str):
+        return f"collection_{project_id}".strip()
 
-    async def get_vector_db_collection_info(self, project: Project):
-        collection_name = self.create_collection_name(project_id=project.project_id)
-        collection_info = await self.vectordb_client.get_collection_info(
+    def create_shadow_collection_name(self, project_id: str, embedding_size: int):
+        # Kept short: Postgres truncates identifiers (index names derived
+        # from the collection name included) past 63 characters
+        project_key = str(project_id).replace("-", "")
+        # The random suffix keeps rebuilds started within a second apart
+        return (
+            f"c{embedding_size}_{project_key}_{int(time.time()):x}"
+            f"{uuid.uuid4().hex[:8]}"
+        )
+
+    async def get_collection_name(self, project: Project) -> str:
+        """
+        Resolve the collection serving the project: the target of its alias
+        once a blue/green rebuild swapped one in, the original collection
+        name before that.
+        """
+        if self.collection_alias_model is not None:
+            collection_name = await self.collection_alias_model.get_collection_name(
+                self.create_collection_alias_name(project_id=project.project_id)
+            )
+            if collection_name is not None:
+                return collection_name
+
+        return self.create_collection_name(project_id=project.project_id)
+
+    async def reset_vector_db_collection(self, project: Project):
+        collection_name = await self.get_collection_name(project=project)
+        return await self.vectordb_client.delete_collection(
             collection_name=collection_name
         )
 
+    async def delete_chunks_from_vector_db(self, project: Project, chunks_ids: list):
+        """
+        Remove the given chunks from the project collections, one bulk delete
+        per collection; returns None when the provider can't delete single
+        records.
+        """
+        if not callable(getattr(self.vectordb_client, "delete_records", None)):
+            return None
+
+        collection_names = [await self.get_collection_name(project=project)]
+        if self.collection_alias_model is not None:
+            # Swapped-out collections waiting to be dropped, and rebuilds not
+            # swapped in yet, still reference the chunks
+            alias_name = self.create_collection_alias_name(
+                project_id=project.project_id
+            )
+            collection_names += (
+                await self.collection_alias_model.get_retired_collection_names(
+                    alias_name
+                )
+            )
+            collection_names += (
+                await self.collection_alias_model.get_shadow_collection_names(
+                    alias_name
+                )
+            )
+
+        deleted_count = 0
+        for collection_name in dict.fromkeys(collection_names):
+            deleted_count += await self.vectordb_client.delete_records(
+                collection_name=collection_name, record_ids=chunks_ids
+            )
+        return deleted_count
+
+    async def get_vector_db_collection_info(
+        self, project: Project, exact_count: bool = False
+    ):
+        collection_name = await self.get_collection_name(project=project)
+        collection_info = await self.vectordb_client.get_collection_info(
+            collection_name=collection_name, exact_count=exact_count
+        )
+
         return json.loads(json.dumps(collection_info, default=lambda x: x.__dict__))
 
+    def get_content_hash(self, text: str, metadata: dict | None) -> str:
+        content = json.dumps(
+            {"text": text, "metadata": metadata or {}}, sort_keys=True, default=str
+        )
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
     async def index_into_vector_db(
         self,
         project: Project,
         chunks: list[DataChunk],
         chunks_ids: list[int],
         is_reset: bool = False,
+        collection_name: str | None = None,
     ):
-        collection_name = self.create_collection_name(project_id=project.project_id)
-        texts = [c.chunk_text for c in chunks]
-        metadatas = [c.chunk_metadata for c in chunks]
-
-        vectors = self.embedding_client.embed_text(
-            text=texts,
-            document_type=DocumentTypeEnum.DOCUMENT.value,
+        # Rebuilds pass the shadow collection they are loading
+        collection_name = collection_name or await self.get_collection_name(
+            project=project
         )
+        texts = [c.chunk_text for c in chunks]
+        # Keep the asset id on every vector so searches can be scoped to a file
+        metadatas = [
+            {**(c.chunk_metadata or {}), "asset_id": c.chunk_asset_id} for c in chunks
+        ]
+        content_hashes = [
+            self.get_content_hash(text, metadata)
+            for text, metadata in zip(texts, metadatas)
+        ]
 
         _ = await self.vectordb_client.create_collection(
             collection_name=collection_name,
             is_reset=is_reset,
             embedding_size=self.embedding_client.embedding_size,
         )
-        _ = await self.vectordb_client.insert_many(
+
+        # Only embed chunks that are new or changed since they were indexed
+        indexed_hashes = {}
+        if callable(getattr(self.vectordb_client, "get_content_hashes", None)):
+            indexed_hashes = await self.vectordb_client.get_content_hashes(
+                collection_name=collection_name, record_ids=chunks_ids
+            )
+
+        changed = [
+            idx
+            for idx, chunk_id in enumerate(chunks_ids)
+            if indexed_hashes.get(chunk_id) != content_hashes[idx]
+        ]
+        if not changed:
+            return True
+
+        vectors = await self.embed_documents(texts=[texts[idx] for idx in changed])
+        if vectors is None:
+            return False
+
+        is_inserted = await self.vectordb_client.insert_many(
             collection_name=collection_name,
-            texts=texts,
-            metadata=metadatas,
+            texts=[texts[idx] for idx in changed],
+            metadata=[metadatas[idx] for idx in changed],
             vectors=vectors,
-            record_ids=chunks_ids,
+            record_ids=[chunks_ids[idx] for idx in changed],
+            content_hashes=[content_hashes[idx] for idx in changed],
+        )
+
+        return bool(is_inserted)
+
+    async def embed_documents(self, texts: list[str]) -> list | None:
+        """
+        Embed document texts, reusing the vectors cached for texts the same
+        embedding model already embedded: hits are fetched in one query and
+        only the misses go to the embedding provider.
+        """
+        if self.embedding_cache_model is None:
+            return self.embedding_client.embed_text(
+                text=texts, document_type=DocumentTypeEnum.DOCUMENT.value
+            )
+
+        cache_key = {
+            "embedding_backend": self.app_settings.EMBEDDING_BACKEND,
+            "embedding_model_id": self.embedding_client.embedding_model_id,
+            "embedding_size": int(self.embedding_client.embedding_size),
+        }
+        text_hashes = [self.embedding_cache_model.get_text_hash(text) for text in texts]
+
+        try:
+            cached_vectors = await self.embedding_cache_model.get_embeddings(
+                **cache_key, text_hashes=text_hashes
+            )
+        except Exception as e:
+            # The cache only saves calls; indexing goes on without it
+            self.logger.warning(f"Error while reading the embedding cache: {e}")
+            cached_vectors = {}
+
+        # Texts repeated within the batch are embedded once
+        missed_texts = {}
+        for text, text_hash in zip(texts, text_hashes):
+            if text_hash not in cached_vectors:
+                missed_texts.setdefault(text_hash, text)
+
+        hits_count = len(texts) - sum(
+            1 for text_hash in text_hashes if text_hash in missed_texts
         )
+        self.embedding_cache_stats["hits"] += hits_count
+        self.embedding_cache_stats["misses"] += len(texts) - hits_count
+        EMBEDDING_CACHE_REQUESTS.labels(result="hit").inc(hits_count)
+        EMBEDDING_CACHE_REQUESTS.labels(result="miss").inc(len(texts) - hits_count)
+
+        if missed_texts:
+            missed_vectors = self.embedding_client.embed_text(
+                text=list(missed_texts.values()),
+                document_type=DocumentTypeEnum.DOCUMENT.value,
+            )
+            if missed_vectors is None:
+                return None
+
+            try:
+                await self.embedding_cache_model.set_embeddings(
+                    **cache_key,
+                    text_hashes=list(missed_texts),
+                    vectors=missed_vectors,
+                )
+            except Exception as e:
+                self.logger.warning(f"Error while writing the embedding cache: {e}")
+
+            cached_vectors.update(
+                (text_hash, np.asarray(vector, dtype=np.float32))
+                for text_hash, vector in zip(missed_texts, missed_vectors)
+            )
+
+        return [cached_vectors[text_hash].tolist() for text_hash in text_hashes]
+
+    def get_search_params(
+        self,
+        limit: int,
+        search_quality: str | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> dict | None:
+        search_params = dict(self.search_quality_presets.get(search_quality, {}))
+
+        # Explicit values override the preset
+        if ef_search is not None:
+            search_params["ef_search"] = ef_search
+        if probes is not None:
+            search_params["probes"] = probes
+
+        if not search_params:
+            return None
+
+        # HNSW can't return more than ef_search candidates
+        if search_params.get("ef_search") is not None:
+            search_params["ef_search"] = max(search_params["ef_search"], limit)
+
+        return search_params
 
-        return True
+    def get_candidates_search_params(
+        self, search_params: dict | None, candidates_limit: int
+    ) -> dict | None:
+        # HNSW returns at most ef_search rows: raise it to the candidate pool
+        # unless the backend default already covers it
+        ef_search = (search_params or {}).get("ef_search")
+        if (
+            ef_search is None
+            and candidates_limit <= self.app_settings.VECTOR_DB_DEFAULT_EF_SEARCH
+        ):
+            return search_params
+
+        ef_search = max(ef_search or 0, candidates_limit)
+
+        # pgvector rejects larger values rather than searching a smaller pool
+        max_ef_search = getattr(self.vectordb_client, "max_ef_search", None)
+        if max_ef_search is not None and ef_search > max_ef_search:
+            self.logger.warning(
+                f"{candidates_limit} candidates need ef_search above "
+                f"{max_ef_search}: recall is capped"
+            )
+            ef_search = max_ef_search
+
+        return {**(search_params or {}), "ef_search": ef_search}
 
     async def search_vector_db_collection(
-        self, project: Project, text: str, limit: int = 10
+        self,
+        project: Project,
+        text: str,
+        limit: int = 10,
+        search_params: dict | None = None,
+        search_filter: dict | None = None,
+        hybrid: bool = False,
+        mmr_lambda: float | None = None,
     ):
-        collection_name = self.create_collection_name(project_id=project.project_id)
+        collection_name = await self.get_collection_name(project=project)
+
+        # Served from the cache, a repeated query skips embedding and search
+        cache_key = await self.get_search_cache_key(
+            collection_name=collection_name,
+            text=text,
+            limit=limit,
+            search_params=search_params,
+            search_filter=search_filter,
+            hybrid=hybrid,
+            mmr_lambda=mmr_lambda,
+        )
+        if cache_key is not None:
+            cached_results = self.search_cache.get(cache_key)
+            SEARCH_CACHE_REQUESTS.labels(
+                result="hit" if cached_results is not None else "miss"
+            ).inc()
+            if cached_results is not None:
+                return cached_results
 
         vectors = self.embedding_client.embed_text(
             text=text, document_type=DocumentTypeEnum.QUERY.value
@@ -83,18 +361,283 @@ class NLPController(BaseController):
         else:
             return False
 
-        results = await self.vectordb_client.search_by_vector(
-            collection_name=collection_name, vector=query_vector, limit=limit
+        # Diversification re-ranks a wider candidate pool, which needs the
+        # backend to return the candidates' vectors
+        diversify = mmr_lambda is not None and callable(
+            getattr(self.vectordb_client, "get_vectors", None)
+        )
+        candidates_limit = limit
+        if diversify:
+            candidates_limit = limit * self.app_settings.MMR_CANDIDATES_FACTOR
+            search_params = self.get_candidates_search_params(
+                search_params=search_params, candidates_limit=candidates_limit
+            )
+
+        search_started_at = time.perf_counter()
+
+        # Lexical search is only available on backends implementing it
+        if hybrid and callable(getattr(self.vectordb_client, "search_by_text", None)):
+            search_mode = "hybrid"
+            results = await self.hybrid_search(
+                collection_name=collection_name,
+                text=text,
+                query_vector=query_vector,
+                limit=candidates_limit,
+                search_params=search_params,
+                search_filter=search_filter,
+            )
+        else:
+            search_mode = "vector"
+            results = await self.vectordb_client.search_by_vector(
+                collection_name=collection_name,
+                vector=query_vector,
+                limit=candidates_limit,
+                search_params=search_params,
+                search_filter=search_filter,
+            )
+
+        if diversify and results:
+            results = await self.diversify_results(
+                collection_name=collection_name,
+                query_vector=query_vector,
+                results=results,
+                limit=limit,
+                mmr_lambda=mmr_lambda,
+            )
+
+        SEARCH_LATENCY.labels(mode=search_mode).observe(
+            time.perf_counter() - search_started_at
         )
 
         if not results:
             return False
 
+        results = json.loads(json.dumps(results, default=lambda x: x.__dict__))
+
+        if cache_key is not None:
+            self.search_cache.set(cache_key, results)
+
+        return results
+
+    async def get_search_cache_key(self, collection_name: str, text: str, **params):
+        """
+        Cache key of a search, tied to the current generation of the
+        collection so any write to it invalidates the cached results.
+        """
+        if self.search_cache is None or not self.search_cache.enabled:
+            return None
+
+        collection_generations = getattr(
+            self.vectordb_client, "collection_generations", None
+        )
+        if collection_generations is None:
+            return None
+
+        generation = await collection_generations.get(collection_name)
+        if generation is None:
+            return None
+
+        return self.search_cache.get_key(collection_name, generation, text, **params)
+
+    async def search_many_vector_db_collection(
+        self,
+        project: Project,
+        texts: list[str],
+        limit: int = 10,
+        search_params: dict | None = None,
+        search_filter: dict | None = None,
+    ):
+        collection_name = await self.get_collection_name(project=project)
+
+        # One embedding call for the whole batch
+        query_vectors = self.embedding_client.embed_text(
+            text=texts, document_type=DocumentTypeEnum.QUERY.value
+        )
+
+        if not query_vectors or len(query_vectors) != len(texts):
+            return False
+
+        search_started_at = time.perf_counter()
+
+        results = await self.vectordb_client.search_many(
+            collection_name=collection_name,
+            vectors=query_vectors,
+            limit=limit,
+            search_params=search_params,
+            search_filter=search_filter,
+        )
+
+        SEARCH_LATENCY.labels(mode="batch").observe(
+            time.perf_counter() - search_started_at
+        )
+
+        if results is None:
+            return False
+
         return json.loads(json.dumps(results, default=lambda x: x.__dict__))
 
-    async def answer_rag_question(self, project: Project, query: str, limit: int = 10):
+    async def hybrid_search(
+        self,
+        collection_name: str,
+        text: str,
+        query_vector: list,
+        limit: int,
+        search_params: dict | None = None,
+        search_filter: dict | None = None,
+    ) -> list[RetrievedDocument]:
+        # Over-fetch from both retrievers so the fusion has room to re-rank
+        candidates_limit = limit * self.app_settings.HYBRID_SEARCH_CANDIDATES_FACTOR
+        search_params = self.get_candidates_search_params(
+            search_params=search_params, candidates_limit=candidates_limit
+        )
+
+        vector_results, text_results = await asyncio.gather(
+            self.vectordb_client.search_by_vector(
+                collection_name=collection_name,
+                vector=query_vector,
+                limit=candidates_limit,
+                search_params=search_params,
+                search_filter=search_filter,
+            ),
+            self.vectordb_client.search_by_text(
+                collection_name=collection_name,
+                text=text,
+                limit=candidates_limit,
+                search_filter=search_filter,
+            ),
+        )
+
+        return self.fuse_results(
+            {"vector": vector_results or [], "lexical": text_results or []},
+            limit=limit,
+        )
+
+    def fuse_results(
+        self, ranked_results: dict[str, list[RetrievedDocument]], limit: int
+    ) -> list[RetrievedDocument]:
+        """
+        Reciprocal rank fusion: every retriever contributes 1 / (k + rank) for
+        each document it returned; the original scores are kept per signal.
+        """
+        rrf_k = self.app_settings.HYBRID_SEARCH_RRF_K
+        fused = {}
+
+        for signal, results in ranked_results.items():
+            for rank, document in enumerate(results, start=1):
+                key = (
+                    document.chunk_id
+                    if document.chunk_id is not None
+                    else document.text
+                )
+                entry = fused.setdefault(
+                    key, {"document": document, "score": 0.0, "scores": {}}
+                )
+                entry["score"] += 1.0 / (rrf_k + rank)
+                entry["scores"][signal] = document.score
+
+        ranked = sorted(fused.values(), key=lambda entry: entry["score"], reverse=True)
+
+        return [
+            RetrievedDocument(
+                text=entry["document"].text,
+                chunk_id=entry["document"].chunk_id,
+                score=entry["score"],
+                scores=entry["scores"],
+            )
+            for entry in ranked[:limit]
+        ]
+
+    async def diversify_results(
+        self,
+        collection_name: str,
+        query_vector: list,
+        results: list[RetrievedDocument],
+        limit: int,
+        mmr_lambda: float,
+    ) -> list[RetrievedDocument]:
+        candidates_vectors = await self.vectordb_client.get_vectors(
+            collection_name=collection_name,
+            record_ids=[
+                document.chunk_id
+                for document in results
+                if document.chunk_id is not None
+            ],
+        )
+
+        # Keep the relevance order when a candidate's vector is missing
+        if any(document.chunk_id not in candidates_vectors for document in results):
+            return results[:limit]
+
+        selected = self.select_mmr(
+            query_vector=query_vector,
+            candidates_vectors=[
+                candidates_vectors[document.chunk_id] for document in results
+            ],
+            limit=limit,
+            mmr_lambda=mmr_lambda,
+        )
+
+        return [results[idx] for idx in selected]
+
+    def select_mmr(
+        self,
+        query_vector: list,
+        candidates_vectors: list,
+        limit: int,
+        mmr_lambda: float,
+    ) -> list[int]:
+        """
+        Maximal marginal relevance: greedily pick the candidate maximizing
+        lambda * sim(query, c) - (1 - lambda) * max sim(c, selected), using
+        cosine similarities. Returns the candidate positions in pick order.
+        """
+        if len(candidates_vectors) == 0:
+            return []
+
+        candidates = np.asarray(candidates_vectors, dtype=np.float32)
+        candidates = candidates / np.maximum(
+            np.linalg.norm(candidates, axis=1, keepdims=True), 1e-12
+        )
+        query = np.asarray(query_vector, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+        relevance = candidates @ query
+        similarity = candidates @ candidates.T
+
+        selected = [int(np.argmax(relevance))]
+        available = np.ones(len(candidates), dtype=bool)
+        available[selected[0]] = False
+        max_similarity = similarity[selected[0]].copy()
+
+        while len(selected) < min(limit, len(candidates)):
+            mmr_scores = mmr_lambda * relevance - (1 - mmr_lambda) * max_similarity
+            mmr_scores[~available] = -np.inf
+
+            idx = int(np.argmax(mmr_scores))
+            selected.append(idx)
+            available[idx] = False
+            np.maximum(max_similarity, similarity[idx], out=max_similarity)
+
+        return selected
+
+    async def answer_rag_question(
+        self,
+        project: Project,
+        query: str,
+        limit: int = 10,
+        search_params: dict | None = None,
+        search_filter: dict | None = None,
+        hybrid: bool = False,
+        mmr_lambda: float | None = None,
+    ):
         retrieved_documents = await self.search_vector_db_collection(
-            project=project, text=query, limit=limit
+            project=project,
+            text=query,
+            limit=limit,
+            search_params=search_params,
+            search_filter=search_filter,
+            hybrid=hybrid,
+            mmr_lambda=mmr_lambda,
         )
 
         if not retrieved_documents:
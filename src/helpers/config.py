@@ -13,6 +13,13 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str
     POSTGRES_PORT: int
     POSTGRES_MAIN_DATABASE: str
+    POSTGRES_POOL_SIZE: int = 5
+    POSTGRES_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT: float = 30
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_POOL_PRE_PING: bool = True
+    POSTGRES_STATEMENT_CACHE_SIZE: int = 100
+    POSTGRES_PGBOUNCER_MODE: bool = False
 
     GENERATION_BACKEND: str
     EMBEDDING_BACKEND: str
@@ -33,8 +40,51 @@ class Settings(BaseSettings):
     VECTOR_DB_BACKEND_LITERAL: list[str] = None
     VECTOR_DB_BACKEND: str
     VECTOR_DB_PATH: str
+    VECTOR_DB_LOCAL_PATH: str = "local_vectors"
+    VECTOR_DB_HNSW_PATH: str = "hnsw_vectors"
+    VECTOR_DB_HNSW_M: int = 16
+    VECTOR_DB_HNSW_EF_CONSTRUCT: int = 128
+    VECTOR_DB_HNSW_EF_SEARCH: int = 64
+    VECTOR_DB_QDRANT_URL: str | None = None
+    VECTOR_DB_QDRANT_API_KEY: str | None = None
+    VECTOR_DB_QDRANT_PREFER_GRPC: bool = False
+    VECTOR_DB_QDRANT_UPLOAD_PARALLEL: int = 4
+    VECTOR_DB_QDRANT_QUANTIZATION: str | None = None
+    VECTOR_DB_QDRANT_QUANTIZATION_ALWAYS_RAM: bool = True
+    VECTOR_DB_QDRANT_QUANTIZATION_RESCORE: bool = True
+    VECTOR_DB_QDRANT_QUANTIZATION_OVERSAMPLING: float = 2.0
+    VECTOR_DB_QDRANT_ON_DISK: bool = False
+    VECTOR_DB_QDRANT_HNSW_M: int = 16
+    VECTOR_DB_QDRANT_HNSW_EF_CONSTRUCT: int = 100
+    VECTOR_DB_QDRANT_PAYLOAD_SCHEMAS: dict[str, str] = {}
     VECTOR_DB_DISTANCE_METHOD: str | None = None
     VECTOR_DB_PGVEC_INDEX_THRESHOLD: int = 100
+    VECTOR_DB_PGVEC_INSERT_MODE: str = "copy"
+    VECTOR_DB_COLLECTION_CACHE_TTL: int = 60
+    VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM: str = "512MB"
+    VECTOR_DB_PGVEC_INDEX_PARALLEL_WORKERS: int = 2
+    VECTOR_DB_PGVEC_INDEX_TYPE: str = "hnsw"
+    VECTOR_DB_PGVEC_INDEX_GROWTH_FACTOR: float = 2.0
+    VECTOR_DB_PGVEC_INDEX_MIN_REBUILD_ROWS: int = 10000
+    VECTOR_DB_PGVEC_ITERATIVE_SCAN: str | None = "relaxed_order"
+    VECTOR_DB_METADATA_INDEX_KEYS: list[str] = ["asset_id", "page"]
+    VECTOR_DB_PGVEC_TEXT_SEARCH_CONFIG: str = "simple"
+    VECTOR_DB_PGVEC_STORAGE_MODE: str = "vector"
+    VECTOR_DB_PGVEC_RESCORE_FACTOR: int = 4
+    VECTOR_DB_PGVEC_PARTITION_THRESHOLD: int = 10000
+    VECTOR_DB_BLUE_GREEN_REBUILDS: bool = True
+    VECTOR_DB_ALIAS_GC_DELAY: int = 300
+    VECTOR_DB_SNAPSHOT_PATH: str = "snapshots"
+    VECTOR_DB_SNAPSHOT_BATCH_SIZE: int = 2048
+    VECTOR_DB_DEFAULT_EF_SEARCH: int = 40
+    HYBRID_SEARCH_RRF_K: int = 60
+    HYBRID_SEARCH_CANDIDATES_FACTOR: int = 4
+    MMR_CANDIDATES_FACTOR: int = 4
+    SEARCH_CACHE_MAX_ENTRIES: int = 1024
+    SEARCH_CACHE_MAX_MB: int = 64
+    SEARCH_CACHE_TTL: int = 300
+    SEARCH_CACHE_REDIS_URL: str | None = None
+    EMBEDDING_CACHE_ENABLED: bool = True
 
     PRIMARY_LANG: str = "en"
     DEFAULT_LANG: str = "en"
@@ -43,6 +93,7 @@ class Settings(BaseSettings):
     CELERY_RESULT_BACKEND: str | None = None
     CELERY_TASK_SERIALIZER: str = "json"
     CELERY_TASK_TIME_LIMIT: int = 600
+    CELERY_INDEX_BUILD_TIME_LIMIT: int = 3600
     CELERY_TASK_ACKS_LATE: bool = True
     CELERY_WORKER_CONCURRENCY: int = 2
     CELERY_FLOWER_PASSWORD: str | None = None
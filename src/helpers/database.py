@@ -0,0 +1,60 @@
+import time
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from utils.metrics import DB_POOL_CHECKOUT_WAIT
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long every checkout waited for a connection,
+    including the time spent opening one when the pool grows.
+    """
+
+    def _do_get(self):
+        start_time = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start_time)
+
+
+def get_postgres_conn(settings) -> str:
+    return f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
+
+
+def create_db_engine(settings) -> AsyncEngine:
+    """
+    Create the async engine with the pool settings from the config.
+
+    In pgbouncer mode (transaction pooling) connections are pooled by
+    pgbouncer, so the engine doesn't keep its own pool, and prepared
+    statements are neither cached nor reused by name since consecutive
+    transactions may run on different server connections.
+    """
+    if settings.POSTGRES_PGBOUNCER_MODE:
+        return create_async_engine(
+            get_postgres_conn(settings),
+            poolclass=NullPool,
+            connect_args={
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            },
+        )
+
+    return create_async_engine(
+        get_postgres_conn(settings),
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=settings.POSTGRES_POOL_SIZE,
+        max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+        pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+        pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+        pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
+        connect_args={
+            "statement_cache_size": settings.POSTGRES_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.POSTGRES_STATEMENT_CACHE_SIZE,
+        },
+    )
@@ -1,15 +1,21 @@
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 from helpers.config import get_settings
+from helpers.database import create_db_engine
 from routes import base, data, nlp
 from stores.llm.LLMProviderFactory import LLMProviderFactory
 from stores.llm.templates.template_parser import TemplateParser
+from stores.vectordb.SearchResultCache import SearchResultCache
 from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
-from utils.metrics import setup_metrics
+from utils.metrics import (
+    setup_db_pool_metrics,
+    setup_metrics,
+    setup_search_cache_metrics,
+)
 
 
 @asynccontextmanager
@@ -26,8 +32,8 @@ setup_metrics(app)
 async def startup_span():
     settings = get_settings()
 
-    postgres_conn = f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
-    app.db_engine = create_async_engine(postgres_conn)
+    app.db_engine = create_db_engine(settings)
+    setup_db_pool_metrics(app.db_engine)
     app.db_client = sessionmaker(
         app.db_engine,
         class_=AsyncSession,
@@ -47,6 +53,14 @@ async def startup_span():
         provider=settings.VECTOR_DB_BACKEND
     )
     await app.vectordb_client.connect()
+
+    app.search_cache = SearchResultCache(
+        max_entries=settings.SEARCH_CACHE_MAX_ENTRIES,
+        max_bytes=settings.SEARCH_CACHE_MAX_MB * 1024**2,
+        ttl=settings.SEARCH_CACHE_TTL,
+    )
+    setup_search_cache_metrics(app.search_cache)
+
     app.generation_client.set_generation_model(model_id=settings.GENERATION_MODEL_ID)
 
     app.embedding_client = llm_provider_factory.create(
@@ -63,8 +77,8 @@ async def startup_span():
 
 
 async def shutdown_span():
-    app.db_engine.dispose()
-    app.vectordb_client.disconnect()
+    await app.db_engine.dispose()
+    await app.vectordb_client.disconnect()
 
 
 app.include_router(base.base_router)
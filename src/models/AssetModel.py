@@ -1,4 +1,4 @@
-from sqlalchemy import select
+from sqlalchemy import delete, select
 
 from models.db_schemas import Asset
 from models.enums import AssetTypeEnum
@@ -37,6 +37,23 @@ class AssetModel(BaseDataModel):
             record = result.scalar_one_or_none()
         return record
 
+    async def get_asset_by_id(self, asset_project_id: int, asset_id: int):
+        async with self.db_client() as session:
+            stmt = select(Asset).where(
+                Asset.asset_project_id == asset_project_id,
+                Asset.id == asset_id,
+            )
+            result = await session.execute(stmt)
+            record = result.scalar_one_or_none()
+        return record
+
+    async def delete_asset(self, asset_id: int):
+        async with self.db_client() as session:
+            stmt = delete(Asset).where(Asset.id == asset_id)
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
+
     async def get_all_project_assets(self, asset_project_id: int, asset_type: str):
         async with self.db_client() as session:
             stmt = select(Asset).where(
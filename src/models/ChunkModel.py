@@ -1,4 +1,4 @@
-from sqlalchemy import delete, func
+from sqlalchemy import delete, func, update
 from sqlalchemy.future import select
 
 from .BaseDataModel import BaseDataModel
@@ -50,13 +50,72 @@ class ChunkModel(BaseDataModel):
             await session.commit()
         return result.rowcount
 
+    async def supersede_chunks_by_project_id(
+        self,
+        project_id: int,
+        from_chunk_id: int | None = None,
+        to_chunk_id: int | None = None,
+    ):
+        """
+        Hide the project's current chunks from indexing without deleting
+        them: the live collection keeps referencing them until a rebuild
+        replaces it. The optional [from_chunk_id, to_chunk_id) range limits
+        it to the chunks one load created, or to the ones before it.
+        """
+        conditions = [
+            DataChunk.chunk_project_id == project_id,
+            DataChunk.chunk_superseded_at.is_(None),
+        ]
+        if from_chunk_id is not None:
+            conditions.append(DataChunk.id >= from_chunk_id)
+        if to_chunk_id is not None:
+            conditions.append(DataChunk.id < to_chunk_id)
+
+        async with self.db_client() as session:
+            stmt = (
+                update(DataChunk)
+                .where(*conditions)
+                .values(chunk_superseded_at=func.now())
+            )
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
+
+    async def delete_superseded_chunks(self, project_id: int, superseded_before):
+        async with self.db_client() as session:
+            stmt = delete(DataChunk).where(
+                DataChunk.chunk_project_id == project_id,
+                DataChunk.chunk_superseded_at <= superseded_before,
+            )
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
+
+    async def get_asset_chunk_ids(self, asset_id: int) -> list[int]:
+        async with self.db_client() as session:
+            stmt = select(DataChunk.id).where(DataChunk.chunk_asset_id == asset_id)
+            result = await session.execute(stmt)
+            chunk_ids = result.scalars().all()
+        return list(chunk_ids)
+
+    async def delete_chunks_by_asset_id(self, asset_id: int):
+        async with self.db_client() as session:
+            stmt = delete(DataChunk).where(DataChunk.chunk_asset_id == asset_id)
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
+
     async def get_all_project_chunks(
         self, project_id: int, page_no: int = 1, page_size: int = 50
     ):
         async with self.db_client() as session:
             stmt = (
                 select(DataChunk)
-                .where(DataChunk.chunk_project_id == project_id)
+                .where(
+                    DataChunk.chunk_project_id == project_id,
+                    DataChunk.chunk_superseded_at.is_(None),
+                )
+                .order_by(DataChunk.id)
                 .offset((page_no - 1) * page_size)
                 .limit(page_size)
             )
@@ -67,7 +126,8 @@ class ChunkModel(BaseDataModel):
     async def get_total_chunks_count(self, project_id: int):
         async with self.db_client() as session:
             count_sql = select(func.count(DataChunk.id)).where(
-                DataChunk.chunk_project_id == project_id
+                DataChunk.chunk_project_id == project_id,
+                DataChunk.chunk_superseded_at.is_(None),
             )
 
             records_count = await session.execute(count_sql)
@@ -0,0 +1,227 @@
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import or_
+from sqlalchemy.future import select
+
+from .BaseDataModel import BaseDataModel
+from .db_schemas import CollectionAlias
+
+
+class CollectionAliasModel(BaseDataModel):
+    # alias name -> (collection name or None, cached_at), shared by the
+    # instances of a process so searches don't query the alias on every call
+    alias_cache = {}
+
+    def __init__(self, db_client: object):
+        super().__init__(db_client)
+        self.collection = db_client
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        instance = cls(db_client)
+        return instance
+
+    async def get_collection_name(self, alias_name: str) -> str | None:
+        cached = self.alias_cache.get(alias_name)
+        if (
+            cached is not None
+            and time.monotonic() - cached[1]
+            <= self.app_settings.VECTOR_DB_COLLECTION_CACHE_TTL
+        ):
+            return cached[0]
+
+        async with self.db_client() as session:
+            result = await session.execute(
+                select(CollectionAlias.collection_name).where(
+                    CollectionAlias.alias_name == alias_name
+                )
+            )
+            collection_name = result.scalar_one_or_none()
+
+        self.alias_cache[alias_name] = (collection_name, time.monotonic())
+        return collection_name
+
+    async def swap_alias(
+        self,
+        alias_name: str,
+        collection_name: str,
+        embedding_model_id: str | None = None,
+        embedding_size: int | None = None,
+        default_collection_name: str | None = None,
+        rebuild_started_at: datetime | None = None,
+    ) -> str | None:
+        """
+        Point the alias at `collection_name` in a single transaction and
+        return the collection it pointed at before; before its first swap,
+        the alias stood for `default_collection_name`.
+
+        The previous collection is recorded as retired until it is dropped,
+        and a rebuild requested before `rebuild_started_at` is fulfilled.
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                alias = await self._get_alias_for_update(
+                    session, alias_name, default_collection_name
+                )
+                previous_collection_name = alias.collection_name
+
+                retired_collection_names = [
+                    name
+                    for name in alias.retired_collection_names or []
+                    if name != collection_name
+                ]
+                if (
+                    previous_collection_name
+                    and previous_collection_name != collection_name
+                    and previous_collection_name not in retired_collection_names
+                ):
+                    retired_collection_names.append(previous_collection_name)
+
+                alias.collection_name = collection_name
+                alias.retired_collection_names = retired_collection_names
+                alias.shadow_collection_names = [
+                    name
+                    for name in alias.shadow_collection_names or []
+                    if name != collection_name
+                ]
+                alias.embedding_model_id = embedding_model_id
+                alias.embedding_size = embedding_size
+
+                if (
+                    alias.rebuild_requested_at is not None
+                    and rebuild_started_at is not None
+                    and alias.rebuild_requested_at <= rebuild_started_at
+                ):
+                    alias.rebuild_requested_at = None
+
+        self.alias_cache.pop(alias_name, None)
+        return previous_collection_name
+
+    async def add_shadow_collection(
+        self,
+        alias_name: str,
+        collection_name: str,
+        default_collection_name: str | None = None,
+    ):
+        """
+        Record a rebuild's collection before it is loaded, so deletes reach
+        its rows until it is swapped in or dropped.
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                alias = await self._get_alias_for_update(
+                    session, alias_name, default_collection_name
+                )
+                shadow_collection_names = list(alias.shadow_collection_names or [])
+                if collection_name not in shadow_collection_names:
+                    shadow_collection_names.append(collection_name)
+                alias.shadow_collection_names = shadow_collection_names
+
+    async def request_rebuild(
+        self, alias_name: str, default_collection_name: str | None = None
+    ):
+        """
+        Make the next index push of the alias load and swap in a shadow
+        collection instead of adding to the live one.
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                alias = await self._get_alias_for_update(
+                    session, alias_name, default_collection_name
+                )
+                alias.rebuild_requested_at = datetime.now(timezone.utc)
+
+    async def is_rebuild_requested(self, alias_name: str) -> bool:
+        async with self.db_client() as session:
+            result = await session.execute(
+                select(CollectionAlias.rebuild_requested_at).where(
+                    CollectionAlias.alias_name == alias_name
+                )
+            )
+            return result.scalar_one_or_none() is not None
+
+    async def _get_alias_for_update(
+        self, session, alias_name: str, default_collection_name: str | None
+    ) -> CollectionAlias:
+        alias = (
+            await session.execute(
+                select(CollectionAlias)
+                .where(CollectionAlias.alias_name == alias_name)
+                .with_for_update()
+            )
+        ).scalar_one_or_none()
+
+        if alias is None:
+            # Until its first swap the alias stands for the default collection
+            alias = CollectionAlias(
+                alias_name=alias_name,
+                collection_name=default_collection_name,
+                retired_collection_names=[],
+                shadow_collection_names=[],
+            )
+            session.add(alias)
+
+        return alias
+
+    async def get_retired_collection_names(self, alias_name: str) -> list[str]:
+        async with self.db_client() as session:
+            result = await session.execute(
+                select(CollectionAlias.retired_collection_names).where(
+                    CollectionAlias.alias_name == alias_name
+                )
+            )
+            return list(result.scalar_one_or_none() or [])
+
+    async def get_shadow_collection_names(self, alias_name: str) -> list[str]:
+        async with self.db_client() as session:
+            result = await session.execute(
+                select(CollectionAlias.shadow_collection_names).where(
+                    CollectionAlias.alias_name == alias_name
+                )
+            )
+            return list(result.scalar_one_or_none() or [])
+
+    async def release_collection(self, collection_name: str):
+        """
+        Forget a retired or shadow collection once it has been dropped.
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                aliases = (
+                    await session.execute(
+                        select(CollectionAlias)
+                        .where(
+                            or_(
+                                CollectionAlias.retired_collection_names.contains(
+                                    [collection_name]
+                                ),
+                                CollectionAlias.shadow_collection_names.contains(
+                                    [collection_name]
+                                ),
+                            )
+                        )
+                        .with_for_update()
+                    )
+                ).scalars()
+
+                for alias in aliases:
+                    alias.retired_collection_names = [
+                        name
+                        for name in alias.retired_collection_names
+                        if name != collection_name
+                    ]
+                    alias.shadow_collection_names = [
+                        name
+                        for name in alias.shadow_collection_names
+                        if name != collection_name
+                    ]
+
+    async def is_collection_aliased(self, collection_name: str) -> bool:
+        async with self.db_client() as session:
+            result = await session.execute(
+                select(CollectionAlias.id)
+                .where(CollectionAlias.collection_name == collection_name)
+                .limit(1)
+            )
+            return result.scalar_one_or_none() is not None
@@ -0,0 +1,89 @@
+import hashlib
+
+import numpy as np
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.future import select
+
+from .BaseDataModel import BaseDataModel
+from .db_schemas import EmbeddingCache
+
+
+class EmbeddingCacheModel(BaseDataModel):
+    def __init__(self, db_client: object):
+        super().__init__(db_client)
+        self.collection = db_client
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        instance = cls(db_client)
+        return instance
+
+    def get_text_hash(self, text: str) -> bytes:
+        return hashlib.sha256(text.encode("utf-8")).digest()
+
+    async def get_embeddings(
+        self,
+        embedding_backend: str,
+        embedding_model_id: str,
+        embedding_size: int,
+        text_hashes: list[bytes],
+    ) -> dict:
+        """
+        Map the cached text hashes to their vectors in one query on the
+        primary key; missing hashes are left out.
+        """
+        if not text_hashes:
+            return {}
+
+        async with self.db_client() as session:
+            result = await session.execute(
+                select(EmbeddingCache.text_hash, EmbeddingCache.vector).where(
+                    EmbeddingCache.embedding_backend == embedding_backend,
+                    EmbeddingCache.embedding_model_id == embedding_model_id,
+                    EmbeddingCache.embedding_size == embedding_size,
+                    EmbeddingCache.text_hash.in_(set(text_hashes)),
+                )
+            )
+            records = result.fetchall()
+
+        return {
+            bytes(record.text_hash): np.frombuffer(record.vector, dtype="<f4")
+            for record in records
+        }
+
+    async def set_embeddings(
+        self,
+        embedding_backend: str,
+        embedding_model_id: str,
+        embedding_size: int,
+        text_hashes: list[bytes],
+        vectors: list,
+    ):
+        if not text_hashes:
+            return 0
+
+        values = {}
+        for text_hash, vector in zip(text_hashes, vectors):
+            values[text_hash] = np.asarray(vector, dtype="<f4").tobytes()
+
+        async with self.db_client() as session:
+            # Concurrent workers may embed the same text; the first one wins
+            stmt = (
+                insert(EmbeddingCache)
+                .values(
+                    [
+                        {
+                            "embedding_backend": embedding_backend,
+                            "embedding_model_id": embedding_model_id,
+                            "embedding_size": embedding_size,
+                            "text_hash": text_hash,
+                            "vector": vector,
+                        }
+                        for text_hash, vector in values.items()
+                    ]
+                )
+                .on_conflict_do_nothing()
+            )
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
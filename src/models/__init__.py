@@ -1,5 +1,7 @@
 from .AssetModel import AssetModel
 from .ChunkModel import ChunkModel
+from .CollectionAliasModel import CollectionAliasModel
+from .EmbeddingCacheModel import EmbeddingCacheModel
 from .enums.DataBaseEnum import DataBaseEnum
 from .enums.ProcessingEnum import ProcessingEnum
 from .enums.ResponseEnum import ResponseMessageEnum
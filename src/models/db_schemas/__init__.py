@@ -1,3 +1,5 @@
 from .minirag.schemas.asset import Asset
+from .minirag.schemas.collection_alias import CollectionAlias
 from .minirag.schemas.data_chunk import DataChunk, RetrievedDocument
+from .minirag.schemas.embedding_cache import EmbeddingCache
 from .minirag.schemas.project import Project
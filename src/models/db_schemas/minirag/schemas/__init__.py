@@ -1,5 +1,7 @@
 from .asset import Asset
 from .celery_task import CeleryTask
+from .collection_alias import CollectionAlias
 from .data_chunk import DataChunk, RetrievedDocument
+from .embedding_cache import EmbeddingCache
 from .minirag_base import SQLAlchemyBase
 from .project import Project
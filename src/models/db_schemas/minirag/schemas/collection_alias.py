@@ -0,0 +1,44 @@
+from sqlalchemy import Column, DateTime, Integer, String, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+
+from .minirag_base import SQLAlchemyBase
+
+
+class CollectionAlias(SQLAlchemyBase):
+    __tablename__ = "collection_aliases"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    alias_name = Column(String(255), unique=True, nullable=False)
+    # The vector DB collection currently served under the alias
+    collection_name = Column(String(255), nullable=False)
+    # Collections swapped out and not dropped yet
+    retired_collection_names = Column(
+        JSONB,
+        nullable=False,
+        default=list,
+        server_default=text("'[]'::jsonb"),
+    )
+    # Rebuilds still loading or indexing, not served yet
+    shadow_collection_names = Column(
+        JSONB,
+        nullable=False,
+        default=list,
+        server_default=text("'[]'::jsonb"),
+    )
+    # Set when the project's chunks were replaced without a rebuild; the
+    # next index push then loads a shadow collection
+    rebuild_requested_at = Column(DateTime(timezone=True), nullable=True)
+    embedding_model_id = Column(String(255), nullable=True)
+    embedding_size = Column(Integer, nullable=True)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
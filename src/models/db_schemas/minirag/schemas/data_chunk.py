@@ -39,6 +39,10 @@ class DataChunk(SQLAlchemyBase):
         nullable=False,
     )
 
+    # Set when a blue/green reset replaced the chunk; it is kept until the
+    # collection still referencing it is dropped
+    chunk_superseded_at = Column(DateTime(timezone=True), nullable=True)
+
     created_at = Column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -64,3 +68,6 @@ class DataChunk(SQLAlchemyBase):
 class RetrievedDocument(BaseModel):
     text: str
     score: float
+    chunk_id: int | None = None
+    # Per-signal scores when several retrievers were fused (hybrid search)
+    scores: dict[str, float] | None = None
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String, func
+
+from .minirag_base import SQLAlchemyBase
+
+
+class EmbeddingCache(SQLAlchemyBase):
+    __tablename__ = "embedding_cache"
+
+    # Content-addressed: the same text embedded by the same model always
+    # gives the same vector, whatever project or chunk it came from
+    embedding_backend = Column(String(64), primary_key=True)
+    embedding_model_id = Column(String(255), primary_key=True)
+    embedding_size = Column(Integer, primary_key=True)
+    # sha256 digest of the embedded text
+    text_hash = Column(LargeBinary(32), primary_key=True)
+
+    # Little-endian float32 values
+    vector = Column(LargeBinary, nullable=False)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
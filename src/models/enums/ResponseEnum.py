@@ -11,6 +11,10 @@ class ResponseMessageEnum(Enum):
     FILE_PROCESS_SUCCESS = "file_processing_success"
     NO_FILES_ERROR = "no_file_found"
     FILE_ID_ERROR = "no_file_found_with_this_id"
+    ASSET_NOT_FOUND_ERROR = "asset_was_not_found"
+    ASSET_DELETE_SUCCESS = "asset_delete_success"
+    ASSET_DELETE_ERROR = "asset_delete_error"
+    ASSET_DELETE_CONFLICT_ERROR = "asset_delete_conflict_error"
     PROJECT_NOT_FOUND_ERROR = "project_was_not_found"
     INSERT_INTO_VECTORDB_ERROR = "error_while_inserting_into_vedctordb"
     INSERT_INTO_VECTORDB_SUCCESS = "inserted_into_vedctordb_success"
@@ -20,3 +24,7 @@ class ResponseMessageEnum(Enum):
     RAG_SEARCH_ERROR = "rag_search_error"
     RAG_SEARCH_SUCCESS = "rag_search_success"
     PROCESS_AND_PUSH_WORKFLOW_READY = "process_and_push_workflow_ready"
+    SNAPSHOT_EXPORT_READY = "snapshot_export_ready"
+    SNAPSHOT_EXPORT_SUCCESS = "snapshot_export_success"
+    SNAPSHOT_IMPORT_READY = "snapshot_import_ready"
+    SNAPSHOT_IMPORT_SUCCESS = "snapshot_import_success"
@@ -5,11 +5,13 @@ from datetime import datetime, timezone
 import aiofiles
 from fastapi import APIRouter, Depends, Request, UploadFile, status
 from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError
 
-from controllers import FileController
+from controllers import FileController, NLPController, ProjectController
 from helpers.config import Settings, get_settings
 from models import (
     AssetModel,
+    ChunkModel,
     ProjectModel,
     ResponseMessageEnum,
 )
@@ -127,3 +129,78 @@ async def process_and_push_endpoint(
             "workflow_id": workflow.id,
         },
     )
+
+
+@data_router.delete("/asset/{project_id}/{asset_id}")
+async def delete_asset_endpoint(request: Request, project_id: int, asset_id: int):
+    project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
+    project = await project_model.get_project_or_create_one(project_id=project_id)
+
+    asset_model = await AssetModel.create_instance(db_client=request.app.db_client)
+    asset_record = await asset_model.get_asset_by_id(
+        asset_project_id=project.id, asset_id=asset_id
+    )
+    if asset_record is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": ResponseMessageEnum.ASSET_NOT_FOUND_ERROR.value},
+        )
+
+    chunk_model = await ChunkModel.create_instance(db_client=request.app.db_client)
+    chunks_ids = await chunk_model.get_asset_chunk_ids(asset_id=asset_record.id)
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        db_client=request.app.db_client,
+    )
+
+    # Vectors go first: the chunk rows are the only record of which vectors
+    # belong to the asset, so a failure here leaves everything retryable
+    deleted_vectors_count = 0
+    if chunks_ids:
+        try:
+            deleted_vectors_count = await nlp_controller.delete_chunks_from_vector_db(
+                project=project, chunks_ids=chunks_ids
+            )
+        except Exception as e:
+            logger.error(f"Error while deleting asset vectors: {e}")
+            deleted_vectors_count = None
+
+        if deleted_vectors_count is None:
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"message": ResponseMessageEnum.ASSET_DELETE_ERROR.value},
+            )
+
+    try:
+        deleted_chunks_count = await chunk_model.delete_chunks_by_asset_id(
+            asset_id=asset_record.id
+        )
+    except IntegrityError as e:
+        # A rebuild loading right now wrote the asset's vectors again after
+        # they were deleted; the delete can be retried
+        logger.error(f"Error while deleting asset chunks: {e}")
+        return JSONResponse(
+            status_code=status.HTTP_409_CONFLICT,
+            content={"message": ResponseMessageEnum.ASSET_DELETE_CONFLICT_ERROR.value},
+        )
+    _ = await asset_model.delete_asset(asset_id=asset_record.id)
+
+    file_path = os.path.join(
+        ProjectController().get_project_path(project_id=project_id),
+        asset_record.asset_name,
+    )
+    if os.path.exists(file_path):
+        os.remove(file_path)
+
+    return JSONResponse(
+        content={
+            "message": ResponseMessageEnum.ASSET_DELETE_SUCCESS.value,
+            "asset_id": str(asset_record.id),
+            "deleted_chunks_count": deleted_chunks_count,
+            "deleted_vectors_count": deleted_vectors_count,
+        }
+    )
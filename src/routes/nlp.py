@@ -1,4 +1,5 @@
 import logging
+from datetime import datetime, timezone
 
 from fastapi import APIRouter, Request, status
 from fastapi.responses import JSONResponse
@@ -6,7 +7,17 @@ from fastapi.responses import JSONResponse
 from controllers import NLPController
 from models import ProjectModel
 from models.enums import ResponseMessageEnum
-from routes.schemas.nlp import PushRequest, SearchRequest
+from routes.schemas.nlp import (
+    BatchSearchRequest,
+    PushRequest,
+    SearchRequest,
+    SnapshotExportRequest,
+    SnapshotImportRequest,
+)
+from tasks.collection_snapshots import (
+    task_export_collection_snapshot,
+    task_import_collection_snapshot,
+)
 from tasks.data_indexing import task_index_project
 
 logger = logging.getLogger("uvicorn.error")
@@ -24,8 +35,48 @@ async def index_project(request: Request, project_id: int, push_request: PushReq
     )
 
 
+@nlp_router.post("/index/snapshot/export/{project_id}")
+async def export_index_snapshot(
+    request: Request, project_id: int, export_request: SnapshotExportRequest
+):
+    snapshot_name = export_request.snapshot_name or datetime.now(timezone.utc).strftime(
+        "%Y%m%dT%H%M%SZ"
+    )
+
+    task = task_export_collection_snapshot.delay(
+        project_id=project_id,
+        snapshot_name=snapshot_name,
+        vector_dtype=export_request.vector_dtype,
+    )
+
+    return JSONResponse(
+        content={
+            "message": ResponseMessageEnum.SNAPSHOT_EXPORT_READY.value,
+            "snapshot_name": snapshot_name,
+            "task_id": task.id,
+        },
+    )
+
+
+@nlp_router.post("/index/snapshot/import/{project_id}")
+async def import_index_snapshot(
+    request: Request, project_id: int, import_request: SnapshotImportRequest
+):
+    task = task_import_collection_snapshot.delay(
+        project_id=project_id, snapshot_name=import_request.snapshot_name
+    )
+
+    return JSONResponse(
+        content={
+            "message": ResponseMessageEnum.SNAPSHOT_IMPORT_READY.value,
+            "snapshot_name": import_request.snapshot_name,
+            "task_id": task.id,
+        },
+    )
+
+
 @nlp_router.get("/index/info/{project_id}")
-async def get_index_info(request: Request, project_id: int):
+async def get_index_info(request: Request, project_id: int, exact_count: bool = False):
     project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
     project = await project_model.get_project_or_create_one(project_id=project_id)
     nlp_controller = NLPController(
@@ -33,10 +84,11 @@ async def get_index_info(request: Request, project_id: int):
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        db_client=request.app.db_client,
     )
 
     collection_info = await nlp_controller.get_vector_db_collection_info(
-        project=project
+        project=project, exact_count=exact_count
     )
 
     return JSONResponse(
@@ -58,10 +110,29 @@ async def search_index(
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        db_client=request.app.db_client,
+        search_cache=request.app.search_cache,
+    )
+
+    search_params = nlp_controller.get_search_params(
+        limit=search_request.limit,
+        search_quality=search_request.search_quality,
+        ef_search=search_request.ef_search,
+        probes=search_request.probes,
     )
 
     results = await nlp_controller.search_vector_db_collection(
-        project=project, text=search_request.text, limit=search_request.limit
+        project=project,
+        text=search_request.text,
+        limit=search_request.limit,
+        search_params=search_params,
+        search_filter=(
+            search_request.filter.model_dump(exclude_none=True)
+            if search_request.filter
+            else None
+        ),
+        hybrid=search_request.hybrid,
+        mmr_lambda=search_request.mmr_lambda,
     )
 
     if not results:
@@ -78,6 +149,53 @@ async def search_index(
     )
 
 
+@nlp_router.post("/index/search/batch/{project_id}")
+async def search_index_batch(
+    request: Request, project_id: int, search_request: BatchSearchRequest
+):
+    project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
+    project = await project_model.get_project_or_create_one(project_id=project_id)
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        db_client=request.app.db_client,
+    )
+
+    search_params = nlp_controller.get_search_params(
+        limit=search_request.limit,
+        search_quality=search_request.search_quality,
+        ef_search=search_request.ef_search,
+        probes=search_request.probes,
+    )
+
+    results = await nlp_controller.search_many_vector_db_collection(
+        project=project,
+        texts=search_request.texts,
+        limit=search_request.limit,
+        search_params=search_params,
+        search_filter=(
+            search_request.filter.model_dump(exclude_none=True)
+            if search_request.filter
+            else None
+        ),
+    )
+
+    if results is False:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": ResponseMessageEnum.VECTORDB_SEARCH_ERROR.value},
+        )
+
+    return JSONResponse(
+        content={
+            "message": ResponseMessageEnum.VECTORDB_SEARCH_SUCCESS.value,
+            "results": results,
+        },
+    )
+
+
 @nlp_router.post("/index/answer/{project_id}")
 async def answer_rag(request: Request, project_id: int, search_request: SearchRequest):
     project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
@@ -87,10 +205,29 @@ async def answer_rag(request: Request, project_id: int, search_request: SearchRe
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        db_client=request.app.db_client,
+        search_cache=request.app.search_cache,
+    )
+
+    search_params = nlp_controller.get_search_params(
+        limit=search_request.limit,
+        search_quality=search_request.search_quality,
+        ef_search=search_request.ef_search,
+        probes=search_request.probes,
     )
 
     answer, full_prompt, chat_history = await nlp_controller.answer_rag_question(
-        project=project, query=search_request.text, limit=search_request.limit
+        project=project,
+        query=search_request.text,
+        limit=search_request.limit,
+        search_params=search_params,
+        search_filter=(
+            search_request.filter.model_dump(exclude_none=True)
+            if search_request.filter
+            else None
+        ),
+        hybrid=search_request.hybrid,
+        mmr_lambda=search_request.mmr_lambda,
     )
 
     if not answer:
@@ -1,10 +1,60 @@
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import BaseModel, Field
 
 
 class PushRequest(BaseModel):
     is_reset: bool = False
 
 
+class MetadataCondition(BaseModel):
+    key: str
+    eq: str | int | float | bool | None = None
+    any_of: list[str | int | float | bool] | None = None
+    gt: float | None = None
+    gte: float | None = None
+    lt: float | None = None
+    lte: float | None = None
+
+
+class SearchFilter(BaseModel):
+    chunk_ids: list[int] | None = None
+    metadata: list[MetadataCondition] | None = None
+
+
 class SearchRequest(BaseModel):
     text: str
-    limit: int | None = 10
+    limit: int | None = Field(default=10, ge=1)
+    # Recall/latency trade-off: a preset, or explicit ANN values overriding it
+    search_quality: Literal["fast", "balanced", "accurate"] | None = None
+    # Bounded like pgvector's hnsw.ef_search and ivfflat.probes settings
+    ef_search: int | None = Field(default=None, ge=1, le=1000)
+    probes: int | None = Field(default=None, ge=1)
+    filter: SearchFilter | None = None
+    # Fuse full-text and vector results (reciprocal rank fusion)
+    hybrid: bool = False
+    # Diversify results by maximal marginal relevance: 1 is pure relevance,
+    # lower values trade relevance for less redundant chunks
+    mmr_lambda: float | None = Field(default=None, ge=0, le=1)
+
+
+class BatchSearchRequest(BaseModel):
+    texts: list[str]
+    limit: int | None = Field(default=10, ge=1)
+    search_quality: Literal["fast", "balanced", "accurate"] | None = None
+    ef_search: int | None = Field(default=None, ge=1, le=1000)
+    probes: int | None = Field(default=None, ge=1)
+    filter: SearchFilter | None = None
+
+
+class SnapshotExportRequest(BaseModel):
+    # A directory name under the project snapshots; defaults to a timestamp
+    snapshot_name: str | None = Field(
+        default=None, pattern=r"^[A-Za-z0-9_-][A-Za-z0-9_.-]*$"
+    )
+    # float16 halves the file size at a small precision cost
+    vector_dtype: Literal["float32", "float16"] = "float32"
+
+
+class SnapshotImportRequest(BaseModel):
+    snapshot_name: str = Field(pattern=r"^[A-Za-z0-9_-][A-Za-z0-9_.-]*$")
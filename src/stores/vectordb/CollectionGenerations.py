@@ -0,0 +1,55 @@
+import logging
+
+from redis import asyncio as aioredis
+
+
+class CollectionGenerations:
+    """
+    Per-collection write counters, bumped by the providers whenever a
+    collection's content changes (inserts, deletes, resets). Anything cached
+    against an older generation of a collection is stale.
+
+    With a Redis url the counters are shared by the API process and the Celery
+    workers that do the indexing; without one they are per-process, so writes
+    made by other processes are only picked up once cached entries expire.
+    """
+
+    key_prefix = "minirag:collection_generation:"
+
+    def __init__(self, redis_url: str | None = None):
+        self.generations = {}
+        self.redis_client = (
+            aioredis.from_url(redis_url, decode_responses=True) if redis_url else None
+        )
+        self.logger = logging.getLogger("uvicorn")
+
+    async def get(self, collection_name: str) -> int | None:
+        """
+        Return the current generation, or None when it can't be read (the
+        caller should then bypass anything cached).
+        """
+        if self.redis_client is None:
+            return self.generations.get(collection_name, 0)
+
+        try:
+            generation = await self.redis_client.get(self.key_prefix + collection_name)
+        except Exception as e:
+            self.logger.warning(f"Error while reading collection generation: {e}")
+            return None
+
+        return int(generation or 0)
+
+    async def bump(self, collection_name: str):
+        self.generations[collection_name] = self.generations.get(collection_name, 0) + 1
+
+        if self.redis_client is None:
+            return
+
+        try:
+            await self.redis_client.incr(self.key_prefix + collection_name)
+        except Exception as e:
+            self.logger.warning(f"Error while bumping collection generation: {e}")
+
+    async def close(self):
+        if self.redis_client is not None:
+            await self.redis_client.aclose()
@@ -0,0 +1,60 @@
+import time
+
+
+class CollectionRegistry:
+    """
+    In-process cache of per-collection metadata (existence, embedding size,
+    index state) so the hot insert/search paths don't hit the catalog on
+    every call.
+
+    Only existing collections are cached; entries expire after `ttl` seconds
+    so changes made by other processes (e.g. Celery workers) are picked up.
+    """
+
+    def __init__(self, ttl: int = 60):
+        self.ttl = ttl
+        self.collections = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, collection_name: str) -> dict | None:
+        entry = self.collections.get(collection_name)
+
+        if entry is not None and time.monotonic() - entry["cached_at"] > self.ttl:
+            self.collections.pop(collection_name, None)
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry
+
+    def set(self, collection_name: str, **metadata):
+        entry = self.collections.setdefault(collection_name, {})
+        entry.update(metadata)
+        entry["cached_at"] = time.monotonic()
+        return entry
+
+    def update(self, collection_name: str, **metadata):
+        # Update an entry only if it is already cached
+        entry = self.collections.get(collection_name)
+        if entry is not None:
+            entry.update(metadata)
+        return entry
+
+    def invalidate(self, collection_name: str | None = None):
+        if collection_name is None:
+            self.collections.clear()
+        else:
+            self.collections.pop(collection_name, None)
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.collections),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
@@ -0,0 +1,266 @@
+import json
+import logging
+import os
+import shutil
+import time
+
+import numpy as np
+
+from .VectorDBEnums import SnapshotVectorDtypeEnums
+
+
+class CollectionSnapshot:
+    """
+    Exports a collection to a provider-independent snapshot and loads it back,
+    so a project can move between environments (or backends) without being
+    embedded again.
+
+    A snapshot is a directory holding a `.npy` matrix of the vectors (float32
+    or float16), a JSON-lines side file with the chunk id, text, metadata and
+    content hash of each row, and a `meta.json` written last. Both directions
+    stream `batch_size` rows at a time through the provider `iter_records`
+    and `insert_many` (the bulk-load path), so memory stays bounded whatever
+    the collection size.
+
+    Chunk ids are those of the exporting environment. The snapshot carries
+    each chunk's text and metadata but not the chunk rows themselves, so an
+    import into another database passes `prepare_records` to recreate the
+    chunks and remap the ids before the vectors are loaded.
+    """
+
+    vectors_file_name = "vectors.npy"
+    records_file_name = "records.jsonl"
+    meta_file_name = "meta.json"
+
+    def __init__(self, vectordb_client, batch_size: int = 2048):
+        self.vectordb_client = vectordb_client
+        self.batch_size = batch_size
+
+        self.logger = logging.getLogger("uvicorn")
+
+    def read_meta(self, snapshot_path: str) -> dict | None:
+        meta_path = os.path.join(snapshot_path, self.meta_file_name)
+        if not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path, "r") as meta_file:
+            return json.load(meta_file)
+
+    async def export_collection(
+        self,
+        collection_name: str,
+        snapshot_path: str,
+        vector_dtype: str = SnapshotVectorDtypeEnums.FLOAT32.value,
+        extra_meta: dict | None = None,
+    ) -> dict:
+        if not callable(getattr(self.vectordb_client, "iter_records", None)):
+            raise ValueError("The vector db provider can't export collections")
+
+        if not await self.vectordb_client.is_collection_exist(collection_name):
+            raise ValueError(f"Can't export non-existed collection: {collection_name}")
+
+        dtype = np.dtype(SnapshotVectorDtypeEnums(vector_dtype).value).newbyteorder("<")
+
+        # Written aside and renamed once complete: a snapshot directory
+        # always holds a finished export
+        tmp_snapshot_path = f"{snapshot_path}.tmp"
+        shutil.rmtree(tmp_snapshot_path, ignore_errors=True)
+        os.makedirs(tmp_snapshot_path)
+
+        started_at = time.perf_counter()
+        rows_count = 0
+        embedding_size = 0
+
+        vectors_path = os.path.join(tmp_snapshot_path, self.vectors_file_name)
+        records_path = os.path.join(tmp_snapshot_path, self.records_file_name)
+        with (
+            open(vectors_path, "wb") as vectors_file,
+            open(records_path, "w", encoding="utf-8") as records_file,
+        ):
+            # Placeholder header, rewritten with the final shape at the end
+            data_offset = self._write_vectors_header(vectors_file, dtype, 0, 0)
+
+            async for batch in self.vectordb_client.iter_records(
+                collection_name=collection_name, batch_size=self.batch_size
+            ):
+                vectors = batch["vectors"]
+                embedding_size = vectors.shape[1]
+
+                vectors_file.write(vectors.astype(dtype).tobytes())
+                for _record_id, _text, _metadata, _content_hash in zip(
+                    batch["record_ids"],
+                    batch["texts"],
+                    batch["metadata"],
+                    batch["content_hashes"],
+                ):
+                    records_file.write(
+                        json.dumps(
+                            {
+                                "chunk_id": _record_id,
+                                "text": _text,
+                                "metadata": _metadata,
+                                "content_hash": _content_hash,
+                            }
+                        )
+                        + "\n"
+                    )
+
+                rows_count += len(vectors)
+
+            header_size = self._write_vectors_header(
+                vectors_file, dtype, rows_count, embedding_size
+            )
+            if header_size != data_offset:
+                raise ValueError("Snapshot vectors header changed size")
+
+        stats = self._get_stats(tmp_snapshot_path, rows_count, started_at)
+        with open(
+            os.path.join(tmp_snapshot_path, self.meta_file_name), "w"
+        ) as meta_file:
+            json.dump(
+                {
+                    **(extra_meta or {}),
+                    "collection_name": collection_name,
+                    "rows_count": rows_count,
+                    "embedding_size": embedding_size,
+                    "vector_dtype": dtype.name,
+                    "created_at": int(time.time()),
+                },
+                meta_file,
+            )
+
+        shutil.rmtree(snapshot_path, ignore_errors=True)
+        os.replace(tmp_snapshot_path, snapshot_path)
+
+        self.logger.info(
+            f"Exported collection {collection_name}: {rows_count} rows in "
+            f"{stats['seconds']:.1f}s ({stats['rows_per_second']:.0f} rows/s, "
+            f"{stats['mb_per_second']:.1f} MB/s)"
+        )
+        return stats
+
+    async def import_collection(
+        self,
+        collection_name: str,
+        snapshot_path: str,
+        is_reset: bool = False,
+        prepare_records=None,
+    ) -> dict:
+        """
+        `prepare_records`, when given, is awaited with every batch of records
+        before it is inserted and returns the records to insert.
+        """
+        snapshot_meta = self.read_meta(snapshot_path)
+        if snapshot_meta is None:
+            raise ValueError(f"No complete snapshot found at: {snapshot_path}")
+
+        started_at = time.perf_counter()
+
+        _ = await self.vectordb_client.create_collection(
+            collection_name=collection_name,
+            embedding_size=snapshot_meta["embedding_size"],
+            is_reset=is_reset,
+        )
+
+        rows_count = snapshot_meta["rows_count"]
+        vectors = None
+        if rows_count:
+            vectors = np.load(
+                os.path.join(snapshot_path, self.vectors_file_name), mmap_mode="r"
+            )
+
+        imported_rows_count = 0
+        with open(
+            os.path.join(snapshot_path, self.records_file_name), "r", encoding="utf-8"
+        ) as records_file:
+            batch_records = []
+            for line in records_file:
+                batch_records.append(json.loads(line))
+                if len(batch_records) == self.batch_size:
+                    await self._insert_batch(
+                        collection_name,
+                        batch_records,
+                        vectors,
+                        imported_rows_count,
+                        prepare_records,
+                    )
+                    imported_rows_count += len(batch_records)
+                    batch_records = []
+
+            if batch_records:
+                await self._insert_batch(
+                    collection_name,
+                    batch_records,
+                    vectors,
+                    imported_rows_count,
+                    prepare_records,
+                )
+                imported_rows_count += len(batch_records)
+
+        if imported_rows_count != rows_count:
+            raise ValueError(
+                f"Snapshot at {snapshot_path} holds {imported_rows_count} records "
+                f"for {rows_count} vectors"
+            )
+
+        stats = self._get_stats(snapshot_path, rows_count, started_at)
+        self.logger.info(
+            f"Imported collection {collection_name}: {rows_count} rows in "
+            f"{stats['seconds']:.1f}s ({stats['rows_per_second']:.0f} rows/s, "
+            f"{stats['mb_per_second']:.1f} MB/s)"
+        )
+        return stats
+
+    async def _insert_batch(
+        self, collection_name, batch_records, vectors, start, prepare_records=None
+    ):
+        # Only this batch of the memory-mapped matrix is read and upcast
+        batch_vectors = np.asarray(
+            vectors[start : start + len(batch_records)], dtype=np.float32
+        )
+
+        if prepare_records is not None:
+            batch_records = await prepare_records(batch_records)
+
+        is_inserted = await self.vectordb_client.insert_many(
+            collection_name=collection_name,
+            texts=[record["text"] for record in batch_records],
+            vectors=batch_vectors.tolist(),
+            metadata=[record["metadata"] for record in batch_records],
+            record_ids=[record["chunk_id"] for record in batch_records],
+            content_hashes=[record["content_hash"] for record in batch_records],
+        )
+        if not is_inserted:
+            raise ValueError(
+                f"Error while importing snapshot batch into: {collection_name}"
+            )
+
+    def _write_vectors_header(self, vectors_file, dtype, rows_count, embedding_size):
+        # Version 1.0 headers are padded to 64 bytes, so the placeholder and
+        # the final header have the same length
+        vectors_file.seek(0)
+        np.lib.format.write_array_header_1_0(
+            vectors_file,
+            {
+                "descr": np.lib.format.dtype_to_descr(dtype),
+                "fortran_order": False,
+                "shape": (rows_count, embedding_size),
+            },
+        )
+        header_size = vectors_file.tell()
+        vectors_file.seek(0, os.SEEK_END)
+        return header_size
+
+    def _get_stats(self, snapshot_path: str, rows_count: int, started_at) -> dict:
+        seconds = max(time.perf_counter() - started_at, 1e-9)
+        size_bytes = sum(
+            os.path.getsize(os.path.join(snapshot_path, file_name))
+            for file_name in (self.vectors_file_name, self.records_file_name)
+        )
+        return {
+            "rows_count": rows_count,
+            "size_bytes": size_bytes,
+            "seconds": round(seconds, 3),
+            "rows_per_second": rows_count / seconds,
+            "mb_per_second": size_bytes / 1024**2 / seconds,
+        }
@@ -0,0 +1,102 @@
+import json
+import math
+
+from .VectorDBEnums import PgVectorIndexTypeEnums
+
+
+class PGVectorIndexManager:
+    """
+    Chooses pgvector index build parameters from the collection size and
+    decides when an existing index has been outgrown and should be rebuilt.
+
+    The parameters and row count used for a build are stored as a JSON comment
+    on the index itself, so the decision survives restarts and is shared by
+    the API process and the Celery workers.
+    """
+
+    # (max rows, m, ef_construction)
+    HNSW_TIERS = [
+        (100_000, 16, 64),
+        (1_000_000, 16, 128),
+        (10_000_000, 24, 200),
+    ]
+    HNSW_MAX_TIER = (32, 256)
+
+    def __init__(
+        self,
+        index_type: str = PgVectorIndexTypeEnums.HNSW.value,
+        growth_factor: float = 2.0,
+        min_rebuild_rows: int = 10_000,
+    ):
+        self.index_type = index_type
+        self.growth_factor = growth_factor
+        self.min_rebuild_rows = min_rebuild_rows
+
+    def get_index_params(self, records_count: int, index_type: str = None) -> dict:
+        index_type = index_type or self.index_type
+
+        if index_type == PgVectorIndexTypeEnums.IVFFLAT.value:
+            # pgvector guidance: rows / 1000 up to 1M rows, sqrt(rows) above
+            if records_count <= 1_000_000:
+                lists = records_count // 1000
+            else:
+                lists = int(math.sqrt(records_count))
+            return {"lists": max(1, lists)}
+
+        for max_rows, m, ef_construction in self.HNSW_TIERS:
+            if records_count <= max_rows:
+                return {"m": m, "ef_construction": ef_construction}
+
+        m, ef_construction = self.HNSW_MAX_TIER
+        return {"m": m, "ef_construction": ef_construction}
+
+    def get_with_clause(self, index_params: dict) -> str:
+        options = ", ".join(
+            f"{key} = {int(value)}" for key, value in index_params.items()
+        )
+        return f"WITH ({options})" if options else ""
+
+    def get_index_comment(self, index_type: str, index_params: dict, records_count):
+        return json.dumps(
+            {
+                "index_type": index_type,
+                "params": index_params,
+                "records_count": records_count,
+            }
+        )
+
+    def parse_index_comment(self, comment: str | None) -> dict | None:
+        if not comment:
+            return None
+        try:
+            return json.loads(comment)
+        except ValueError:
+            return None
+
+    def needs_rebuild(self, index_state: dict, records_count: int) -> bool:
+        """
+        HNSW graphs take inserts without degrading, so an HNSW index is only
+        rebuilt when the collection size crossed into another parameter tier.
+        IVFFlat lists are trained on the rows present at build time, so an
+        IVFFlat index is rebuilt once the collection grew by `growth_factor`,
+        from `min_rebuild_rows` rows on (tiny collections would otherwise be
+        rebuilt on every push). Indexes without build metadata (created
+        before this manager existed) are rebuilt once so their parameters get
+        recorded.
+        """
+        build_info = index_state.get("build_info")
+        if build_info is None:
+            return True
+
+        built_records_count = build_info.get("records_count") or 0
+        index_type = index_state.get("index_type") or self.index_type
+
+        if index_type == PgVectorIndexTypeEnums.HNSW.value:
+            return records_count > built_records_count and build_info.get(
+                "params"
+            ) != self.get_index_params(records_count, index_type=index_type)
+
+        if records_count < self.min_rebuild_rows:
+            return False
+
+        return records_count >= max(1, built_records_count) * self.growth_factor
@@ -0,0 +1,482 @@
+import json
+
+from sqlalchemy.sql import text as sql_text
+
+from .VectorDBEnums import (
+    DistanceMethodEnums,
+    PgVectorDistanceMethodEnums,
+    PgVectorDistanceOperatorEnums,
+    PgVectorSearchSettingEnums,
+    PgVectorStorageModeEnums,
+    PgVectorTableSchemaEnums,
+)
+
+
+class PGVectorQueryBuilder:
+    """
+    Builds pgvector search statements whose distance operator matches the
+    operator class of the collection's vector index, so that the planner can
+    answer ORDER BY ... LIMIT with an index scan.
+    """
+
+    # Columns rewritten when an upsert hits an existing chunk
+    upsert_columns = (
+        PgVectorTableSchemaEnums.TEXT.value,
+        PgVectorTableSchemaEnums.VECTOR.value,
+        PgVectorTableSchemaEnums.METADATA.value,
+        PgVectorTableSchemaEnums.CONTENT_HASH.value,
+    )
+
+    def __init__(
+        self,
+        distance_method: str,
+        search_sql_cache_size: int = 1024,
+        text_search_config: str = "simple",
+    ):
+        if distance_method == DistanceMethodEnums.DOT.value:
+            self.distance_method = DistanceMethodEnums.DOT
+        elif distance_method == DistanceMethodEnums.EUCLIDEAN.value:
+            self.distance_method = DistanceMethodEnums.EUCLIDEAN
+        else:
+            self.distance_method = DistanceMethodEnums.COSINE
+
+        self.operator_class = PgVectorDistanceMethodEnums[
+            self.distance_method.name
+        ].value
+        self.distance_operator = PgVectorDistanceOperatorEnums[
+            self.distance_method.name
+        ].value
+
+        self.search_sql_cache = {}
+        self.search_sql_cache_size = search_sql_cache_size
+        self.text_search_config = text_search_config
+
+    @staticmethod
+    def quote_identifier(identifier: str):
+        return '"' + identifier.replace('"', '""') + '"'
+
+    def distance_expression(self, vector_param: str = ":vector"):
+        return (
+            f"{PgVectorTableSchemaEnums.VECTOR.value} "
+            f"{self.distance_operator} {vector_param}"
+        )
+
+    def get_column_type(self, storage_mode: str, embedding_size: int) -> str:
+        # Binary mode keeps full-precision vectors for rescoring and only
+        # quantizes inside the index expression
+        if storage_mode == PgVectorStorageModeEnums.HALFVEC.value:
+            return f"halfvec({embedding_size})"
+        return f"vector({embedding_size})"
+
+    def get_index_expression(self, storage_mode: str, embedding_size: int) -> str:
+        if storage_mode == PgVectorStorageModeEnums.BIT.value:
+            return (
+                f"(binary_quantize({PgVectorTableSchemaEnums.VECTOR.value})"
+                f"::bit({embedding_size}))"
+            )
+        return PgVectorTableSchemaEnums.VECTOR.value
+
+    def get_index_operator_class(self, storage_mode: str) -> str:
+        if storage_mode == PgVectorStorageModeEnums.BIT.value:
+            return "bit_hamming_ops"
+        if storage_mode == PgVectorStorageModeEnums.HALFVEC.value:
+            return self.operator_class.replace("vector_", "halfvec_", 1)
+        return self.operator_class
+
+    def get_index_target(self, storage_mode: str, embedding_size: int) -> str:
+        return (
+            f"{self.get_index_expression(storage_mode, embedding_size)} "
+            f"{self.get_index_operator_class(storage_mode)}"
+        )
+
+    def distance_to_score(self, distance: float) -> float:
+        # cosine: <=> is 1 - cosine similarity
+        if self.distance_method == DistanceMethodEnums.COSINE:
+            return 1 - distance
+
+        # dot: <#> is the negative inner product
+        # euclidean: <-> is the L2 distance, negated so higher is better
+        return -distance
+
+    def get_search_sql(
+        self,
+        collection_name: str,
+        search_filter: dict | None = None,
+        storage_mode: str = PgVectorStorageModeEnums.VECTOR.value,
+        embedding_size: int | None = None,
+    ):
+        """
+        Return the search statement and the bound values of its filter.
+
+        The statement text only depends on the collection and the shape of the
+        filter, so it is built once and reused; asyncpg then serves it from its
+        prepared statement cache with the query vector bound as a typed
+        parameter.
+        """
+        filter_clause, filter_shape, filter_values = self.get_filter_clause(
+            search_filter
+        )
+
+        cache_key = (collection_name, storage_mode, filter_shape)
+        search_sql = self.search_sql_cache.get(cache_key)
+        if search_sql is not None:
+            return search_sql, filter_values
+
+        table_name_quoted = self.quote_identifier(collection_name)
+        where_clause = f"WHERE {filter_clause} " if filter_clause else ""
+
+        search_sql = sql_text(
+            self.get_search_select(
+                table_name_quoted, where_clause, storage_mode, embedding_size
+            )
+        )
+
+        if len(self.search_sql_cache) >= self.search_sql_cache_size:
+            self.search_sql_cache.clear()
+        self.search_sql_cache[cache_key] = search_sql
+
+        return search_sql, filter_values
+
+    def get_search_select(
+        self,
+        table_name_quoted: str,
+        where_clause: str,
+        storage_mode: str,
+        embedding_size: int | None,
+        vector_param: str = ":vector",
+    ) -> str:
+        if storage_mode == PgVectorStorageModeEnums.BIT.value:
+            # First stage: Hamming distance on the binary quantized index,
+            # second stage: exact rescoring of the candidates.
+            index_expression = self.get_index_expression(storage_mode, embedding_size)
+            return (
+                f"SELECT text, chunk_id, "
+                f"{self.distance_expression(vector_param)} as distance "
+                f"FROM ("
+                f"SELECT {PgVectorTableSchemaEnums.TEXT.value} as text, "
+                f"{PgVectorTableSchemaEnums.CHUNK_ID.value} as chunk_id, "
+                f"{PgVectorTableSchemaEnums.VECTOR.value} "
+                f"FROM {table_name_quoted} {where_clause}"
+                f"ORDER BY {index_expression} <~> "
+                f"binary_quantize(CAST({vector_param} AS vector({embedding_size})))"
+                f"::bit({embedding_size}) "
+                f"LIMIT :candidates_limit"
+                f") candidates "
+                f"ORDER BY distance LIMIT :limit"
+            )
+
+        # Order by the raw distance (ascending) rather than a derived score,
+        # otherwise the ANN index can not satisfy the ORDER BY.
+        return (
+            f"SELECT {PgVectorTableSchemaEnums.TEXT.value} as text, "
+            f"{PgVectorTableSchemaEnums.CHUNK_ID.value} as chunk_id, "
+            f"{self.distance_expression(vector_param)} as distance "
+            f"FROM {table_name_quoted} {where_clause}"
+            f"ORDER BY distance LIMIT :limit"
+        )
+
+    def get_search_many_sql(
+        self,
+        collection_name: str,
+        search_filter: dict | None = None,
+        storage_mode: str = PgVectorStorageModeEnums.VECTOR.value,
+        embedding_size: int | None = None,
+    ):
+        """
+        Batched variant of get_search_sql: the query vectors are bound as one
+        array and every element drives its own index scan through a LATERAL
+        join, so N searches cost a single round-trip.
+        """
+        filter_clause, filter_shape, filter_values = self.get_filter_clause(
+            search_filter
+        )
+
+        cache_key = (collection_name, "search_many", storage_mode, filter_shape)
+        search_sql = self.search_sql_cache.get(cache_key)
+        if search_sql is not None:
+            return search_sql, filter_values
+
+        table_name_quoted = self.quote_identifier(collection_name)
+        where_clause = f"WHERE {filter_clause} " if filter_clause else ""
+        column_type = self.get_column_type(storage_mode, embedding_size)
+
+        search_select = self.get_search_select(
+            table_name_quoted,
+            where_clause,
+            storage_mode,
+            embedding_size,
+            vector_param="queries.query_vector",
+        )
+        search_sql = sql_text(
+            f"SELECT queries.query_index, results.text, results.chunk_id, "
+            f"results.distance "
+            f"FROM unnest(CAST(:vectors AS {column_type}[])) "
+            f"WITH ORDINALITY AS queries(query_vector, query_index) "
+            f"CROSS JOIN LATERAL ({search_select}) results "
+            f"ORDER BY queries.query_index, results.distance"
+        )
+
+        if len(self.search_sql_cache) >= self.search_sql_cache_size:
+            self.search_sql_cache.clear()
+        self.search_sql_cache[cache_key] = search_sql
+
+        return search_sql, filter_values
+
+    def text_search_expression(self):
+        return (
+            f"to_tsvector('{self.text_search_config}', "
+            f"coalesce({PgVectorTableSchemaEnums.TEXT.value}, ''))"
+        )
+
+    def get_text_search_sql(
+        self, collection_name: str, search_filter: dict | None = None
+    ):
+        """
+        Full-text counterpart of get_search_sql, ranking rows of the generated
+        tsvector column (GIN indexed) against websearch_to_tsquery(:query).
+        """
+        filter_clause, filter_shape, filter_values = self.get_filter_clause(
+            search_filter
+        )
+
+        cache_key = (collection_name, "text_search", filter_shape)
+        search_sql = self.search_sql_cache.get(cache_key)
+        if search_sql is not None:
+            return search_sql, filter_values
+
+        table_name_quoted = self.quote_identifier(collection_name)
+        text_search_column = PgVectorTableSchemaEnums.TEXT_SEARCH.value
+        filter_clause = f"AND {filter_clause} " if filter_clause else ""
+
+        search_sql = sql_text(
+            f"SELECT {PgVectorTableSchemaEnums.TEXT.value} as text, "
+            f"{PgVectorTableSchemaEnums.CHUNK_ID.value} as chunk_id, "
+            f"ts_rank_cd({text_search_column}, query) as rank "
+            f"FROM {table_name_quoted}, "
+            f"websearch_to_tsquery('{self.text_search_config}', :query) query "
+            f"WHERE {text_search_column} @@ query {filter_clause}"
+            f"ORDER BY rank DESC LIMIT :limit"
+        )
+
+        if len(self.search_sql_cache) >= self.search_sql_cache_size:
+            self.search_sql_cache.clear()
+        self.search_sql_cache[cache_key] = search_sql
+
+        return search_sql, filter_values
+
+    def get_filter_clause(self, search_filter: dict | None):
+        """
+        Translate a structured filter into a SQL condition.
+
+        search_filter = {
+            "chunk_ids": [1, 2, 3],
+            "metadata": [
+                {"key": "asset_id", "eq": 4},
+                {"key": "source", "any_of": ["a.pdf", "b.pdf"]},
+                {"key": "page", "gte": 10, "lte": 20},
+            ],
+        }
+
+        Equality uses jsonb containment (served by the GIN index), ranges
+        compare the raw jsonb value (served by the per-key expression index).
+        Keys are inlined as literals so the expressions match the indexes;
+        all values are bound parameters.
+        """
+        if not search_filter:
+            return None, (), {}
+
+        conditions = []
+        shape = []
+        values = {}
+
+        # Scopes searches on a shared table to a single collection
+        collection_name = search_filter.get("collection_name")
+        if collection_name is not None:
+            conditions.append(
+                f"{PgVectorTableSchemaEnums.COLLECTION_NAME.value} = "
+                f":filter_collection_name"
+            )
+            shape.append(("collection_name",))
+            values["filter_collection_name"] = collection_name
+
+        chunk_ids = search_filter.get("chunk_ids")
+        if chunk_ids:
+            conditions.append(
+                f"{PgVectorTableSchemaEnums.CHUNK_ID.value} = ANY(:filter_chunk_ids)"
+            )
+            shape.append(("chunk_ids",))
+            values["filter_chunk_ids"] = [int(chunk_id) for chunk_id in chunk_ids]
+
+        for idx, condition in enumerate(search_filter.get("metadata") or []):
+            key = condition["key"]
+            key_literal = "'" + key.replace("'", "''") + "'"
+            field = f"({PgVectorTableSchemaEnums.METADATA.value} -> {key_literal})"
+            param_prefix = f"filter_{idx}"
+
+            if condition.get("eq") is not None:
+                conditions.append(
+                    f"{PgVectorTableSchemaEnums.METADATA.value} @> "
+                    f"CAST(:{param_prefix}_eq AS jsonb)"
+                )
+                values[f"{param_prefix}_eq"] = json.dumps({key: condition["eq"]})
+                shape.append((key, "eq"))
+
+            if condition.get("any_of"):
+                conditions.append(
+                    f"{field} = ANY(CAST(:{param_prefix}_any_of AS jsonb[]))"
+                )
+                values[f"{param_prefix}_any_of"] = [
+                    json.dumps(value) for value in condition["any_of"]
+                ]
+                shape.append((key, "any_of"))
+
+            is_range = False
+            for op, sql_op in (("gt", ">"), ("gte", ">="), ("lt", "<"), ("lte", "<=")):
+                if condition.get(op) is None:
+                    continue
+
+                conditions.append(
+                    f"{field} {sql_op} CAST(:{param_prefix}_{op} AS jsonb)"
+                )
+                values[f"{param_prefix}_{op}"] = json.dumps(condition[op])
+                shape.append((key, op))
+                is_range = True
+
+            if is_range:
+                # jsonb orders strings below numbers; keep ranges numeric only
+                conditions.append(f"jsonb_typeof({field}) = 'number'")
+
+        return " AND ".join(conditions), tuple(shape), values
+
+    def get_search_settings_sql(self, search_params: dict | None):
+        """
+        Build a set_config() statement applying the per-request ANN knobs
+        (hnsw.ef_search / ivfflat.probes / iterative scans) for the current
+        transaction only, i.e. the bindable equivalent of SET LOCAL.
+        """
+        if not search_params:
+            return None, {}
+
+        settings = {}
+        if search_params.get("ef_search") is not None:
+            settings[PgVectorSearchSettingEnums.EF_SEARCH.value] = str(
+                int(search_params["ef_search"])
+            )
+        if search_params.get("probes") is not None:
+            settings[PgVectorSearchSettingEnums.PROBES.value] = str(
+                int(search_params["probes"])
+            )
+
+        # Keep scanning the index until enough rows pass the filter
+        iterative_scan = search_params.get("iterative_scan")
+        if iterative_scan:
+            settings[PgVectorSearchSettingEnums.HNSW_ITERATIVE_SCAN.value] = (
+                iterative_scan
+            )
+            # IVFFlat only supports relaxed ordering
+            settings[PgVectorSearchSettingEnums.IVFFLAT_ITERATIVE_SCAN.value] = (
+                "off" if iterative_scan == "off" else "relaxed_order"
+            )
+
+        if not settings:
+            return None, {}
+
+        statements = []
+        values = {}
+        for idx, (setting, value) in enumerate(settings.items()):
+            statements.append(f"set_config('{setting}', :setting_{idx}, true)")
+            values[f"setting_{idx}"] = value
+
+        return sql_text(f"SELECT {', '.join(statements)}"), values
+
+    def get_metadata_index_sqls(
+        self,
+        collection_name: str,
+        metadata_index_keys: list[str],
+        concurrently: bool = False,
+        chunk_key: bool = True,
+    ) -> list:
+        """
+        Index statements backing metadata filters and lexical search: a GIN
+        index for jsonb containment, a GIN index on the tsvector column, the
+        unique chunk_id index upserts conflict on and one expression index per
+        range-filtered key.
+        """
+        table_name_quoted = self.quote_identifier(collection_name)
+        create_index = (
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS"
+            if concurrently
+            else "CREATE INDEX IF NOT EXISTS"
+        )
+        create_unique_index = create_index.replace("INDEX", "UNIQUE INDEX", 1)
+        index_names = self.get_metadata_index_names(
+            collection_name, metadata_index_keys, chunk_key=chunk_key
+        )
+
+        index_sqls = [
+            f"{create_index} {self.quote_identifier(index_names['metadata'])} "
+            f"ON {table_name_quoted} USING gin "
+            f"({PgVectorTableSchemaEnums.METADATA.value} jsonb_path_ops)",
+            f"{create_index} {self.quote_identifier(index_names['text_search'])} "
+            f"ON {table_name_quoted} USING gin "
+            f"({PgVectorTableSchemaEnums.TEXT_SEARCH.value})",
+        ]
+
+        if chunk_key:
+            index_sqls.append(
+                f"{create_unique_index} "
+                f"{self.quote_identifier(index_names['chunk_key'])} "
+                f"ON {table_name_quoted} ({PgVectorTableSchemaEnums.CHUNK_ID.value})"
+            )
+
+        for key in metadata_index_keys or []:
+            key_literal = "'" + key.replace("'", "''") + "'"
+            index_name_quoted = self.quote_identifier(index_names[f"metadata_{key}"])
+            index_sqls.append(
+                f"{create_index} {index_name_quoted} ON {table_name_quoted} "
+                f"(({PgVectorTableSchemaEnums.METADATA.value} -> {key_literal}))"
+            )
+
+        return [sql_text(index_sql) for index_sql in index_sqls]
+
+    def get_metadata_index_names(
+        self,
+        collection_name: str,
+        metadata_index_keys: list[str],
+        chunk_key: bool = True,
+    ) -> dict:
+        index_names = {
+            "metadata": f"{collection_name}_metadata_idx",
+            "text_search": f"{collection_name}_text_search_idx",
+        }
+        if chunk_key:
+            index_names["chunk_key"] = self.get_chunk_key_name(collection_name)
+        for key in metadata_index_keys or []:
+            index_names[f"metadata_{key}"] = f"{collection_name}_metadata_{key}_idx"
+
+        return index_names
+
+    def get_chunk_key_name(self, collection_name: str) -> str:
+        return f"{collection_name}_chunk_id_key"
+
+    def get_upsert_clause(self, table_name: str, conflict_columns: list) -> str:
+        """
+        ON CONFLICT clause keyed by chunk_id: the row is only rewritten when
+        its content hash changed (or was never recorded).
+        """
+        table_name_quoted = self.quote_identifier(table_name)
+        content_hash = PgVectorTableSchemaEnums.CONTENT_HASH.value
+        update_sql = ", ".join(
+            f"{column} = EXCLUDED.{column}" for column in self.upsert_columns
+        )
+
+        return (
+            f"ON CONFLICT ({', '.join(conflict_columns)}) DO UPDATE SET {update_sql} "
+            f"WHERE {table_name_quoted}.{content_hash} IS NULL "
+            f"OR {table_name_quoted}.{content_hash} IS DISTINCT FROM EXCLUDED.{content_hash}"
+        )
+
+    def invalidate(self, collection_name: str):
+        for cache_key in list(self.search_sql_cache):
+            if cache_key[0] == collection_name:
+                self.search_sql_cache.pop(cache_key, None)
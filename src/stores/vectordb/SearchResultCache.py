@@ -0,0 +1,87 @@
+import json
+import time
+from collections import OrderedDict
+
+
+class SearchResultCache:
+    """
+    In-process LRU cache of search results, bounded by entry count and by
+    the approximate size of the cached results; entries also expire after
+    `ttl` seconds.
+
+    Keys carry the collection generation they were computed against, so a
+    write to the collection makes its entries unreachable; they are then
+    evicted as the least recently used.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024**2, ttl=300):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # key -> (results, size in bytes, cached_at)
+        self.entries = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def get_key(self, collection_name: str, generation: int, text: str, **params):
+        # Queries differing only by case or whitespace share an entry
+        normalized_text = " ".join(text.casefold().split())
+        return (
+            collection_name,
+            generation,
+            normalized_text,
+            json.dumps(params, sort_keys=True, default=str),
+        )
+
+    def get(self, key):
+        entry = self.entries.get(key)
+
+        if entry is not None and time.monotonic() - entry[2] > self.ttl:
+            self._pop(key)
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key, results):
+        size = len(json.dumps(results, default=str)) + len(json.dumps(key))
+        if size > self.max_bytes:
+            return
+
+        self._pop(key)
+        self.entries[key] = (results, size, time.monotonic())
+        self.size_bytes += size
+
+        while self.entries and (
+            len(self.entries) > self.max_entries or self.size_bytes > self.max_bytes
+        ):
+            self._pop(next(iter(self.entries)))
+
+    def _pop(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= entry[1]
+
+    def clear(self):
+        self.entries.clear()
+        self.size_bytes = 0
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "size_bytes": self.size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
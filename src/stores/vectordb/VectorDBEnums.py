@@ -4,11 +4,20 @@ from enum import Enum
 class VectorDBEnums(Enum):
     QDRANT = "QDRANT"
     PGVECTOR = "PGVECTOR"
+    PGVECTOR_PARTITIONED = "PGVECTOR_PARTITIONED"
+    LOCAL = "LOCAL"
+    HNSW = "HNSW"
+
+
+class QdrantQuantizationEnums(Enum):
+    SCALAR = "scalar"
+    BINARY = "binary"
 
 
 class DistanceMethodEnums(Enum):
     COSINE = "cosine"
     DOT = "dot"
+    EUCLIDEAN = "euclidean"
 
 
 class PgVectorTableSchemaEnums(Enum):
@@ -17,14 +26,53 @@ class PgVectorTableSchemaEnums(Enum):
     VECTOR = "vector"
     CHUNK_ID = "chunk_id"
     METADATA = "metadata"
+    TEXT_SEARCH = "text_search"
+    COLLECTION_NAME = "collection_name"
+    CONTENT_HASH = "content_hash"
     _PREFIX = "pgvector"
 
 
 class PgVectorDistanceMethodEnums(Enum):
     COSINE = "vector_cosine_ops"
-    DOT = "vector_l2_ops"
+    DOT = "vector_ip_ops"
+    EUCLIDEAN = "vector_l2_ops"
+
+
+class PgVectorDistanceOperatorEnums(Enum):
+    COSINE = "<=>"
+    DOT = "<#>"
+    EUCLIDEAN = "<->"
 
 
 class PgVectorIndexTypeEnums(Enum):
     HNSW = "hnsw"
     IVFFLAT = "ivfflat"
+
+
+class PgVectorStorageModeEnums(Enum):
+    VECTOR = "vector"
+    HALFVEC = "halfvec"
+    BIT = "bit"
+
+
+class PgVectorInsertModeEnums(Enum):
+    INSERT = "insert"
+    COPY = "copy"
+
+
+class PgVectorSearchSettingEnums(Enum):
+    EF_SEARCH = "hnsw.ef_search"
+    PROBES = "ivfflat.probes"
+    HNSW_ITERATIVE_SCAN = "hnsw.iterative_scan"
+    IVFFLAT_ITERATIVE_SCAN = "ivfflat.iterative_scan"
+
+
+class SearchQualityEnums(Enum):
+    FAST = "fast"
+    BALANCED = "balanced"
+    ACCURATE = "accurate"
+
+
+class SnapshotVectorDtypeEnums(Enum):
+    FLOAT32 = "float32"
+    FLOAT16 = "float16"
@@ -9,44 +9,47 @@ class VectorDBInterface(ABC):
         pass
 
     @abstractmethod
-    def disconnect(self):
+    async def disconnect(self):
         pass
 
     @abstractmethod
-    def is_collection_exist(self, collection_name: str) -> bool:
+    async def is_collection_exist(self, collection_name: str) -> bool:
         pass
 
     @abstractmethod
-    def get_collection_info(self, collection_name: str) -> dict:
+    async def get_collection_info(
+        self, collection_name: str, exact_count: bool = False
+    ) -> dict:
         pass
 
     @abstractmethod
-    def list_all_collections(self) -> list:
+    async def list_all_collections(self) -> list:
         pass
 
     @abstractmethod
-    def delete_collection(self, collection_name: str):
+    async def delete_collection(self, collection_name: str):
         pass
 
     @abstractmethod
-    def create_collection(
+    async def create_collection(
         self, collection_name: str, embedding_size: int, is_reset: bool = False
     ):
         pass
 
     @abstractmethod
-    def insert_one(
+    async def insert_one(
         self,
         collection_name: str,
         text: str,
         vector: list,
         metadata: dict | None = None,
         record_id: str | None = None,
+        content_hash: str | None = None,
     ) -> bool:
         pass
 
     @abstractmethod
-    def insert_many(
+    async def insert_many(
         self,
         collection_name: str,
         texts: list,
@@ -54,11 +57,28 @@ class VectorDBInterface(ABC):
         metadata: list | None = None,
         record_ids: list | None = None,
         batch_size: int = 50,
+        content_hashes: list | None = None,
     ) -> bool:
         pass
 
     @abstractmethod
-    def search_by_vector(
-        self, collection_name: str, vector: list, limit: int
+    async def search_by_vector(
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int,
+        search_params: dict | None = None,
+        search_filter: dict | None = None,
     ) -> list[RetrievedDocument] | None:
         pass
+
+    @abstractmethod
+    async def search_many(
+        self,
+        collection_name: str,
+        vectors: list,
+        limit: int,
+        search_params: dict | None = None,
+        search_filter: dict | None = None,
+    ) -> list[list[RetrievedDocument]] | None:
+        pass
@@ -2,7 +2,14 @@ from sqlalchemy.orm import sessionmaker
 
 from controllers.BaseController import BaseController
 
-from .providers import PGVectorProvider, QdrantDBProvider
+from .CollectionGenerations import CollectionGenerations
+from .providers import (
+    HnswVectorProvider,
+    LocalVectorProvider,
+    PGVectorPartitionedProvider,
+    PGVectorProvider,
+    QdrantDBProvider,
+)
 from .VectorDBEnums import VectorDBEnums
 
 
@@ -13,20 +20,91 @@ class VectorDBProviderFactory:
         self.db_client = db_client
 
     def create(self, provider: str):
+        # Write counters invalidating cached search results of a collection
+        collection_generations = CollectionGenerations(
+            redis_url=self.config.SEARCH_CACHE_REDIS_URL
+        )
+
         if provider == VectorDBEnums.QDRANT.value:
-            qdrant_db_client = self.base_controller.get_database_path(
-                db_name=self.config.VECTOR_DB_PATH
-            )
+            # A server url takes precedence over the embedded storage path
+            qdrant_db_client = None
+            if not self.config.VECTOR_DB_QDRANT_URL:
+                qdrant_db_client = self.base_controller.get_database_path(
+                    db_name=self.config.VECTOR_DB_PATH
+                )
             return QdrantDBProvider(
                 db_client=qdrant_db_client,
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                metadata_index_keys=self.config.VECTOR_DB_METADATA_INDEX_KEYS,
+                url=self.config.VECTOR_DB_QDRANT_URL,
+                api_key=self.config.VECTOR_DB_QDRANT_API_KEY,
+                prefer_grpc=self.config.VECTOR_DB_QDRANT_PREFER_GRPC,
+                upload_parallel=self.config.VECTOR_DB_QDRANT_UPLOAD_PARALLEL,
+                quantization=self.config.VECTOR_DB_QDRANT_QUANTIZATION,
+                quantization_always_ram=self.config.VECTOR_DB_QDRANT_QUANTIZATION_ALWAYS_RAM,
+                quantization_rescore=self.config.VECTOR_DB_QDRANT_QUANTIZATION_RESCORE,
+                quantization_oversampling=self.config.VECTOR_DB_QDRANT_QUANTIZATION_OVERSAMPLING,
+                on_disk=self.config.VECTOR_DB_QDRANT_ON_DISK,
+                hnsw_m=self.config.VECTOR_DB_QDRANT_HNSW_M,
+                hnsw_ef_construct=self.config.VECTOR_DB_QDRANT_HNSW_EF_CONSTRUCT,
+                payload_schemas=self.config.VECTOR_DB_QDRANT_PAYLOAD_SCHEMAS,
+                collection_generations=collection_generations,
             )
-        elif provider == VectorDBEnums.PGVECTOR.value:
-            return PGVectorProvider(
+        elif provider in (
+            VectorDBEnums.PGVECTOR.value,
+            VectorDBEnums.PGVECTOR_PARTITIONED.value,
+        ):
+            pgvector_config = dict(
                 db_client=self.db_client,
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
                 default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
                 index_threshold=self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+                insert_mode=self.config.VECTOR_DB_PGVEC_INSERT_MODE,
+                collection_cache_ttl=self.config.VECTOR_DB_COLLECTION_CACHE_TTL,
+                index_maintenance_work_mem=self.config.VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM,
+                index_parallel_workers=self.config.VECTOR_DB_PGVEC_INDEX_PARALLEL_WORKERS,
+                index_type=self.config.VECTOR_DB_PGVEC_INDEX_TYPE,
+                index_growth_factor=self.config.VECTOR_DB_PGVEC_INDEX_GROWTH_FACTOR,
+                index_min_rebuild_rows=self.config.VECTOR_DB_PGVEC_INDEX_MIN_REBUILD_ROWS,
+                metadata_index_keys=self.config.VECTOR_DB_METADATA_INDEX_KEYS,
+                iterative_scan=self.config.VECTOR_DB_PGVEC_ITERATIVE_SCAN,
+                text_search_config=self.config.VECTOR_DB_PGVEC_TEXT_SEARCH_CONFIG,
+                storage_mode=self.config.VECTOR_DB_PGVEC_STORAGE_MODE,
+                rescore_factor=self.config.VECTOR_DB_PGVEC_RESCORE_FACTOR,
+                collection_generations=collection_generations,
+            )
+
+            if provider == VectorDBEnums.PGVECTOR_PARTITIONED.value:
+                # One list-partitioned table shared by all collections
+                return PGVectorPartitionedProvider(
+                    **pgvector_config,
+                    partition_threshold=self.config.VECTOR_DB_PGVEC_PARTITION_THRESHOLD,
+                )
+            return PGVectorProvider(**pgvector_config)
+
+        elif provider == VectorDBEnums.LOCAL.value:
+            local_db_client = self.base_controller.get_database_path(
+                db_name=self.config.VECTOR_DB_LOCAL_PATH
+            )
+            return LocalVectorProvider(
+                db_client=local_db_client,
+                distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
+                collection_generations=collection_generations,
+            )
+
+        elif provider == VectorDBEnums.HNSW.value:
+            hnsw_db_client = self.base_controller.get_database_path(
+                db_name=self.config.VECTOR_DB_HNSW_PATH
+            )
+            return HnswVectorProvider(
+                db_client=hnsw_db_client,
+                distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
+                hnsw_m=self.config.VECTOR_DB_HNSW_M,
+                hnsw_ef_construct=self.config.VECTOR_DB_HNSW_EF_CONSTRUCT,
+                hnsw_ef_search=self.config.VECTOR_DB_HNSW_EF_SEARCH,
+                collection_generations=collection_generations,
             )
 
         return None
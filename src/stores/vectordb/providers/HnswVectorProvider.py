@@ -0,0 +1,294 @@
+import asyncio
+import fcntl
+import math
+import os
+
+import numpy as np
+from usearch.index import Index
+
+from models.db_schemas import RetrievedDocument
+
+from ..CollectionGenerations import CollectionGenerations
+from ..VectorDBEnums import DistanceMethodEnums
+from .LocalVectorProvider import LocalVectorProvider
+
+
+class HnswVectorProvider(LocalVectorProvider):
+    """
+    Embedded approximate-nearest-neighbour store for collections too large
+    for exact search.
+
+    Rows, records and upsert semantics are the ones of `LocalVectorProvider`;
+    on top of them every collection keeps a usearch HNSW graph keyed by row
+    number. `maintain_vector_index` (run by the index build task once a push
+    is loaded) extends the graph with the rows appended since the last build
+    and replaces the index file atomically, while searches memory-map the file
+    read-only (`Index.view`), so startup doesn't load the graph into memory.
+    Rows not in the graph yet are searched exactly.
+
+    Superseded and filtered-out rows are dropped after the graph search, which
+    over-fetches accordingly; when a filter leaves fewer rows than that, the
+    matching rows are ranked exactly instead.
+    """
+
+    index_file_name = "index.usearch"
+
+    def __init__(
+        self,
+        db_client: str,
+        distance_method: str = None,
+        default_vector_size: int = 786,
+        hnsw_m: int = 16,
+        hnsw_ef_construct: int = 128,
+        hnsw_ef_search: int = 64,
+        oversampling: int = 2,
+        index_add_batch_size: int = 65536,
+        collection_generations: CollectionGenerations | None = None,
+    ):
+        super().__init__(
+            db_client=db_client,
+            distance_method=distance_method,
+            default_vector_size=default_vector_size,
+            collection_generations=collection_generations,
+        )
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construct = hnsw_ef_construct
+        self.hnsw_ef_search = hnsw_ef_search
+        self.oversampling = max(1, oversampling)
+        self.index_add_batch_size = index_add_batch_size
+
+        # collection name -> {"file_state", "index"}; read-only views for
+        # searches and fully loaded indexes for the writer
+        self.index_views = {}
+        self.index_writers = {}
+
+    async def disconnect(self):
+        self.index_views.clear()
+        self.index_writers.clear()
+        await super().disconnect()
+
+    async def get_collection_info(
+        self, collection_name: str, exact_count: bool = False
+    ) -> dict:
+        collection_info = await super().get_collection_info(
+            collection_name, exact_count=exact_count
+        )
+        if collection_info is None:
+            return None
+
+        index_path = self._get_collection_path(collection_name, self.index_file_name)
+        index = self._load_index(
+            collection_name, collection_info["table_data"]["embedding_size"]
+        )
+
+        collection_info["sizes"]["index"] = (
+            os.path.getsize(index_path) if os.path.exists(index_path) else 0
+        )
+        collection_info["index"] = {
+            "indexed_rows_count": len(index) if index is not None else 0,
+            "m": self.hnsw_m,
+            "ef_construct": self.hnsw_ef_construct,
+            "ef_search": self.hnsw_ef_search,
+        }
+        return collection_info
+
+    async def delete_collection(self, collection_name: str):
+        self.index_views.pop(collection_name, None)
+        self.index_writers.pop(collection_name, None)
+        return await super().delete_collection(collection_name)
+
+    def _new_index(self, embedding_size: int) -> Index:
+        # Cosine vectors are normalized on the way in, so inner product ranks them
+        metric = (
+            "l2sq" if self.distance_method == DistanceMethodEnums.EUCLIDEAN else "ip"
+        )
+        return Index(
+            ndim=embedding_size,
+            metric=metric,
+            dtype="f32",
+            connectivity=self.hnsw_m,
+            expansion_add=self.hnsw_ef_construct,
+            expansion_search=self.hnsw_ef_search,
+        )
+
+    def _get_index_file_state(self, collection_name: str):
+        index_path = self._get_collection_path(collection_name, self.index_file_name)
+        if not os.path.exists(index_path):
+            return None
+        index_stat = os.stat(index_path)
+        return (index_stat.st_ino, index_stat.st_size, index_stat.st_mtime_ns)
+
+    def _load_index(self, collection_name: str, embedding_size: int) -> Index | None:
+        """
+        Return a read-only memory-mapped view of the collection index,
+        re-mapping it only when the writer replaced the file.
+        """
+        file_state = self._get_index_file_state(collection_name)
+        if file_state is None:
+            return None
+
+        cached = self.index_views.get(collection_name)
+        if cached is not None and cached["file_state"] == file_state:
+            return cached["index"]
+
+        index = self._new_index(embedding_size)
+        index.view(self._get_collection_path(collection_name, self.index_file_name))
+
+        self.index_views[collection_name] = {"file_state": file_state, "index": index}
+        return index
+
+    async def maintain_vector_index(self, collection_name: str) -> bool:
+        """
+        Add the rows appended since the last build to the collection graph
+        and save it once. Inserts never touch the graph: the indexing tasks
+        call this when they are done, and rows past the indexed ones are
+        searched exactly meanwhile.
+        """
+        if not await self.is_collection_exist(collection_name):
+            return False
+
+        return await asyncio.to_thread(self._maintain_index, collection_name)
+
+    def _maintain_index(self, collection_name: str) -> bool:
+        lock_path = self._get_collection_path(collection_name, self.lock_file_name)
+        with open(lock_path, "a") as lock_file:
+            # Appends wait for the save; searches keep mapping the old file
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                return self._update_index(collection_name)
+            except Exception:
+                self.index_writers.pop(collection_name, None)
+                raise
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _update_index(self, collection_name: str):
+        collection = self._load_collection(collection_name)
+        vectors = collection["vectors"]
+        index_path = self._get_collection_path(collection_name, self.index_file_name)
+
+        file_state = self._get_index_file_state(collection_name)
+        writer = self.index_writers.get(collection_name)
+        if writer is None or writer["file_state"] != file_state:
+            index = self._new_index(collection["embedding_size"])
+            if file_state is not None:
+                index.load(index_path)
+            writer = {"file_state": file_state, "index": index}
+
+        index = writer["index"]
+        indexed_rows_count = len(index)
+        if indexed_rows_count >= vectors.shape[0]:
+            return False
+
+        for start in range(
+            indexed_rows_count, vectors.shape[0], self.index_add_batch_size
+        ):
+            end = min(start + self.index_add_batch_size, vectors.shape[0])
+            index.add(
+                np.arange(start, end, dtype=np.uint64), np.asarray(vectors[start:end])
+            )
+
+        # Searches keep mapping the old file until they see the new one
+        tmp_index_path = f"{index_path}.tmp"
+        index.save(tmp_index_path)
+        os.replace(tmp_index_path, index_path)
+
+        writer["file_state"] = self._get_index_file_state(collection_name)
+        self.index_writers[collection_name] = writer
+        return True
+
+    def _search(
+        self, collection_name, vectors, limit, search_filter, search_params=None
+    ):
+        collection = self._load_collection(collection_name)
+        index = self._load_index(collection_name, collection["embedding_size"])
+        if index is None or not len(index):
+            return super()._search(collection_name, vectors, limit, search_filter)
+
+        matrix = collection["vectors"]
+        records = collection["records"]
+        queries = self._prepare_vectors(vectors)
+        mask = collection["live_mask"] & self._get_filter_mask(records, search_filter)
+
+        indexed_rows_count = min(len(index), matrix.shape[0])
+        matching_rows_count = int(mask[:indexed_rows_count].sum())
+
+        # Over-fetch by the share of indexed rows the mask drops
+        count = min(
+            indexed_rows_count,
+            math.ceil(limit * indexed_rows_count / max(matching_rows_count, 1))
+            * self.oversampling,
+        )
+        if matching_rows_count <= count:
+            return super()._search(collection_name, vectors, limit, search_filter)
+
+        ef_search = self.hnsw_ef_search
+        if search_params and search_params.get("ef_search") is not None:
+            ef_search = int(search_params["ef_search"])
+        index.expansion_search = max(ef_search, count)
+
+        matches = index.search(queries, count)
+        matches_keys = np.asarray(matches.keys).reshape(len(queries), -1)
+        matches_distances = np.asarray(matches.distances).reshape(len(queries), -1)
+        if len(queries) == 1:
+            # A single query comes back as `Matches` rather than `BatchMatches`
+            matches_counts = np.array([len(matches)])
+        else:
+            matches_counts = np.asarray(matches.counts)
+
+        # Rows appended after the last index update are scored exactly
+        tail_rows = np.flatnonzero(mask[indexed_rows_count:]) + indexed_rows_count
+        tail_scores = None
+        if len(tail_rows):
+            tail_scores = self._score(np.asarray(matrix[tail_rows]), queries)
+
+        results = []
+        missed_queries = []
+        for query_idx in range(len(queries)):
+            found = matches_counts[query_idx]
+            rows = matches_keys[query_idx][:found].astype(np.int64)
+            distances = matches_distances[query_idx][:found]
+
+            keep = mask[rows]
+            rows, scores = rows[keep], self._get_scores(distances[keep])
+
+            if tail_scores is not None:
+                rows = np.concatenate([rows, tail_rows])
+                scores = np.concatenate([scores, tail_scores[query_idx]])
+
+            if len(rows) < min(limit, matching_rows_count + len(tail_rows)):
+                # The graph walk didn't reach enough matching rows
+                missed_queries.append(query_idx)
+
+            order = np.argsort(-scores)[:limit]
+            results.append(
+                [
+                    RetrievedDocument(
+                        text=records[row]["text"],
+                        score=float(score),
+                        chunk_id=records[row]["chunk_id"],
+                    )
+                    for row, score in zip(rows[order], scores[order])
+                ]
+            )
+
+        if missed_queries:
+            exact_results = super()._search(
+                collection_name,
+                [queries[query_idx] for query_idx in missed_queries],
+                limit,
+                search_filter,
+            )
+            for query_idx, exact_result in zip(missed_queries, exact_results):
+                results[query_idx] = exact_result
+
+        return results
+
+    def _get_scores(self, distances: np.ndarray) -> np.ndarray:
+        """
+        Convert usearch distances to the provider scores, higher is better.
+        """
+        distances = distances.astype(np.float32)
+        if self.distance_method == DistanceMethodEnums.EUCLIDEAN:
+            return -np.sqrt(np.maximum(distances, 0))
+        return 1 - distances
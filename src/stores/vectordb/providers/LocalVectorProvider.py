@@ -0,0 +1,698 @@
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import shutil
+
+import numpy as np
+
+from models.db_schemas import RetrievedDocument
+
+from ..CollectionGenerations import CollectionGenerations
+from ..VectorDBEnums import DistanceMethodEnums
+from ..VectorDBInterface import VectorDBInterface
+
+
+class LocalVectorProvider(VectorDBInterface):
+    """
+    Embedded exact-search store for small and medium projects.
+
+    Every collection is a directory holding an append-only float32 `.npy`
+    matrix and a JSON-lines side file with the chunk id, text and metadata of
+    each row. Searches memory-map the matrix read-only, so any number of
+    worker processes share the same pages without copying, and rank all rows
+    with a blocked matrix product and `argpartition`.
+
+    Re-inserting a chunk appends a new row; the last row of a chunk id wins.
+    Deleting a chunk appends a tombstone row, so deletes never rewrite files.
+    """
+
+    vectors_file_name = "vectors.npy"
+    records_file_name = "records.jsonl"
+    meta_file_name = "meta.json"
+    lock_file_name = ".lock"
+
+    def __init__(
+        self,
+        db_client: str,
+        distance_method: str = None,
+        default_vector_size: int = 786,
+        search_block_size: int = 65536,
+        collection_generations: CollectionGenerations | None = None,
+    ):
+        self.db_client = db_client
+        self.default_vector_size = default_vector_size
+        self.search_block_size = search_block_size
+        self.collection_generations = collection_generations or CollectionGenerations()
+
+        if distance_method == DistanceMethodEnums.DOT.value:
+            self.distance_method = DistanceMethodEnums.DOT
+        elif distance_method == DistanceMethodEnums.EUCLIDEAN.value:
+            self.distance_method = DistanceMethodEnums.EUCLIDEAN
+        else:
+            self.distance_method = DistanceMethodEnums.COSINE
+
+        # collection name -> loaded matrix, records and the file state they match
+        self.collections = {}
+
+        self.logger = logging.getLogger("uvicorn")
+
+    async def connect(self):
+        os.makedirs(self.db_client, exist_ok=True)
+
+    async def disconnect(self):
+        self.collections.clear()
+        await self.collection_generations.close()
+
+    def _get_collection_path(self, collection_name: str, file_name: str = ""):
+        return os.path.join(self.db_client, collection_name, file_name)
+
+    async def is_collection_exist(self, collection_name: str) -> bool:
+        return os.path.exists(
+            self._get_collection_path(collection_name, self.meta_file_name)
+        )
+
+    async def list_all_collections(self) -> list:
+        if not os.path.isdir(self.db_client):
+            return []
+
+        return sorted(
+            name
+            for name in os.listdir(self.db_client)
+            if os.path.exists(self._get_collection_path(name, self.meta_file_name))
+        )
+
+    async def get_collection_info(
+        self, collection_name: str, exact_count: bool = False
+    ) -> dict:
+        if not await self.is_collection_exist(collection_name):
+            return None
+
+        collection = await asyncio.to_thread(self._load_collection, collection_name)
+
+        return {
+            "table_data": {
+                "collection_name": collection_name,
+                "embedding_size": collection["embedding_size"],
+                "distance_method": self.distance_method.value,
+            },
+            "record_count": int(collection["live_mask"].sum()),
+            "rows_count": len(collection["records"]),
+            "sizes": {
+                "vectors": os.path.getsize(
+                    self._get_collection_path(collection_name, self.vectors_file_name)
+                ),
+                "records": os.path.getsize(
+                    self._get_collection_path(collection_name, self.records_file_name)
+                ),
+            },
+        }
+
+    async def delete_collection(self, collection_name: str):
+        self.collections.pop(collection_name, None)
+
+        collection_path = self._get_collection_path(collection_name)
+        if not os.path.isdir(collection_path):
+            return False
+
+        await asyncio.to_thread(shutil.rmtree, collection_path)
+        await self.collection_generations.bump(collection_name)
+        return True
+
+    async def create_collection(
+        self, collection_name: str, embedding_size: int, is_reset: bool = False
+    ):
+        if is_reset:
+            _ = await self.delete_collection(collection_name)
+
+        if await self.is_collection_exist(collection_name):
+            return False
+
+        self.logger.info(f"Creating new local collection: {collection_name}")
+
+        os.makedirs(self._get_collection_path(collection_name), exist_ok=True)
+
+        with open(
+            self._get_collection_path(collection_name, self.vectors_file_name), "wb"
+        ) as vectors_file:
+            self._write_vectors_header(vectors_file, 0, embedding_size)
+        open(
+            self._get_collection_path(collection_name, self.records_file_name), "wb"
+        ).close()
+
+        # Written last: its presence marks the collection as complete
+        with open(
+            self._get_collection_path(collection_name, self.meta_file_name), "w"
+        ) as meta_file:
+            json.dump(
+                {
+                    "embedding_size": embedding_size,
+                    "distance_method": self.distance_method.value,
+                },
+                meta_file,
+            )
+
+        return True
+
+    def _write_vectors_header(self, vectors_file, rows_count: int, embedding_size):
+        """
+        Write a version 1.0 `.npy` header for a (rows, embedding_size) float32
+        matrix. The header is padded to 64 bytes, so its length doesn't change
+        as the row count grows and it can be rewritten in place on append.
+        """
+        vectors_file.seek(0)
+        np.lib.format.write_array_header_1_0(
+            vectors_file,
+            {
+                "descr": np.lib.format.dtype_to_descr(np.dtype("<f4")),
+                "fortran_order": False,
+                "shape": (rows_count, embedding_size),
+            },
+        )
+        return vectors_file.tell()
+
+    def _read_vectors_header(self, vectors_file):
+        vectors_file.seek(0)
+        np.lib.format.read_magic(vectors_file)
+        shape, _, _ = np.lib.format.read_array_header_1_0(vectors_file)
+        return shape, vectors_file.tell()
+
+    async def insert_one(
+        self,
+        collection_name: str,
+        text: str,
+        vector: list,
+        metadata: dict | None = None,
+        record_id: str | None = None,
+        content_hash: str | None = None,
+    ) -> bool:
+        return await self.insert_many(
+            collection_name=collection_name,
+            texts=[text],
+            vectors=[vector],
+            metadata=[metadata],
+            record_ids=[record_id],
+            content_hashes=[content_hash],
+        )
+
+    async def insert_many(
+        self,
+        collection_name: str,
+        texts: list,
+        vectors: list,
+        metadata: list | None = None,
+        record_ids: list | None = None,
+        batch_size: int = 50,
+        content_hashes: list | None = None,
+    ) -> bool:
+        if not await self.is_collection_exist(collection_name):
+            self.logger.error(
+                f"Can't insert new record to non-existed collection: {collection_name}"
+            )
+            return False
+
+        if metadata is None:
+            metadata = [None] * len(texts)
+
+        if record_ids is None:
+            record_ids = list(range(0, len(texts)))
+
+        if content_hashes is None:
+            content_hashes = [None] * len(texts)
+
+        if len(vectors) != len(record_ids):
+            self.logger.error(f"Invalid data items for collection: {collection_name}")
+            return False
+
+        try:
+            await asyncio.to_thread(
+                self._append_records,
+                collection_name,
+                texts,
+                vectors,
+                metadata,
+                record_ids,
+                content_hashes,
+            )
+        except ValueError as e:
+            self.logger.error(f"Error while inserting batch: {e}")
+            return False
+
+        await self.collection_generations.bump(collection_name)
+        return True
+
+    def _append_records(
+        self,
+        collection_name,
+        texts,
+        vectors,
+        metadata,
+        record_ids,
+        content_hashes,
+        deleted: bool = False,
+    ):
+        matrix = self._prepare_vectors(vectors)
+
+        lock_path = self._get_collection_path(collection_name, self.lock_file_name)
+        with open(lock_path, "a") as lock_file:
+            # One writer per collection across processes; readers never lock
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                vectors_path = self._get_collection_path(
+                    collection_name, self.vectors_file_name
+                )
+                with open(vectors_path, "r+b") as vectors_file:
+                    (rows_count, embedding_size), data_offset = (
+                        self._read_vectors_header(vectors_file)
+                    )
+
+                    if matrix.shape[1] != embedding_size:
+                        raise ValueError(
+                            f"Vector size {matrix.shape[1]} doesn't match "
+                            f"collection: {collection_name}"
+                        )
+
+                    # Records first, then vectors, then the header: readers
+                    # trust the header row count and never see a row without
+                    # its record
+                    records_path = self._get_collection_path(
+                        collection_name, self.records_file_name
+                    )
+
+                    # An append that failed partway leaves records past the
+                    # committed rows; they'd shift every later record off its
+                    # vector row
+                    records_size = self._get_committed_records_size(
+                        collection_name, rows_count
+                    )
+                    if os.path.getsize(records_path) > records_size:
+                        self.logger.warning(
+                            f"Dropping uncommitted records of collection: "
+                            f"{collection_name}"
+                        )
+                        os.truncate(records_path, records_size)
+
+                    with open(records_path, "a", encoding="utf-8") as records_file:
+                        for _text, _metadata, _record_id, _content_hash in zip(
+                            texts, metadata, record_ids, content_hashes
+                        ):
+                            records_file.write(
+                                json.dumps(
+                                    {
+                                        "chunk_id": _record_id,
+                                        "text": _text,
+                                        "metadata": _metadata,
+                                        "content_hash": _content_hash,
+                                        **({"deleted": True} if deleted else {}),
+                                    }
+                                )
+                                + "\n"
+                            )
+                        records_file.flush()
+                        os.fsync(records_file.fileno())
+                        records_size = records_file.tell()
+
+                    vectors_file.seek(data_offset + rows_count * embedding_size * 4)
+                    vectors_file.write(matrix.tobytes())
+                    vectors_file.flush()
+                    os.fsync(vectors_file.fileno())
+
+                    header_size = self._write_vectors_header(
+                        vectors_file, rows_count + matrix.shape[0], embedding_size
+                    )
+                    if header_size != data_offset:
+                        raise ValueError(
+                            f"Vectors header of collection {collection_name} "
+                            "changed size"
+                        )
+                    vectors_file.flush()
+                    os.fsync(vectors_file.fileno())
+
+                self._update_meta(
+                    collection_name,
+                    rows_count=rows_count + matrix.shape[0],
+                    records_size=records_size,
+                )
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_meta(self, collection_name: str) -> dict:
+        with open(
+            self._get_collection_path(collection_name, self.meta_file_name), "r"
+        ) as meta_file:
+            return json.load(meta_file)
+
+    def _update_meta(self, collection_name: str, **values):
+        meta_path = self._get_collection_path(collection_name, self.meta_file_name)
+        meta = {**self._read_meta(collection_name), **values}
+
+        # Replaced atomically: the file marks the collection as existing
+        with open(f"{meta_path}.tmp", "w") as meta_file:
+            json.dump(meta, meta_file)
+            meta_file.flush()
+            os.fsync(meta_file.fileno())
+        os.replace(f"{meta_path}.tmp", meta_path)
+
+    def _get_committed_records_size(self, collection_name: str, rows_count: int):
+        """
+        Byte size of the records the header's rows account for, recorded in
+        the meta file by the last append. Collections written before it, or
+        an append stopped between the header and the meta file, fall back to
+        counting the lines.
+        """
+        meta = self._read_meta(collection_name)
+        if meta.get("rows_count") == rows_count and "records_size" in meta:
+            return meta["records_size"]
+
+        records_path = self._get_collection_path(
+            collection_name, self.records_file_name
+        )
+        with open(records_path, "rb") as records_file:
+            for _ in range(rows_count):
+                if not records_file.readline():
+                    break
+            return records_file.tell()
+
+    def _prepare_vectors(self, vectors) -> np.ndarray:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+
+        # Cosine similarity is a dot product of unit vectors
+        if self.distance_method == DistanceMethodEnums.COSINE:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix = matrix / np.maximum(norms, np.finfo(np.float32).tiny)
+
+        return np.ascontiguousarray(matrix, dtype=np.float32)
+
+    def _load_collection(self, collection_name: str) -> dict:
+        """
+        Return the memory-mapped matrix and the records of a collection,
+        reloading them only when the files changed since the last load.
+        """
+        vectors_path = self._get_collection_path(
+            collection_name, self.vectors_file_name
+        )
+        records_path = self._get_collection_path(
+            collection_name, self.records_file_name
+        )
+        vectors_stat = os.stat(vectors_path)
+        file_state = (vectors_stat.st_size, vectors_stat.st_mtime_ns)
+
+        collection = self.collections.get(collection_name)
+        if collection is not None and collection["file_state"] == file_state:
+            return collection
+
+        with open(vectors_path, "rb") as vectors_file:
+            (rows_count, embedding_size), data_offset = self._read_vectors_header(
+                vectors_file
+            )
+
+        # Map only the rows the header accounts for; a concurrent append may
+        # already have written past them
+        if rows_count:
+            vectors = np.memmap(
+                vectors_path,
+                dtype="<f4",
+                mode="r",
+                offset=data_offset,
+                shape=(rows_count, embedding_size),
+            )
+        else:
+            vectors = np.empty((0, embedding_size), dtype=np.float32)
+
+        records = []
+        if rows_count:
+            with open(records_path, "r", encoding="utf-8") as records_file:
+                for line in records_file:
+                    records.append(json.loads(line))
+                    if len(records) == rows_count:
+                        break
+
+        # The last row written for a chunk id is the live one, unless it is
+        # a tombstone
+        live_mask = np.zeros(rows_count, dtype=bool)
+        latest_rows = {}
+        for row, record in enumerate(records):
+            latest_rows[record["chunk_id"]] = row
+        latest_rows = {
+            record_id: row
+            for record_id, row in latest_rows.items()
+            if not records[row].get("deleted")
+        }
+        live_mask[list(latest_rows.values())] = True
+
+        collection = {
+            "file_state": file_state,
+            "embedding_size": embedding_size,
+            "vectors": vectors,
+            "records": records,
+            "live_mask": live_mask,
+            "latest_rows": latest_rows,
+        }
+        self.collections[collection_name] = collection
+        return collection
+
+    async def get_content_hashes(self, collection_name: str, record_ids: list) -> dict:
+        if not record_ids or not await self.is_collection_exist(collection_name):
+            return {}
+
+        collection = await asyncio.to_thread(self._load_collection, collection_name)
+        latest_rows = collection["latest_rows"]
+
+        return {
+            record_id: collection["records"][latest_rows[record_id]]["content_hash"]
+            for record_id in record_ids
+            if record_id in latest_rows
+        }
+
+    async def get_vectors(self, collection_name: str, record_ids: list) -> dict:
+        if not record_ids or not await self.is_collection_exist(collection_name):
+            return {}
+
+        collection = await asyncio.to_thread(self._load_collection, collection_name)
+        latest_rows = collection["latest_rows"]
+
+        # Cosine collections store normalized vectors
+        return {
+            record_id: np.array(collection["vectors"][latest_rows[record_id]])
+            for record_id in record_ids
+            if record_id in latest_rows
+        }
+
+    async def iter_records(self, collection_name: str, batch_size: int = 1000):
+        if not await self.is_collection_exist(collection_name):
+            return
+
+        collection = await asyncio.to_thread(self._load_collection, collection_name)
+        records = collection["records"]
+        live_rows = np.flatnonzero(collection["live_mask"])
+
+        for start in range(0, len(live_rows), batch_size):
+            rows = live_rows[start : start + batch_size]
+            batch_records = [records[row] for row in rows]
+            yield {
+                "record_ids": [record["chunk_id"] for record in batch_records],
+                "texts": [record["text"] for record in batch_records],
+                "metadata": [record["metadata"] for record in batch_records],
+                "content_hashes": [record["content_hash"] for record in batch_records],
+                # Cosine collections store normalized vectors
+                "vectors": np.asarray(collection["vectors"][rows]),
+            }
+
+    async def delete_records(self, collection_name: str, record_ids: list) -> int:
+        if not record_ids or not await self.is_collection_exist(collection_name):
+            return 0
+
+        deleted_count = await asyncio.to_thread(
+            self._delete_records, collection_name, record_ids
+        )
+
+        await self.collection_generations.bump(collection_name)
+        return deleted_count
+
+    def _delete_records(self, collection_name: str, record_ids: list) -> int:
+        collection = self._load_collection(collection_name)
+        latest_rows = collection["latest_rows"]
+
+        record_ids = [
+            record_id for record_id in set(record_ids) if record_id in latest_rows
+        ]
+        if not record_ids:
+            return 0
+
+        # Tombstones carry a zero vector; searches never see them
+        self._append_records(
+            collection_name,
+            texts=[None] * len(record_ids),
+            vectors=np.zeros(
+                (len(record_ids), collection["embedding_size"]), dtype=np.float32
+            ),
+            metadata=[None] * len(record_ids),
+            record_ids=record_ids,
+            content_hashes=[None] * len(record_ids),
+            deleted=True,
+        )
+        return len(record_ids)
+
+    async def search_by_vector(
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int,
+        search_params: dict | None = None,
+        search_filter: dict | None = None,
+    ) -> list[RetrievedDocument] | None:
+        results = await self.search_many(
+            collection_name=collection_name,
+            vectors=[vector],
+            limit=limit,
+            search_params=search_params,
+            search_filter=search_filter,
+        )
+
+        if not results:
+            return None
+
+        return results[0]
+
+    async def search_many(
+        self,
+        collection_name: str,
+        vectors: list,
+        limit: int,
+        search_params: dict | None = None,
+        search_filter: dict | None = None,
+    ) -> list[list[RetrievedDocument]] | None:
+        if not await self.is_collection_exist(collection_name):
+            self.logger.error(f"Can't search non-existed collection: {collection_name}")
+            return None
+
+        if not vectors:
+            return []
+
+        return await asyncio.to_thread(
+            self._search, collection_name, vectors, limit, search_filter, search_params
+        )
+
+    def _search(
+        self, collection_name, vectors, limit, search_filter, search_params=None
+    ):
+        # Exact search: the ANN search_params don't apply
+        collection = self._load_collection(collection_name)
+        matrix = collection["vectors"]
+        records = collection["records"]
+
+        queries = self._prepare_vectors(vectors)
+        mask = collection["live_mask"] & self._get_filter_mask(records, search_filter)
+
+        candidate_rows = [np.empty(0, dtype=np.int64) for _ in range(len(queries))]
+        candidate_scores = [np.empty(0, dtype=np.float32) for _ in range(len(queries))]
+
+        # Score the matrix block by block to bound memory, keeping the top
+        # `limit` rows of every query between blocks
+        for block_start in range(0, matrix.shape[0], self.search_block_size):
+            block_end = min(block_start + self.search_block_size, matrix.shape[0])
+            block_mask = mask[block_start:block_end]
+            if not block_mask.any():
+                continue
+
+            # The contiguous block is scored in place and the filtered rows
+            # masked out, rather than gathering the live rows into a copy
+            block_scores = self._score(
+                np.asarray(matrix[block_start:block_end]), queries
+            )
+            if not block_mask.all():
+                block_scores[:, ~block_mask] = -np.inf
+            block_rows = np.arange(block_start, block_end)
+
+            for query_idx in range(len(queries)):
+                rows, scores = block_rows, block_scores[query_idx]
+                if len(scores) > limit:
+                    top = np.argpartition(-scores, limit - 1)[:limit]
+                    rows, scores = rows[top], scores[top]
+
+                rows = np.concatenate([candidate_rows[query_idx], rows])
+                scores = np.concatenate([candidate_scores[query_idx], scores])
+                if len(scores) > limit:
+                    top = np.argpartition(-scores, limit - 1)[:limit]
+                    rows, scores = rows[top], scores[top]
+                candidate_rows[query_idx] = rows
+                candidate_scores[query_idx] = scores
+
+        results = []
+        for rows, scores in zip(candidate_rows, candidate_scores):
+            # Masked rows only remain when fewer than `limit` rows matched
+            is_matched = np.isfinite(scores)
+            rows, scores = rows[is_matched], scores[is_matched]
+            order = np.argsort(-scores)
+            results.append(
+                [
+                    RetrievedDocument(
+                        text=records[row]["text"],
+                        score=float(score),
+                        chunk_id=records[row]["chunk_id"],
+                    )
+                    for row, score in zip(rows[order], scores[order])
+                ]
+            )
+
+        return results
+
+    def _score(self, block: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        """
+        (queries, rows) similarity matrix, higher is better.
+        """
+        scores = queries @ block.T
+
+        if self.distance_method == DistanceMethodEnums.EUCLIDEAN:
+            # -||x - q||^2 = 2 x.q - ||x||^2 - ||q||^2
+            block_norms = np.einsum("ij,ij->i", block, block)
+            query_norms = np.einsum("ij,ij->i", queries, queries)
+            scores = 2 * scores - block_norms[None, :] - query_norms[:, None]
+            return -np.sqrt(np.maximum(-scores, 0))
+
+        return scores
+
+    def _get_filter_mask(self, records: list, search_filter: dict | None):
+        if not search_filter:
+            return np.ones(len(records), dtype=bool)
+
+        return np.fromiter(
+            (self._match_filter(record, search_filter) for record in records),
+            dtype=bool,
+            count=len(records),
+        )
+
+    def _match_filter(self, record: dict, search_filter: dict) -> bool:
+        chunk_ids = search_filter.get("chunk_ids")
+        if chunk_ids and record["chunk_id"] not in chunk_ids:
+            return False
+
+        record_metadata = record.get("metadata") or {}
+        for condition in search_filter.get("metadata") or []:
+            value = record_metadata.get(condition["key"])
+
+            if condition.get("eq") is not None and value != condition["eq"]:
+                return False
+
+            if condition.get("any_of") and value not in condition["any_of"]:
+                return False
+
+            for op in ("gt", "gte", "lt", "lte"):
+                if condition.get(op) is None:
+                    continue
+                # Ranges only match numeric values
+                if not isinstance(value, (int, float)) or isinstance(value, bool):
+                    return False
+                if op == "gt" and not value > condition[op]:
+                    return False
+                if op == "gte" and not value >= condition[op]:
+                    return False
+                if op == "lt" and not value < condition[op]:
+                    return False
+                if op == "lte" and not value <= condition[op]:
+                    return False
+
+        return True
@@ -0,0 +1,479 @@
+from sqlalchemy.sql import text as sql_text
+
+from ..VectorDBEnums import PgVectorTableSchemaEnums
+from .PGVectorProvider import PGVectorProvider
+
+
+class PGVectorPartitionedProvider(PGVectorProvider):
+    """
+    Stores every collection in one table, list-partitioned by collection name,
+    instead of one table and one vector index per project.
+
+    New collections land in the default partition, which is shared by all
+    small collections and searched with a collection filter (iterative index
+    scans keep the filtered results complete). Once a collection grows past
+    `partition_threshold` rows, index maintenance moves it into a dedicated
+    partition with its own vector index.
+    """
+
+    def __init__(self, *args, partition_threshold: int = 10000, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.partition_threshold = partition_threshold
+
+        self.shared_table_name = f"{self.pgvector_table_prefix}_shared"
+        self.default_partition_name = f"{self.shared_table_name}_default"
+        self.collections_table_name = f"{self.pgvector_table_prefix}_collections"
+        self.partition_name = (
+            lambda collection_name: f"{self.shared_table_name}_{collection_name}"
+        )
+
+    async def connect(self):
+        await super().connect()
+
+        try:
+            await self._create_shared_tables()
+        except Exception as e:
+            # Another process may be creating the same tables
+            self.logger.warning(f"Shared vector table setup: {str(e)}")
+
+    async def _create_shared_tables(self):
+        def quote_identifier(identifier):
+            return '"' + identifier.replace('"', '""') + '"'
+
+        shared_table_quoted = quote_identifier(self.shared_table_name)
+        collections_table_quoted = quote_identifier(self.collections_table_name)
+        default_partition_quoted = quote_identifier(self.default_partition_name)
+        column_type = self.query_builder.get_column_type(
+            self.storage_mode, self.default_vector_size
+        )
+
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(
+                    sql_text(
+                        f"CREATE TABLE IF NOT EXISTS {collections_table_quoted} ("
+                        "collection_name text PRIMARY KEY,"
+                        "embedding_size integer NOT NULL,"
+                        "storage_mode text NOT NULL,"
+                        "partition_name text"
+                        ")"
+                    )
+                )
+
+                # The partition key must be part of the primary key
+                await session.execute(
+                    sql_text(
+                        f"CREATE TABLE IF NOT EXISTS {shared_table_quoted} ("
+                        f"{PgVectorTableSchemaEnums.ID.value} bigserial,"
+                        f"{PgVectorTableSchemaEnums.TEXT.value} text,"
+                        f"{PgVectorTableSchemaEnums.VECTOR.value} {column_type},"
+                        f"{PgVectorTableSchemaEnums.METADATA.value} jsonb DEFAULT '{{}}',"
+                        f"{PgVectorTableSchemaEnums.CHUNK_ID.value} integer,"
+                        f"{PgVectorTableSchemaEnums.COLLECTION_NAME.value} text NOT NULL,"
+                        f"{PgVectorTableSchemaEnums.CONTENT_HASH.value} text,"
+                        f"{PgVectorTableSchemaEnums.TEXT_SEARCH.value} tsvector "
+                        f"GENERATED ALWAYS AS ({self.query_builder.text_search_expression()}) STORED,"
+                        f"PRIMARY KEY ({PgVectorTableSchemaEnums.COLLECTION_NAME.value}, "
+                        f"{PgVectorTableSchemaEnums.ID.value}),"
+                        f"UNIQUE ({PgVectorTableSchemaEnums.COLLECTION_NAME.value}, "
+                        f"{PgVectorTableSchemaEnums.CHUNK_ID.value}),"
+                        f"FOREIGN KEY ({PgVectorTableSchemaEnums.CHUNK_ID.value}) REFERENCES chunks(id)"
+                        f") PARTITION BY LIST ({PgVectorTableSchemaEnums.COLLECTION_NAME.value})"
+                    )
+                )
+
+                await session.execute(
+                    sql_text(
+                        f"CREATE TABLE IF NOT EXISTS {default_partition_quoted} "
+                        f"PARTITION OF {shared_table_quoted} DEFAULT"
+                    )
+                )
+
+                # Upserts conflict on the shared (collection_name, chunk_id) key
+                for index_sql in self.query_builder.get_metadata_index_sqls(
+                    self.default_partition_name,
+                    self.metadata_index_keys,
+                    chunk_key=False,
+                ):
+                    await session.execute(index_sql)
+
+                await session.commit()
+
+    async def get_index_table(self, collection_name: str) -> str:
+        collection_metadata = await self.get_collection_metadata(collection_name)
+        if collection_metadata is None:
+            return self.default_partition_name
+        return collection_metadata["partition_name"]
+
+    def get_search_scope(self, collection_name: str, search_filter: dict | None):
+        return self.shared_table_name, {
+            **(search_filter or {}),
+            "collection_name": collection_name,
+        }
+
+    def get_insert_target(self, collection_name: str) -> tuple[str, dict]:
+        return self.shared_table_name, {
+            PgVectorTableSchemaEnums.COLLECTION_NAME.value: collection_name
+        }
+
+    def _get_search_settings(
+        self,
+        search_values: dict,
+        search_params: dict | None = None,
+        is_filtered: bool = False,
+    ):
+        # Every search is scoped by the collection filter
+        return super()._get_search_settings(
+            search_values, search_params=search_params, is_filtered=True
+        )
+
+    async def get_collection_metadata(self, collection_name: str) -> dict | None:
+        collection_metadata = self.collection_registry.get(collection_name)
+        if collection_metadata is not None:
+            return collection_metadata
+
+        def quote_identifier(identifier):
+            return '"' + identifier.replace('"', '""') + '"'
+
+        async with self.db_client() as session:
+            async with session.begin():
+                metadata_sql = sql_text(
+                    f"""
+                    SELECT
+                        c.embedding_size,
+                        c.storage_mode,
+                        coalesce(c.partition_name, :default_partition) AS partition_name,
+                        EXISTS (
+                            SELECT 1 FROM pg_class i
+                            JOIN pg_index x ON x.indexrelid = i.oid
+                            WHERE i.relname = coalesce(c.partition_name, :default_partition)
+                                || :index_suffix
+                            AND x.indisvalid
+                        ) AS has_index
+                    FROM {quote_identifier(self.collections_table_name)} c
+                    WHERE c.collection_name = :collection_name
+                    """
+                )
+                results = await session.execute(
+                    metadata_sql,
+                    {
+                        "collection_name": collection_name,
+                        "default_partition": self.default_partition_name,
+                        # default_index_name() appends this suffix
+                        "index_suffix": self.default_index_name(""),
+                    },
+                )
+                record = results.fetchone()
+
+        if record is None:
+            return None
+
+        return self.collection_registry.set(
+            collection_name,
+            embedding_size=record.embedding_size,
+            storage_mode=record.storage_mode,
+            partition_name=record.partition_name,
+            has_index=record.has_index,
+            has_chunk_key=True,
+        )
+
+    async def list_all_collections(self) -> list:
+        def quote_identifier(identifier):
+            return '"' + identifier.replace('"', '""') + '"'
+
+        async with self.db_client() as session:
+            async with session.begin():
+                results = await session.execute(
+                    sql_text(
+                        "SELECT collection_name FROM "
+                        f"{quote_identifier(self.collections_table_name)}"
+                    )
+                )
+                return results.scalars().all()
+
+    async def get_collection_info(
+        self, collection_name: str, exact_count: bool = False
+    ) -> dict:
+        collection_metadata = await self.get_collection_metadata(collection_name)
+        if collection_metadata is None:
+            return None
+
+        def quote_identifier(identifier):
+            return '"' + identifier.replace('"', '""') + '"'
+
+        partition_name = collection_metadata["partition_name"]
+        is_shared_partition = partition_name == self.default_partition_name
+
+        async with self.db_client() as session:
+            async with session.begin():
+                partition_stats = await self._get_table_stats(session, partition_name)
+
+                # Collections in the default partition stay below the partition
+                # threshold, so counting their rows is bounded
+                record_count = None
+                if exact_count or is_shared_partition:
+                    count_sql = sql_text(
+                        f"SELECT COUNT(*) FROM {quote_identifier(self.shared_table_name)} "
+                        f"WHERE {PgVectorTableSchemaEnums.COLLECTION_NAME.value} = :collection_name"
+                    )
+                    result = await session.execute(
+                        count_sql, {"collection_name": collection_name}
+                    )
+                    record_count = result.scalar_one()
+
+        if partition_stats is None:
+            return None
+
+        estimated_record_count = partition_stats.pop("estimated_record_count")
+
+        return {
+            "table_data": {
+                "tablename": self.shared_table_name,
+                "partition_name": partition_name,
+                "embedding_size": collection_metadata["embedding_size"],
+                "storage_mode": collection_metadata["storage_mode"],
+            },
+            "record_count": (
+                record_count if record_count is not None else estimated_record_count
+            ),
+            "is_record_count_exact": record_count is not None,
+            # Sizes, indexes and maintenance times are those of the partition
+            **partition_stats,
+        }
+
+    async def delete_collection(self, collection_name: str):
+        collection_metadata = await self.get_collection_metadata(collection_name)
+        self.collection_registry.invalidate(collection_name)
+
+        def quote_identifier(identifier):
+            return '"' + identifier.replace('"', '""') + '"'
+
+        async with self.db_client() as session:
+            async with session.begin():
+                self.logger.info(f"Deleting collection: {collection_name}")
+
+                partition_name = (
+                    collection_metadata["partition_name"]
+                    if collection_metadata is not None
+                    else self.default_partition_name
+                )
+                if partition_name != self.default_partition_name:
+                    # A dedicated partition only holds this collection
+                    await session.execute(
+                        sql_text(
+                            f"DROP TABLE IF EXISTS {quote_identifier(partition_name)}"
+                        )
+                    )
+                else:
+                    await session.execute(
+                        sql_text(
+                            f"DELETE FROM {quote_identifier(self.shared_table_name)} "
+                            f"WHERE {PgVectorTableSchemaEnums.COLLECTION_NAME.value} "
+                            "= :collection_name"
+                        ),
+                        {"collection_name": collection_name},
+                    )
+
+                await session.execute(
+                    sql_text(
+                        f"DELETE FROM {quote_identifier(self.collections_table_name)} "
+                        "WHERE collection_name = :collection_name"
+                    ),
+                    {"collection_name": collection_name},
+                )
+                await session.commit()
+
+        await self.collection_generations.bump(collection_name)
+        return True
+
+    async def create_collection(
+        self,
+        collection_name: str,
+        embedding_size: int,
+        is_reset: bool = False,
+        storage_mode: str | None = None,
+    ):
+        # The vector column type is shared by all collections; raised rather
+        # than returned, False only means the collection already exists
+        if embedding_size != self.default_vector_size:
+            raise ValueError(
+                f"Embedding size {embedding_size} doesn't match the shared table "
+                f"({self.default_vector_size}), other sizes need the PGVECTOR "
+                f"backend"
+            )
+
+        if storage_mode is not None and storage_mode != self.storage_mode:
+            self.logger.warning(
+                f"Storage mode {storage_mode} ignored, the shared table uses "
+                f"{self.storage_mode}"
+            )
+
+        if is_reset:
+            _ = await self.delete_collection(collection_name)
+        elif await self.is_collection_exist(collection_name):
+            return False
+
+        def quote_identifier(identifier):
+            return '"' + identifier.replace('"', '""') + '"'
+
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(
+                    sql_text(
+                        f"INSERT INTO {quote_identifier(self.collections_table_name)} "
+                        "(collection_name, embedding_size, storage_mode) "
+                        "VALUES (:collection_name, :embedding_size, :storage_mode) "
+                        "ON CONFLICT (collection_name) DO NOTHING"
+                    ),
+                    {
+                        "collection_name": collection_name,
+                        "embedding_size": embedding_size,
+                        "storage_mode": self.storage_mode,
+                    },
+                )
+                await session.commit()
+
+        self.collection_registry.invalidate(collection_name)
+        return True
+
+    async def create_metadata_indexes(self, collection_name: str):
+        index_table = await self.get_index_table(collection_name)
+
+        async with self.db_client() as session:
+            connection = await session.connection(
+                execution_options={"isolation_level": "AUTOCOMMIT"}
+            )
+
+            table_state = await self._get_table_state(connection, index_table)
+            await self._drop_invalid_indexes(
+                connection,
+                index_names=self.query_builder.get_metadata_index_names(
+                    index_table, self.metadata_index_keys, chunk_key=False
+                ).values(),
+                invalid_index_names=table_state["invalid_indexes"],
+            )
+
+            for index_sql in self.query_builder.get_metadata_index_sqls(
+                index_table,
+                self.metadata_index_keys,
+                concurrently=True,
+                chunk_key=False,
+            ):
+                await connection.execute(index_sql)
+
+        return True
+
+    async def maintain_vector_index(self, collection_name: str):
+        """
+        Move a collection that outgrew the default partition into its own
+        partition, then create or rebuild the vector index it is searched with.
+        """
+        collection_metadata = await self.get_collection_metadata(collection_name)
+        if collection_metadata is None:
+            return False
+
+        if collection_metadata["partition_name"] == self.default_partition_name:
+            records_count = await self._count_collection_records(collection_name)
+            if records_count >= self.partition_threshold:
+                await self.create_collection_partition(collection_name)
+
+        return await super().maintain_vector_index(collection_name)
+
+    async def _count_collection_records(self, collection_name: str) -> int:
+        def quote_identifier(identifier):
+            return '"' + identifier.replace('"', '""') + '"'
+
+        async with self.db_client() as session:
+            async with session.begin():
+                result = await session.execute(
+                    sql_text(
+                        f"SELECT COUNT(*) FROM {quote_identifier(self.default_partition_name)} "
+                        f"WHERE {PgVectorTableSchemaEnums.COLLECTION_NAME.value} "
+                        "= :collection_name"
+                    ),
+                    {"collection_name": collection_name},
+                )
+                return result.scalar_one()
+
+    async def create_collection_partition(self, collection_name: str):
+        """
+        Move the collection's rows out of the default partition into a
+        dedicated one. ATTACH PARTITION validates the default partition and
+        locks it for the duration of the move, so this runs from the index
+        maintenance task rather than the request path.
+        """
+
+        def quote_identifier(identifier):
+            return '"' + identifier.replace('"', '""') + '"'
+
+        partition_name = self.partition_name(collection_name)
+        partition_quoted = quote_identifier(partition_name)
+        shared_table_quoted = quote_identifier(self.shared_table_name)
+        default_partition_quoted = quote_identifier(self.default_partition_name)
+        collection_literal = "'" + collection_name.replace("'", "''") + "'"
+
+        # The generated tsvector column can't be copied explicitly
+        columns = ", ".join(
+            [
+                PgVectorTableSchemaEnums.ID.value,
+                PgVectorTableSchemaEnums.TEXT.value,
+                PgVectorTableSchemaEnums.VECTOR.value,
+                PgVectorTableSchemaEnums.METADATA.value,
+                PgVectorTableSchemaEnums.CHUNK_ID.value,
+                PgVectorTableSchemaEnums.CONTENT_HASH.value,
+                PgVectorTableSchemaEnums.COLLECTION_NAME.value,
+            ]
+        )
+
+        self.logger.info(f"START: Creating partition for collection: {collection_name}")
+
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(
+                    sql_text(
+                        f"CREATE TABLE {partition_quoted} "
+                        f"(LIKE {shared_table_quoted} INCLUDING DEFAULTS INCLUDING GENERATED)"
+                    )
+                )
+                await session.execute(
+                    sql_text(
+                        f"INSERT INTO {partition_quoted} ({columns}) "
+                        f"SELECT {columns} FROM {default_partition_quoted} "
+                        f"WHERE {PgVectorTableSchemaEnums.COLLECTION_NAME.value} "
+                        "= :collection_name"
+                    ),
+                    {"collection_name": collection_name},
+                )
+                await session.execute(
+                    sql_text(
+                        f"DELETE FROM {default_partition_quoted} "
+                        f"WHERE {PgVectorTableSchemaEnums.COLLECTION_NAME.value} "
+                        "= :collection_name"
+                    ),
+                    {"collection_name": collection_name},
+                )
+
+                # Partition bounds can't be bound as parameters
+                await session.execute(
+                    sql_text(
+                        f"ALTER TABLE {shared_table_quoted} ATTACH PARTITION "
+                        f"{partition_quoted} FOR VALUES IN ({collection_literal})"
+                    )
+                )
+                await session.execute(
+                    sql_text(
+                        f"UPDATE {quote_identifier(self.collections_table_name)} "
+                        "SET partition_name = :partition_name "
+                        "WHERE collection_name = :collection_name"
+                    ),
+                    {
+                        "partition_name": partition_name,
+                        "collection_name": collection_name,
+                    },
+                )
+                await session.commit()
+
+        self.collection_registry.invalidate(collection_name)
+
+        self.logger.info(f"END: Created partition for collection: {collection_name}")
+        return True
@@ -1,36 +1,69 @@
-import asyncio
 import json
 import logging
 
+import numpy as np
+from pgvector.asyncpg import register_vector
 from sqlalchemy.sql import text as sql_text
 
 from models.db_schemas import RetrievedDocument
 
+from ..CollectionGenerations import CollectionGenerations
+from ..CollectionRegistry import CollectionRegistry
+from ..PGVectorIndexManager import PGVectorIndexManager
+from ..PGVectorQueryBuilder import PGVectorQueryBuilder
 from ..VectorDBEnums import (
-    DistanceMethodEnums,
-    PgVectorDistanceMethodEnums,
     PgVectorIndexTypeEnums,
+    PgVectorInsertModeEnums,
+    PgVectorStorageModeEnums,
     PgVectorTableSchemaEnums,
 )
 from ..VectorDBInterface import VectorDBInterface
 
 
 class PGVectorProvider(VectorDBInterface):
+    # pgvector rejects a larger hnsw.ef_search
+    max_ef_search = 1000
+
     def __init__(
         self,
         db_client,
         distance_method: str = None,
         default_vector_size: int = 786,
         index_threshold: int = 100,
+        insert_mode: str = PgVectorInsertModeEnums.COPY.value,
+        collection_cache_ttl: int = 60,
+        index_maintenance_work_mem: str = "512MB",
+        index_parallel_workers: int = 2,
+        index_type: str = PgVectorIndexTypeEnums.HNSW.value,
+        index_growth_factor: float = 2.0,
+        index_min_rebuild_rows: int = 10_000,
+        metadata_index_keys: list | None = None,
+        iterative_scan: str | None = "relaxed_order",
+        text_search_config: str = "simple",
+        storage_mode: str = PgVectorStorageModeEnums.VECTOR.value,
+        rescore_factor: int = 4,
+        collection_generations: CollectionGenerations | None = None,
     ):
         self.db_client = db_client
         self.default_vector_size = default_vector_size
         self.index_threshold = index_threshold
-
-        if distance_method == DistanceMethodEnums.COSINE.value:
-            self.distance_method = PgVectorDistanceMethodEnums.COSINE.value
-        elif distance_method == DistanceMethodEnums.DOT.value:
-            self.distance_method = PgVectorDistanceMethodEnums.DOT.value
+        self.insert_mode = insert_mode
+        self.index_maintenance_work_mem = index_maintenance_work_mem
+        self.index_parallel_workers = index_parallel_workers
+        self.metadata_index_keys = metadata_index_keys or []
+        self.iterative_scan = iterative_scan
+        self.storage_mode = storage_mode
+        self.rescore_factor = rescore_factor
+        self.query_builder = PGVectorQueryBuilder(
+            distance_method=distance_method, text_search_config=text_search_config
+        )
+        self.collection_registry = CollectionRegistry(ttl=collection_cache_ttl)
+        self.collection_generations = collection_generations or CollectionGenerations()
+        self.index_manager = PGVectorIndexManager(
+            index_type=index_type,
+            growth_factor=index_growth_factor,
+            min_rebuild_rows=index_min_rebuild_rows,
+        )
 
         self.pgvector_table_prefix = PgVectorTableSchemaEnums._PREFIX.value
         self.default_index_name = (
@@ -57,23 +90,103 @@ class PGVectorProvider(VectorDBInterface):
                 self.logger.warning(f"Vector extension setup: {str(e)}")
                 await session.rollback()
 
-    def disconnect(self):
-        pass
+    async def disconnect(self):
+        await self.collection_generations.close()
+
+    async def _get_vector_connection(self, session):
+        """
+        Return the raw asyncpg connection behind the session, registering the
+        pgvector binary codec once per pooled connection.
+        """
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        asyncpg_connection = raw_connection.driver_connection
+
+        if not connection.info.get("pgvector_codec_registered"):
+            await register_vector(asyncpg_connection)
+            connection.info["pgvector_codec_registered"] = True
+
+        return asyncpg_connection
 
     async def is_collection_exist(self, collection_name: str) -> bool:
-        record = None
+        collection_metadata = await self.get_collection_metadata(collection_name)
+        return collection_metadata is not None
+
+    async def get_collection_metadata(self, collection_name: str) -> dict | None:
+        """
+        Return the cached metadata (embedding size, index state) of an existing
+        collection, loading it from the catalog in a single query on a miss.
+        """
+        collection_metadata = self.collection_registry.get(collection_name)
+        if collection_metadata is not None:
+            return collection_metadata
 
         async with self.db_client() as session:
             async with session.begin():
-                list_tbl = sql_text(
-                    "SELECT * FROM pg_tables WHERE tablename = :collection_name"
+                metadata_sql = sql_text(
+                    """
+                    SELECT
+                        a.atttypmod AS embedding_size,
+                        obj_description(
+                            format('%I.%I', t.schemaname, t.tablename)::regclass,
+                            'pg_class'
+                        ) AS comment,
+                        EXISTS (
+                            SELECT 1 FROM pg_indexes i
+                            JOIN pg_index x
+                                ON x.indexrelid = format('%I.%I', i.schemaname, i.indexname)::regclass
+                            WHERE i.tablename = t.tablename
+                            AND i.indexname = :index_name
+                            AND x.indisvalid
+                        ) AS has_index,
+                        EXISTS (
+                            SELECT 1 FROM pg_indexes i
+                            JOIN pg_index x
+                                ON x.indexrelid = format('%I.%I', i.schemaname, i.indexname)::regclass
+                            WHERE i.tablename = t.tablename
+                            AND i.indexname = :chunk_key_name
+                            AND x.indisvalid
+                        ) AS has_chunk_key
+                    FROM pg_tables t
+                    LEFT JOIN pg_attribute a
+                        ON a.attrelid = format('%I.%I', t.schemaname, t.tablename)::regclass
+                        AND a.attname = :vector_column
+                    WHERE t.tablename = :collection_name
+                    """
                 )
                 results = await session.execute(
-                    list_tbl, {"collection_name": collection_name}
+                    metadata_sql,
+                    {
+                        "collection_name": collection_name,
+                        "index_name": self.default_index_name(collection_name),
+                        "chunk_key_name": self.query_builder.get_chunk_key_name(
+                            collection_name
+                        ),
+                        "vector_column": PgVectorTableSchemaEnums.VECTOR.value,
+                    },
                 )
-                record = results.scalar_one_or_none()
+                record = results.fetchone()
+
+        if record is None:
+            return None
 
-        return record
+        # Collections created before storage modes have no comment
+        storage_mode = PgVectorStorageModeEnums.VECTOR.value
+        if record.comment:
+            try:
+                storage_mode = json.loads(record.comment).get(
+                    "storage_mode", storage_mode
+                )
+            except ValueError:
+                pass
+
+        return self.collection_registry.set(
+            collection_name,
+            embedding_size=record.embedding_size,
+            storage_mode=storage_mode,
+            has_index=record.has_index,
+            has_chunk_key=record.has_chunk_key,
+        )
 
     async def list_all_collections(self) -> list:
         records = []
@@ -90,41 +203,135 @@ class PGVectorProvider(VectorDBInterface):
 
         return records
 
-    async def get_collection_info(self, collection_name: str) -> dict:
+    async def get_collection_info(
+        self, collection_name: str, exact_count: bool = False
+    ) -> dict:
+        """
+        Collection statistics read from the catalog in one round-trip: the
+        planner's row estimate, relation sizes, index definitions and the last
+        vacuum/analyze times. The exact row count needs a full scan and is
+        only computed when `exact_count` is requested.
+        """
+        collection_metadata = await self.get_collection_metadata(collection_name)
+        if collection_metadata is None:
+            return None
+
         async with self.db_client() as session:
             async with session.begin():
-                table_info_sql = sql_text(
-                    """
-                    SELECT schemaname, tablename, tableowner, tablespace, hasindexes
-                    FROM pg_tables
-                    WHERE tablename = :collection_name
-                """
-                )
+                table_stats = await self._get_table_stats(session, collection_name)
 
-                table_info = await session.execute(
-                    table_info_sql, {"collection_name": collection_name}
-                )
-                table_data = table_info.fetchone()
+                record_count = None
+                if exact_count:
+                    record_count = await self._count_records(
+                        await session.connection(), collection_name
+                    )
 
-                if not table_data:
-                    return None  # Return None if the table does not exist
+        if table_stats is None:
+            return None
 
-                # Properly quote the table name for PostgreSQL
-                def quote_identifier(identifier):
-                    return '"' + identifier.replace('"', '""') + '"'
+        estimated_record_count = table_stats.pop("estimated_record_count")
+
+        return {
+            "table_data": {
+                "tablename": collection_name,
+                "embedding_size": collection_metadata["embedding_size"],
+                "storage_mode": collection_metadata["storage_mode"],
+            },
+            "record_count": (
+                record_count if record_count is not None else estimated_record_count
+            ),
+            "is_record_count_exact": record_count is not None,
+            **table_stats,
+        }
+
+    async def _get_table_stats(self, session, table_name: str) -> dict | None:
+        def quote_identifier(identifier):
+            return '"' + identifier.replace('"', '""') + '"'
 
-                table_name_quoted = quote_identifier(collection_name)
-                count_sql = sql_text(f"SELECT COUNT(*) FROM {table_name_quoted}")
+        stats_sql = sql_text(
+            """
+            SELECT
+                c.reltuples::bigint AS reltuples,
+                s.n_live_tup AS live_tuples,
+                s.n_dead_tup AS dead_tuples,
+                pg_relation_size(c.oid) AS table_size,
+                CASE WHEN c.reltoastrelid = 0 THEN 0
+                    ELSE pg_total_relation_size(c.reltoastrelid) END AS toast_size,
+                pg_indexes_size(c.oid) AS indexes_size,
+                pg_total_relation_size(c.oid) AS total_size,
+                s.last_vacuum,
+                s.last_autovacuum,
+                s.last_analyze,
+                s.last_autoanalyze,
+                (
+                    SELECT coalesce(json_agg(json_build_object(
+                        'name', i.relname,
+                        'type', am.amname,
+                        'size', pg_relation_size(i.oid),
+                        'is_valid', x.indisvalid,
+                        'options', i.reloptions,
+                        'comment', obj_description(i.oid, 'pg_class')
+                    ) ORDER BY i.relname), '[]'::json)
+                    FROM pg_index x
+                    JOIN pg_class i ON i.oid = x.indexrelid
+                    JOIN pg_am am ON am.oid = i.relam
+                    WHERE x.indrelid = c.oid
+                ) AS indexes
+            FROM pg_class c
+            LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+            WHERE c.oid = to_regclass(:table_name)
+            """
+        )
+        result = await session.execute(
+            stats_sql, {"table_name": quote_identifier(table_name)}
+        )
+        record = result.fetchone()
 
-                return {
-                    "table_data": dict(table_data._mapping),
-                    "record_count": record_count,
-                }
+        if record is None:
+            return None
+
+        indexes = record.indexes
+        if isinstance(indexes, str):
+            indexes = json.loads(indexes)
+
+        for index in indexes:
+            # Vector indexes carry their build parameters as a JSON comment
+            index["build_info"] = self.index_manager.parse_index_comment(
+                index.pop("comment")
+            )
+
+        # reltuples is -1 until the table was first vacuumed or analyzed
+        estimated_record_count = record.reltuples
+        if estimated_record_count < 0:
+            estimated_record_count = record.live_tuples or 0
+
+        def to_isoformat(value):
+            return value.isoformat() if value is not None else None
+
+        return {
+            "estimated_record_count": estimated_record_count,
+            "sizes": {
+                "table": record.table_size,
+                "toast": record.toast_size,
+                "indexes": record.indexes_size,
+                "total": record.total_size,
+            },
+            "indexes": indexes,
+            "maintenance": {
+                "dead_tuples": record.dead_tuples,
+                "last_vacuum": to_isoformat(record.last_vacuum),
+                "last_autovacuum": to_isoformat(record.last_autovacuum),
+                "last_analyze": to_isoformat(record.last_analyze),
+                "last_autoanalyze": to_isoformat(record.last_autoanalyze),
+            },
+        }
 
     async def delete_collection(self, collection_name: str):
         async with self.db_client() as session:
             async with session.begin():
                 self.logger.info(f"Deleting collection: {collection_name}")
+                self.query_builder.invalidate(collection_name)
+                self.collection_registry.invalidate(collection_name)
 
                 def quote_identifier(identifier):
                     return '"' + identifier.replace('"', '""') + '"'
@@ -134,6 +341,7 @@ class PGVectorProvider(VectorDBInterface):
                 await session.execute(delete_sql)
                 await session.commit()
 
+        await self.collection_generations.bump(collection_name)
         return True
 
     async def create_collection(
@@ -141,20 +349,38 @@ class PGVectorProvider(VectorDBInterface):
         collection_name: str,
         embedding_size: int,
         is_reset: bool = False,
+        storage_mode: str | None = None,
     ):
+        storage_mode = storage_mode or self.storage_mode
+
         if is_reset:
             _ = await self.delete_collection(collection_name)
             # After deletion, always attempt to recreate to ensure a fresh, empty table
-            await self._do_create_collection_table(collection_name, embedding_size)
-            return True
+            await self._do_create_collection_table(
+                collection_name, embedding_size, storage_mode
+            )
         elif not await self.is_collection_exist(collection_name):
             # If not reset and collection doesn't exist, create it
-            await self._do_create_collection_table(collection_name, embedding_size)
-            return True
-        return False
+            await self._do_create_collection_table(
+                collection_name, embedding_size, storage_mode
+            )
+        else:
+            return False
+
+        self.collection_registry.set(
+            collection_name,
+            embedding_size=embedding_size,
+            storage_mode=storage_mode,
+            has_index=False,
+            has_chunk_key=True,
+        )
+        return True
 
     async def _do_create_collection_table(
-        self, collection_name: str, embedding_size: int
+        self,
+        collection_name: str,
+        embedding_size: int,
+        storage_mode: str = PgVectorStorageModeEnums.VECTOR.value,
     ):
         async with self.db_client() as session:
             async with session.begin():
@@ -167,102 +393,472 @@ class PGVectorProvider(VectorDBInterface):
                     f"CREATE TABLE {table_name_quoted} ("
                     f"{PgVectorTableSchemaEnums.ID.value} bigserial PRIMARY KEY,"
                     f"{PgVectorTableSchemaEnums.TEXT.value} text,"
-                    f"{PgVectorTableSchemaEnums.VECTOR.value} vector({embedding_size}),"
+                    f"{PgVectorTableSchemaEnums.VECTOR.value} "
+                    f"{self.query_builder.get_column_type(storage_mode, embedding_size)},"
                     f"{PgVectorTableSchemaEnums.METADATA.value} jsonb DEFAULT '{{}}',"
                     f"{PgVectorTableSchemaEnums.CHUNK_ID.value} integer,"
+                    f"{PgVectorTableSchemaEnums.CONTENT_HASH.value} text,"
+                    f"{PgVectorTableSchemaEnums.TEXT_SEARCH.value} tsvector "
+                    f"GENERATED ALWAYS AS ({self.query_builder.text_search_expression()}) STORED,"
+                    f"CONSTRAINT {quote_identifier(self.query_builder.get_chunk_key_name(collection_name))} "
+                    f"UNIQUE ({PgVectorTableSchemaEnums.CHUNK_ID.value}),"
                     f"FOREIGN KEY ({PgVectorTableSchemaEnums.CHUNK_ID.value}) REFERENCES chunks(id)"
                     ")"
                 )
                 await session.execute(create_sql)
+
+                # The storage mode decides the index target and search statement
+                storage_comment = json.dumps({"storage_mode": storage_mode})
+                await session.execute(
+                    sql_text(
+                        f"COMMENT ON TABLE {table_name_quoted} IS '{storage_comment}'"
+                    )
+                )
+
+                # The table is empty, so the filter indexes are built inline
+                for index_sql in self.query_builder.get_metadata_index_sqls(
+                    collection_name, self.metadata_index_keys
+                ):
+                    await session.execute(index_sql)
+
                 await session.commit()
 
+    async def create_metadata_indexes(self, collection_name: str):
+        """
+        Make sure the indexes backing metadata filters exist, building any
+        missing ones concurrently (e.g. on collections created before them).
+        """
+
+        def quote_identifier(identifier):
+            return '"' + identifier.replace('"', '""') + '"'
+
+        async with self.db_client() as session:
+            connection = await session.connection(
+                execution_options={"isolation_level": "AUTOCOMMIT"}
+            )
+
+            table_state = await self._get_table_state(connection, collection_name)
+
+            # Collections created before lexical search lack the tsvector column
+            # (adding a stored generated column rewrites the table once)
+            if PgVectorTableSchemaEnums.TEXT_SEARCH.value not in table_state["columns"]:
+                await connection.execute(
+                    sql_text(
+                        f"ALTER TABLE {quote_identifier(collection_name)} "
+                        f"ADD COLUMN IF NOT EXISTS {PgVectorTableSchemaEnums.TEXT_SEARCH.value} tsvector "
+                        f"GENERATED ALWAYS AS ({self.query_builder.text_search_expression()}) STORED"
+                    )
+                )
+            if (
+                PgVectorTableSchemaEnums.CONTENT_HASH.value
+                not in table_state["columns"]
+            ):
+                await connection.execute(
+                    sql_text(
+                        f"ALTER TABLE {quote_identifier(collection_name)} "
+                        f"ADD COLUMN IF NOT EXISTS {PgVectorTableSchemaEnums.CONTENT_HASH.value} text"
+                    )
+                )
+
+            # IF NOT EXISTS would keep an index a failed concurrent build left
+            # INVALID, so those are dropped and built again
+            await self._drop_invalid_indexes(
+                connection,
+                index_names=self.query_builder.get_metadata_index_names(
+                    collection_name, self.metadata_index_keys
+                ).values(),
+                invalid_index_names=table_state["invalid_indexes"],
+            )
+
+            # Earlier pushes could append duplicate chunks; keep the latest
+            # copy so the unique chunk_id index can be built
+            chunk_key_name = self.query_builder.get_chunk_key_name(collection_name)
+            result = await connection.execute(
+                sql_text("SELECT to_regclass(:chunk_key_name) IS NULL"),
+                {"chunk_key_name": quote_identifier(chunk_key_name)},
+            )
+            if result.scalar_one():
+                await connection.execute(
+                    sql_text(
+                        f"DELETE FROM {quote_identifier(collection_name)} a "
+                        f"USING {quote_identifier(collection_name)} b "
+                        f"WHERE a.{PgVectorTableSchemaEnums.CHUNK_ID.value} "
+                        f"= b.{PgVectorTableSchemaEnums.CHUNK_ID.value} "
+                        f"AND a.{PgVectorTableSchemaEnums.ID.value} "
+                        f"< b.{PgVectorTableSchemaEnums.ID.value}"
+                    )
+                )
+
+            for index_sql in self.query_builder.get_metadata_index_sqls(
+                collection_name, self.metadata_index_keys, concurrently=True
+            ):
+                await connection.execute(index_sql)
+
+        self.collection_registry.invalidate(collection_name)
+        return True
+
+    async def _get_table_state(self, connection, table_name: str) -> dict:
+        """
+        The table's column names and the names of its INVALID indexes.
+        """
+
+        def quote_identifier(identifier):
+            return '"' + identifier.replace('"', '""') + '"'
+
+        result = await connection.execute(
+            sql_text(
+                """
+                SELECT
+                    ARRAY(
+                        SELECT a.attname::text FROM pg_attribute a
+                        WHERE a.attrelid = to_regclass(:table_name)
+                        AND a.attnum > 0
+                        AND NOT a.attisdropped
+                    ) AS columns,
+                    ARRAY(
+                        SELECT c.relname::text FROM pg_index x
+                        JOIN pg_class c ON c.oid = x.indexrelid
+                        WHERE x.indrelid = to_regclass(:table_name)
+                        AND NOT x.indisvalid
+                    ) AS invalid_indexes
+                """
+            ),
+            {"table_name": quote_identifier(table_name)},
+        )
+        record = result.fetchone()
+        return {
+            "columns": set(record.columns or []),
+            "invalid_indexes": set(record.invalid_indexes or []),
+        }
+
+    async def _drop_invalid_indexes(
+        self, connection, index_names, invalid_index_names: set
+    ):
+        def quote_identifier(identifier):
+            return '"' + identifier.replace('"', '""') + '"'
+
+        for index_name in index_names:
+            if index_name not in invalid_index_names:
+                continue
+
+            self.logger.warning(f"Dropping invalid index to rebuild it: {index_name}")
+            await connection.execute(
+                sql_text(
+                    f"DROP INDEX CONCURRENTLY IF EXISTS {quote_identifier(index_name)}"
+                )
+            )
+
+    async def get_index_table(self, collection_name: str) -> str:
+        """
+        Name of the table holding the collection's rows and vector index.
+        """
+        return collection_name
+
     async def is_index_existed(self, collection_name: str) -> bool:
-        index_name = self.default_index_name(collection_name)
+        collection_metadata = self.collection_registry.get(collection_name)
+        if collection_metadata is not None and collection_metadata["has_index"]:
+            return True
+
+        index_table = await self.get_index_table(collection_name)
+        index_name = self.default_index_name(index_table)
         async with self.db_client() as session:
             async with session.begin():
                 check_index_sql = sql_text(
                     """
                                     SELECT 1
-                                    FROM pg_indexes
-                                    WHERE tablename = :collection_name
-                                    AND indexname = :index_name
+                                    FROM pg_indexes i
+                                    JOIN pg_index x
+                                        ON x.indexrelid = format('%I.%I', i.schemaname, i.indexname)::regclass
+                                    WHERE i.tablename = :collection_name
+                                    AND i.indexname = :index_name
+                                    AND x.indisvalid
                                     """
                 )
                 results = await session.execute(
                     check_index_sql,
-                    {"collection_name": collection_name, "index_name": index_name},
+                    {"collection_name": index_table, "index_name": index_name},
                 )
 
                 return bool(results.scalar_one_or_none())
 
+    async def get_vector_index_state(self, collection_name: str) -> dict | None:
+        """
+        Return the access method, storage options and build metadata of the
+        collection's vector index, or None if it has no valid index.
+        """
+        index_table = await self.get_index_table(collection_name)
+
+        async with self.db_client() as session:
+            async with session.begin():
+                index_state_sql = sql_text(
+                    """
+                    SELECT
+                        am.amname AS index_type,
+                        c.reloptions AS reloptions,
+                        obj_description(c.oid, 'pg_class') AS comment
+                    FROM pg_class c
+                    JOIN pg_am am ON am.oid = c.relam
+                    JOIN pg_index x ON x.indexrelid = c.oid
+                    WHERE c.relname = :index_name
+                    AND c.relkind = 'i'
+                    AND x.indisvalid
+                    """
+                )
+                results = await session.execute(
+                    index_state_sql,
+                    {"index_name": self.default_index_name(index_table)},
+                )
+                record = results.fetchone()
+
+        if record is None:
+            return None
+
+        return {
+            "index_type": record.index_type,
+            "reloptions": record.reloptions or [],
+            "build_info": self.index_manager.parse_index_comment(record.comment),
+        }
+
     async def create_vector_index(
         self,
         collection_name: str,
-        index_type: str = PgVectorIndexTypeEnums.HNSW.value,
+        index_type: str = None,
     ):
+        """
+        Build the collection's vector index with CREATE INDEX CONCURRENTLY so
+        inserts and searches keep working while the graph is being built.
+        Meant to run from the background index build task, not the insert path.
+        """
         is_index_exists = await self.is_index_existed(collection_name=collection_name)
         if is_index_exists:
             return False
 
+        index_type = index_type or self.index_manager.index_type
+        index_table = await self.get_index_table(collection_name)
+        index_name = self.default_index_name(index_table)
+
         async with self.db_client() as session:
-            async with session.begin():
+            # CONCURRENTLY can't run inside a transaction block
+            connection = await session.connection(
+                execution_options={"isolation_level": "AUTOCOMMIT"}
+            )
 
-                def quote_identifier(identifier):
-                    return '"' + identifier.replace('"', '""') + '"'
+            records_count = await self._count_records(connection, index_table)
+            if records_count < self.index_threshold:
+                return False
 
-                table_name_quoted = quote_identifier(collection_name)
-                count_sql = sql_text(f"SELECT COUNT(*) FROM {table_name_quoted}")
-                result = await session.execute(count_sql)
-                records_count = result.scalar_one()
+            self.logger.info(
+                f"START: Creating vector index for collection: {collection_name}"
+            )
 
-                if records_count < self.index_threshold:
-                    return False
+            await self._build_vector_index(
+                connection,
+                collection_name=collection_name,
+                index_name=index_name,
+                index_type=index_type,
+                records_count=records_count,
+            )
 
-                self.logger.info(
-                    f"START: Creating vector index for collection: {collection_name}"
-                )
+            self.logger.info(
+                f"END: Created vector index for collection: {collection_name}"
+            )
 
-                # Add a short sleep for rate limiting
-                await asyncio.sleep(1)
+        self.collection_registry.update(collection_name, has_index=True)
+        return True
 
-                index_name = self.default_index_name(collection_name)
+    async def maintain_vector_index(self, collection_name: str):
+        """
+        Create the vector index if it's missing, or rebuild it side by side
+        when the collection has outgrown the parameters it was built with.
+        """
+        await self.create_metadata_indexes(collection_name)
 
-                def quote_identifier(identifier):
-                    return '"' + identifier.replace('"', '""') + '"'
+        index_state = await self.get_vector_index_state(collection_name)
+        if index_state is None:
+            return await self.create_vector_index(collection_name=collection_name)
 
-                index_name_quoted = quote_identifier(index_name)
-                collection_name_quoted = quote_identifier(collection_name)
-                create_idx_sql = sql_text(
-                    f"CREATE INDEX {index_name_quoted} ON {collection_name_quoted} "
-                    f"USING {index_type} ({PgVectorTableSchemaEnums.VECTOR.value} {self.distance_method})"
+        def quote_identifier(identifier):
+            return '"' + identifier.replace('"', '""') + '"'
+
+        index_table = await self.get_index_table(collection_name)
+        index_name = self.default_index_name(index_table)
+        rebuild_index_name = f"{index_name}_rebuild"
+
+        async with self.db_client() as session:
+            connection = await session.connection(
+                execution_options={"isolation_level": "AUTOCOMMIT"}
+            )
+
+            records_count = await self._count_records(connection, index_table)
+            if not self.index_manager.needs_rebuild(index_state, records_count):
+                return False
+
+            self.logger.info(
+                f"START: Rebuilding vector index for collection: {collection_name}"
+            )
+
+            # Build the new index next to the live one, then swap the names
+            await self._build_vector_index(
+                connection,
+                collection_name=collection_name,
+                index_name=rebuild_index_name,
+                index_type=index_state["index_type"],
+                records_count=records_count,
+            )
+            await connection.execute(
+                sql_text(
+                    f"DROP INDEX CONCURRENTLY IF EXISTS {quote_identifier(index_name)}"
                 )
+            )
+            await connection.execute(
+                sql_text(
+                    f"ALTER INDEX {quote_identifier(rebuild_index_name)} "
+                    f"RENAME TO {quote_identifier(index_name)}"
+                )
+            )
 
-                await session.execute(create_idx_sql)
+            self.logger.info(
+                f"END: Rebuilt vector index for collection: {collection_name}"
+            )
+
+        return True
 
-                self.logger.info(
-                    f"END: Created vector index for collection: {collection_name}"
+    async def _count_records(self, connection, collection_name: str) -> int:
+        def quote_identifier(identifier):
+            return '"' + identifier.replace('"', '""') + '"'
+
+        collection_name_quoted = quote_identifier(collection_name)
+        count_sql = sql_text(f"SELECT COUNT(*) FROM {collection_name_quoted}")
+        result = await connection.execute(count_sql)
+        return result.scalar_one()
+
+    async def _build_vector_index(
+        self,
+        connection,
+        collection_name: str,
+        index_name: str,
+        index_type: str,
+        records_count: int,
+    ):
+        def quote_identifier(identifier):
+            return '"' + identifier.replace('"', '""') + '"'
+
+        index_name_quoted = quote_identifier(index_name)
+        index_table_quoted = quote_identifier(
+            await self.get_index_table(collection_name)
+        )
+
+        collection_metadata = await self.get_collection_metadata(collection_name)
+        index_target = self.query_builder.get_index_target(
+            collection_metadata["storage_mode"], collection_metadata["embedding_size"]
+        )
+
+        index_params = self.index_manager.get_index_params(
+            records_count, index_type=index_type
+        )
+        index_comment = self.index_manager.get_index_comment(
+            index_type, index_params, records_count
+        ).replace("'", "''")
+
+        try:
+            await connection.execute(
+                sql_text(
+                    f"SET maintenance_work_mem = '{self.index_maintenance_work_mem}'"
+                )
+            )
+            await connection.execute(
+                sql_text(
+                    "SET max_parallel_maintenance_workers = "
+                    f"{int(self.index_parallel_workers)}"
                 )
+            )
+
+            # A failed concurrent build leaves an INVALID index behind
+            await connection.execute(
+                sql_text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name_quoted}")
+            )
+
+            create_idx_sql = sql_text(
+                f"CREATE INDEX CONCURRENTLY {index_name_quoted} ON {index_table_quoted} "
+                f"USING {index_type} ({index_target}) "
+                f"{self.index_manager.get_with_clause(index_params)}"
+            )
+            await connection.execute(create_idx_sql)
+
+            # Record what the index was built with, for maintain_vector_index
+            await connection.execute(
+                sql_text(f"COMMENT ON INDEX {index_name_quoted} IS '{index_comment}'")
+            )
+        finally:
+            await connection.execute(sql_text("RESET maintenance_work_mem"))
+            await connection.execute(sql_text("RESET max_parallel_maintenance_workers"))
 
     async def reset_vector_index(
         self,
         collection_name: str,
-        index_type: str = PgVectorIndexTypeEnums.HNSW.value,
+        index_type: str = None,
     ):
-        index_name = self.default_index_name(collection_name)
+        index_name = self.default_index_name(
+            await self.get_index_table(collection_name)
+        )
+        self.collection_registry.invalidate(collection_name)
+
         async with self.db_client() as session:
             async with session.begin():
-                drop_sql = sql_text("DROP INDEX IF EXISTS :index_name")
-                await session.execute(
-                    drop_sql,
-                    {
-                        "index_name": index_name,
-                    },
-                )
+
+                def quote_identifier(identifier):
+                    return '"' + identifier.replace('"', '""') + '"'
+
+                # Identifiers can not be bound as parameters
+                index_name_quoted = quote_identifier(index_name)
+                drop_sql = sql_text(f"DROP INDEX IF EXISTS {index_name_quoted}")
+                await session.execute(drop_sql)
         return await self.create_vector_index(
             collection_name=collection_name,
             index_type=index_type,
         )
 
+    def get_insert_target(self, collection_name: str) -> tuple[str, dict]:
+        """
+        Table receiving the collection's rows and any extra column values
+        every row must carry.
+        """
+        return collection_name, {}
+
+    def _get_insert_sql(
+        self, table_name: str, columns: list, upsert: bool, source=None
+    ):
+        """
+        INSERT statement for the given columns, reading bound values or the
+        rows of a `source` table. With `upsert`, rows are keyed by chunk_id and
+        an existing row is only rewritten when its content hash changed.
+        """
+
+        def quote_identifier(identifier):
+            return '"' + identifier.replace('"', '""') + '"'
+
+        table_name_quoted = quote_identifier(table_name)
+        if source is None:
+            values_sql = f"VALUES ({', '.join(f':{column}' for column in columns)})"
+        else:
+            values_sql = f"SELECT {', '.join(columns)} FROM {quote_identifier(source)}"
+
+        insert_sql = (
+            f"INSERT INTO {table_name_quoted} ({', '.join(columns)}) {values_sql}"
+        )
+        if upsert:
+            # Extra columns (e.g. the partition key) are part of the unique key
+            conflict_columns = [
+                column
+                for column in columns
+                if column not in self.query_builder.upsert_columns
+            ]
+            insert_sql += " " + self.query_builder.get_upsert_clause(
+                table_name, conflict_columns
+            )
+
+        return sql_text(insert_sql)
+
     async def insert_one(
         self,
         collection_name: str,
@@ -270,8 +866,10 @@ class PGVectorProvider(VectorDBInterface):
         vector: list,
         metadata: dict | None = None,
         record_id: str | None = None,
+        content_hash: str | None = None,
     ) -> bool:
-        if not await self.is_collection_exist(collection_name):
+        collection_metadata = await self.get_collection_metadata(collection_name)
+        if collection_metadata is None:
             self.logger.error(
                 f"Can't insert new record to non-existed collection: {collection_name}"
             )
@@ -287,35 +885,40 @@ class PGVectorProvider(VectorDBInterface):
 
             async with self.db_client() as session:
                 async with session.begin():
-
-                    def quote_identifier(identifier):
-                        return '"' + identifier.replace('"', '""') + '"'
-
-                    table_name_quoted = quote_identifier(collection_name)
-                    insert_sql = sql_text(
-                        f"INSERT INTO {table_name_quoted}"
-                        f"({PgVectorTableSchemaEnums.TEXT.value},"
-                        f"{PgVectorTableSchemaEnums.VECTOR.value},"
-                        f"{PgVectorTableSchemaEnums.METADATA.value},"
-                        f"{PgVectorTableSchemaEnums.CHUNK_ID.value})"
-                        "VALUES (:text, :vector, :metadata, :chunk_id)"
+                    await self._get_vector_connection(session)
+
+                    table_name, extra_values = self.get_insert_target(collection_name)
+                    columns = [
+                        PgVectorTableSchemaEnums.TEXT.value,
+                        PgVectorTableSchemaEnums.VECTOR.value,
+                        PgVectorTableSchemaEnums.METADATA.value,
+                        PgVectorTableSchemaEnums.CHUNK_ID.value,
+                        PgVectorTableSchemaEnums.CONTENT_HASH.value,
+                        *extra_values,
+                    ]
+                    insert_sql = self._get_insert_sql(
+                        table_name,
+                        columns,
+                        upsert=collection_metadata["has_chunk_key"],
                     )
                     await session.execute(
                         insert_sql,
                         {
                             "text": text,
-                            "vector": "[" + ",".join([str(v) for v in vector]) + "]",
+                            "vector": vector,
                             "metadata": json.dumps(metadata) if metadata else "{}",
                             "chunk_id": record_id,
+                            "content_hash": content_hash,
+                            **extra_values,
                         },
                     )
                     await session.commit()
-            await self.create_vector_index(collection_name=collection_name)
 
         except Exception as e:
             self.logger.error(f"Error while inserting batch: {e}")
             return False
 
+        await self.collection_generations.bump(collection_name)
         return True
 
     async def insert_many(
@@ -326,99 +929,638 @@ class PGVectorProvider(VectorDBInterface):
         metadata: list | None = None,
         record_ids: list | None = None,
         batch_size: int = 50,
+        content_hashes: list | None = None,
     ) -> bool:
-        if not await self.is_collection_exist(collection_name):
+        collection_metadata = await self.get_collection_metadata(collection_name)
+        if collection_metadata is None:
             self.logger.error(
                 f"Can't insert new record to non-existed collection: {collection_name}"
             )
             return False
 
+        embedding_size = collection_metadata["embedding_size"]
+        if vectors and embedding_size > 0 and len(vectors[0]) != embedding_size:
+            self.logger.error(
+                f"Vector size {len(vectors[0])} doesn't match collection: {collection_name}"
+            )
+            return False
+
         if metadata is None:
             metadata = [None] * len(texts)
 
         if record_ids is None:
             record_ids = list(range(0, len(texts)))
 
+        if content_hashes is None:
+            content_hashes = [None] * len(texts)
+
         if len(vectors) != len(record_ids):
             self.logger.error(f"Invalid data items for collection: {collection_name}")
             return False
 
+        # Collections created before chunk_id was unique get plain inserts
+        # until index maintenance adds the key
+        upsert = collection_metadata["has_chunk_key"]
+
+        if self.insert_mode == PgVectorInsertModeEnums.COPY.value:
+            await self._copy_many(
+                collection_name=collection_name,
+                texts=texts,
+                vectors=vectors,
+                metadata=metadata,
+                record_ids=record_ids,
+                content_hashes=content_hashes,
+                upsert=upsert,
+            )
+        else:
+            await self._execute_many(
+                collection_name=collection_name,
+                texts=texts,
+                vectors=vectors,
+                metadata=metadata,
+                record_ids=record_ids,
+                content_hashes=content_hashes,
+                upsert=upsert,
+                batch_size=batch_size,
+            )
+
+        await self.collection_generations.bump(collection_name)
+        return True
+
+    async def _copy_many(
+        self,
+        collection_name: str,
+        texts: list,
+        vectors: list,
+        metadata: list,
+        record_ids: list,
+        content_hashes: list,
+        upsert: bool = True,
+    ):
+        def quote_identifier(identifier):
+            return '"' + identifier.replace('"', '""') + '"'
+
+        table_name, extra_values = self.get_insert_target(collection_name)
+        extra_row = tuple(extra_values.values())
+        columns = [
+            PgVectorTableSchemaEnums.TEXT.value,
+            PgVectorTableSchemaEnums.VECTOR.value,
+            PgVectorTableSchemaEnums.METADATA.value,
+            PgVectorTableSchemaEnums.CHUNK_ID.value,
+            PgVectorTableSchemaEnums.CONTENT_HASH.value,
+            *extra_values,
+        ]
+
+        # Rows are streamed through a single binary COPY; vectors are encoded
+        # by the pgvector codec instead of being formatted as text literals.
+        records = (
+            (
+                _text,
+                _vector,
+                json.dumps(_metadata) if _metadata else "{}",
+                _record_id,
+                _content_hash,
+                *extra_row,
+            )
+            for _text, _vector, _metadata, _record_id, _content_hash in zip(
+                texts, vectors, metadata, record_ids, content_hashes
+            )
+        )
+
+        async with self.db_client() as session:
+            async with session.begin():
+                asyncpg_connection = await self._get_vector_connection(session)
+
+                if not upsert:
+                    await asyncpg_connection.copy_records_to_table(
+                        table_name, records=records, columns=columns
+                    )
+                    return
+
+                # COPY can't resolve conflicts: load a staging table first,
+                # then upsert from it in one statement
+                staging_table = f"{self.pgvector_table_prefix}_staging"
+                await session.execute(
+                    sql_text(
+                        f"CREATE TEMP TABLE {quote_identifier(staging_table)} ("
+                        f"{PgVectorTableSchemaEnums.TEXT.value} text,"
+                        f"{PgVectorTableSchemaEnums.VECTOR.value} vector,"
+                        f"{PgVectorTableSchemaEnums.METADATA.value} jsonb,"
+                        f"{PgVectorTableSchemaEnums.CHUNK_ID.value} integer,"
+                        f"{PgVectorTableSchemaEnums.CONTENT_HASH.value} text"
+                        f"{''.join(f', {column} text' for column in extra_values)}"
+                        ") ON COMMIT DROP"
+                    )
+                )
+                await asyncpg_connection.copy_records_to_table(
+                    staging_table, records=records, columns=columns
+                )
+                await session.execute(
+                    self._get_insert_sql(
+                        table_name, columns, upsert=True, source=staging_table
+                    )
+                )
+
+    async def _execute_many(
+        self,
+        collection_name: str,
+        texts: list,
+        vectors: list,
+        metadata: list,
+        record_ids: list,
+        content_hashes: list,
+        upsert: bool = True,
+        batch_size: int = 50,
+    ):
+        table_name, extra_values = self.get_insert_target(collection_name)
+        columns = [
+            PgVectorTableSchemaEnums.TEXT.value,
+            PgVectorTableSchemaEnums.VECTOR.value,
+            PgVectorTableSchemaEnums.METADATA.value,
+            PgVectorTableSchemaEnums.CHUNK_ID.value,
+            PgVectorTableSchemaEnums.CONTENT_HASH.value,
+            *extra_values,
+        ]
+        batch_insert_sql = self._get_insert_sql(table_name, columns, upsert=upsert)
+
         async with self.db_client() as session:
             async with session.begin():
+                await self._get_vector_connection(session)
+
                 for i in range(0, len(texts), batch_size):
                     batch_end = i + batch_size
                     batch_texts = texts[i:batch_end]
                     batch_vectors = vectors[i:batch_end]
                     batch_metadata = metadata[i:batch_end]
                     batch_record_ids = record_ids[i:batch_end]
+                    batch_content_hashes = content_hashes[i:batch_end]
 
                     values = []
-                    for _text, _vector, _metadata, _record_id in zip(
-                        batch_texts, batch_vectors, batch_metadata, batch_record_ids
+                    for (
+                        _text,
+                        _vector,
+                        _metadata,
+                        _record_id,
+                        _content_hash,
+                    ) in zip(
+                        batch_texts,
+                        batch_vectors,
+                        batch_metadata,
+                        batch_record_ids,
+                        batch_content_hashes,
                     ):
                         values.append(
                             {
                                 "text": _text,
-                                "vector": "["
-                                + ",".join([str(v) for v in _vector])
-                                + "]",
+                                "vector": _vector,
                                 "metadata": (
                                     json.dumps(_metadata) if _metadata else "{}"
                                 ),
                                 "chunk_id": _record_id,
+                                "content_hash": _content_hash,
+                                **extra_values,
                             }
                         )
 
-                    def quote_identifier(identifier):
-                        return '"' + identifier.replace('"', '""') + '"'
-
-                    table_name_quoted = quote_identifier(collection_name)
-                    batch_insert_sql = sql_text(
-                        f"INSERT INTO {table_name_quoted}"
-                        f"({PgVectorTableSchemaEnums.TEXT.value},"
-                        f"{PgVectorTableSchemaEnums.VECTOR.value},"
-                        f"{PgVectorTableSchemaEnums.METADATA.value},"
-                        f"{PgVectorTableSchemaEnums.CHUNK_ID.value})"
-                        "VALUES (:text, :vector, :metadata, :chunk_id)"
+                    await session.execute(batch_insert_sql, values)
+
+    async def get_content_hashes(self, collection_name: str, record_ids: list) -> dict:
+        """
+        Map the given chunk ids to the content hash they were indexed with,
+        so unchanged chunks can be skipped before being embedded again.
+        """
+        collection_metadata = await self.get_collection_metadata(collection_name)
+        if (
+            collection_metadata is None
+            or not collection_metadata["has_chunk_key"]
+            or not record_ids
+        ):
+            return {}
+
+        def quote_identifier(identifier):
+            return '"' + identifier.replace('"', '""') + '"'
+
+        table_name, search_filter = self.get_search_scope(
+            collection_name, {"chunk_ids": record_ids}
+        )
+        filter_clause, _, filter_values = self.query_builder.get_filter_clause(
+            search_filter
+        )
+
+        async with self.db_client() as session:
+            async with session.begin():
+                result = await session.execute(
+                    sql_text(
+                        f"SELECT {PgVectorTableSchemaEnums.CHUNK_ID.value} AS chunk_id, "
+                        f"{PgVectorTableSchemaEnums.CONTENT_HASH.value} AS content_hash "
+                        f"FROM {quote_identifier(table_name)} WHERE {filter_clause}"
+                    ),
+                    filter_values,
+                )
+                return {
+                    record.chunk_id: record.content_hash for record in result.fetchall()
+                }
+
+    async def get_vectors(self, collection_name: str, record_ids: list) -> dict:
+        """
+        Map the given chunk ids to their stored full-precision vectors.
+        """
+        collection_metadata = await self.get_collection_metadata(collection_name)
+        if collection_metadata is None or not record_ids:
+            return {}
+
+        def quote_identifier(identifier):
+            return '"' + identifier.replace('"', '""') + '"'
+
+        table_name, search_filter = self.get_search_scope(
+            collection_name, {"chunk_ids": record_ids}
+        )
+        filter_clause, _, filter_values = self.query_builder.get_filter_clause(
+            search_filter
+        )
+
+        async with self.db_client() as session:
+            async with session.begin():
+                # The binary codec decodes vectors straight into numpy arrays;
+                # halfvec columns are cast so they decode the same way
+                await self._get_vector_connection(session)
+                result = await session.execute(
+                    sql_text(
+                        f"SELECT {PgVectorTableSchemaEnums.CHUNK_ID.value} AS chunk_id, "
+                        f"{PgVectorTableSchemaEnums.VECTOR.value}::vector AS vector "
+                        f"FROM {quote_identifier(table_name)} WHERE {filter_clause}"
+                    ),
+                    filter_values,
+                )
+                return {record.chunk_id: record.vector for record in result.fetchall()}
+
+    async def iter_records(self, collection_name: str, batch_size: int = 1000):
+        """
+        Stream every record of the collection in batches of `batch_size`,
+        paging on the primary key so each batch is a short index range scan
+        in its own transaction.
+        """
+        collection_metadata = await self.get_collection_metadata(collection_name)
+        if collection_metadata is None:
+            return
+
+        def quote_identifier(identifier):
+            return '"' + identifier.replace('"', '""') + '"'
+
+        table_name, search_filter = self.get_search_scope(collection_name, None)
+        filter_clause, _, filter_values = self.query_builder.get_filter_clause(
+            search_filter
+        )
+        conditions = [f"{PgVectorTableSchemaEnums.ID.value} > :after_id"]
+        if filter_clause:
+            conditions.append(filter_clause)
+
+        batch_sql = sql_text(
+            f"SELECT {PgVectorTableSchemaEnums.ID.value} AS id, "
+            f"{PgVectorTableSchemaEnums.CHUNK_ID.value} AS chunk_id, "
+            f"{PgVectorTableSchemaEnums.TEXT.value} AS text, "
+            f"{PgVectorTableSchemaEnums.METADATA.value} AS metadata, "
+            f"{PgVectorTableSchemaEnums.CONTENT_HASH.value} AS content_hash, "
+            f"{PgVectorTableSchemaEnums.VECTOR.value}::vector AS vector "
+            f"FROM {quote_identifier(table_name)} "
+            f"WHERE {' AND '.join(conditions)} "
+            f"ORDER BY {PgVectorTableSchemaEnums.ID.value} LIMIT :batch_size"
+        )
+
+        after_id = 0
+        while True:
+            async with self.db_client() as session:
+                async with session.begin():
+                    await self._get_vector_connection(session)
+                    result = await session.execute(
+                        batch_sql,
+                        {
+                            **filter_values,
+                            "after_id": after_id,
+                            "batch_size": batch_size,
+                        },
                     )
+                    records = result.fetchall()
+
+            if not records:
+                return
+
+            after_id = records[-1].id
+            yield {
+                "record_ids": [record.chunk_id for record in records],
+                "texts": [record.text for record in records],
+                "metadata": [
+                    (
+                        json.loads(record.metadata)
+                        if isinstance(record.metadata, str)
+                        else record.metadata
+                    )
+                    for record in records
+                ],
+                "content_hashes": [record.content_hash for record in records],
+                "vectors": np.stack([record.vector for record in records]).astype(
+                    np.float32, copy=False
+                ),
+            }
+
+            if len(records) < batch_size:
+                return
+
+    async def delete_records(self, collection_name: str, record_ids: list) -> int:
+        """
+        Delete the given chunk ids from the collection in a single statement,
+        resolved through the chunk id key index.
+        """
+        collection_metadata = await self.get_collection_metadata(collection_name)
+        if collection_metadata is None or not record_ids:
+            return 0
 
-                    await session.execute(batch_insert_sql, values)
-        await self.create_vector_index(collection_name=collection_name)
-        return True
+        def quote_identifier(identifier):
+            return '"' + identifier.replace('"', '""') + '"'
+
+        table_name, search_filter = self.get_search_scope(
+            collection_name, {"chunk_ids": record_ids}
+        )
+        filter_clause, _, filter_values = self.query_builder.get_filter_clause(
+            search_filter
+        )
+
+        async with self.db_client() as session:
+            async with session.begin():
+                result = await session.execute(
+                    sql_text(
+                        f"DELETE FROM {quote_identifier(table_name)} WHERE {filter_clause}"
+                    ),
+                    filter_values,
+                )
+                deleted_count = result.rowcount
+
+        await self.collection_generations.bump(collection_name)
+        return deleted_count
 
     async def search_by_vector(
-        self, collection_name: str, vector: list, limit: int
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int,
+        search_params: dict | None = None,
+        search_filter: dict | None = None,
     ) -> list[RetrievedDocument] | None:
-        if not await self.is_collection_exist(collection_name):
+        collection_metadata = await self.get_collection_metadata(collection_name)
+        if collection_metadata is None:
             self.logger.error(f"Can't search non-existed collection: {collection_name}")
             return None
 
-        def quote_identifier(identifier):
-            return '"' + identifier.replace('"', '""') + '"'
+        search_sql, search_values = self._get_search_statement(
+            collection_name,
+            collection_metadata,
+            limit=limit,
+            search_filter=search_filter,
+        )
 
-        table_name_quoted = quote_identifier(collection_name)
-        # Inline the vector as a pgvector literal
-        vector_str = "'[{0}]'::vector".format(",".join(str(v) for v in vector))
+        settings_sql, settings_values = self._get_search_settings(
+            search_values,
+            search_params=search_params,
+            is_filtered=self._is_filtered(search_values),
+        )
 
         async with self.db_client() as session:
             async with session.begin():
-                search_sql = sql_text(
-                    f"SELECT {PgVectorTableSchemaEnums.TEXT.value} as text, 1- ({PgVectorTableSchemaEnums.VECTOR.value} <=> {vector_str}) as score FROM {table_name_quoted} ORDER BY score DESC LIMIT :limit"
+                await self._get_vector_connection(session)
+
+                if settings_sql is not None:
+                    await session.execute(settings_sql, settings_values)
+
+                result = await session.execute(
+                    search_sql,
+                    {"vector": vector, **search_values},
                 )
 
+                records = result.fetchall()
+
+                # Relaxed iterative scans may return rows slightly out of order
+                records = sorted(records, key=lambda record: record.distance)
+
+                return [
+                    RetrievedDocument(
+                        text=record.text,
+                        score=self.query_builder.distance_to_score(record.distance),
+                        chunk_id=record.chunk_id,
+                    )
+                    for record in records
+                ]
+
+    async def search_many(
+        self,
+        collection_name: str,
+        vectors: list,
+        limit: int,
+        search_params: dict | None = None,
+        search_filter: dict | None = None,
+    ) -> list[list[RetrievedDocument]] | None:
+        """
+        Run one search per query vector in a single statement and round-trip.
+        Results are returned in the order of `vectors`.
+        """
+        collection_metadata = await self.get_collection_metadata(collection_name)
+        if collection_metadata is None:
+            self.logger.error(f"Can't search non-existed collection: {collection_name}")
+            return None
+
+        if not vectors:
+            return []
+
+        search_sql, search_values = self._get_search_statement(
+            collection_name,
+            collection_metadata,
+            limit=limit,
+            search_filter=search_filter,
+            batched=True,
+        )
+        settings_sql, settings_values = self._get_search_settings(
+            search_values,
+            search_params=search_params,
+            is_filtered=self._is_filtered(search_values),
+        )
+
+        results = [[] for _ in vectors]
+
+        async with self.db_client() as session:
+            async with session.begin():
+                await self._get_vector_connection(session)
+
+                if settings_sql is not None:
+                    await session.execute(settings_sql, settings_values)
+
+                result = await session.execute(
+                    search_sql,
+                    {"vectors": vectors, **search_values},
+                )
+
+                # ORDINALITY is 1-based
+                for record in result.fetchall():
+                    results[record.query_index - 1].append(
+                        RetrievedDocument(
+                            text=record.text,
+                            score=self.query_builder.distance_to_score(record.distance),
+                            chunk_id=record.chunk_id,
+                        )
+                    )
+
+        return results
+
+    def get_search_scope(self, collection_name: str, search_filter: dict | None):
+        """
+        Table to run the collection's searches against and the filter to apply.
+        """
+        return collection_name, search_filter
+
+    def _get_search_statement(
+        self,
+        collection_name: str,
+        collection_metadata: dict,
+        limit: int,
+        search_filter: dict | None = None,
+        batched: bool = False,
+    ):
+        get_search_sql = (
+            self.query_builder.get_search_many_sql
+            if batched
+            else self.query_builder.get_search_sql
+        )
+        table_name, search_filter = self.get_search_scope(
+            collection_name, search_filter
+        )
+        search_sql, filter_values = get_search_sql(
+            table_name,
+            search_filter=search_filter,
+            storage_mode=collection_metadata["storage_mode"],
+            embedding_size=collection_metadata["embedding_size"],
+        )
+
+        search_values = {"limit": limit, **filter_values}
+        if collection_metadata["storage_mode"] == PgVectorStorageModeEnums.BIT.value:
+            search_values["candidates_limit"] = limit * self.rescore_factor
+
+        return search_sql, search_values
+
+    def _is_filtered(self, search_values: dict) -> bool:
+        # Every clause the filter built binds a value; an empty filter
+        # (e.g. `metadata: []`) builds none and scans like no filter
+        return any(key.startswith("filter_") for key in search_values)
+
+    def _get_search_settings(
+        self,
+        search_values: dict,
+        search_params: dict | None = None,
+        is_filtered: bool = False,
+    ):
+        if search_values.get("candidates_limit"):
+            # The binary index must surface every candidate to be rescored,
+            # also when the request didn't pass any search params
+            ef_search = max(
+                (search_params or {}).get("ef_search") or 0,
+                search_values["candidates_limit"],
+            )
+            if ef_search > self.max_ef_search:
+                self.logger.warning(
+                    f"Rescoring {search_values['candidates_limit']} candidates "
+                    f"needs ef_search above {self.max_ef_search}: recall is capped"
+                )
+                ef_search = self.max_ef_search
+            search_params = {**(search_params or {}), "ef_search": ef_search}
+
+        if is_filtered and self.iterative_scan:
+            search_params = {
+                **(search_params or {}),
+                "iterative_scan": self.iterative_scan,
+            }
+
+        return self.query_builder.get_search_settings_sql(search_params)
+
+    async def search_by_text(
+        self,
+        collection_name: str,
+        text: str,
+        limit: int,
+        search_filter: dict | None = None,
+    ) -> list[RetrievedDocument] | None:
+        """
+        Lexical search over the collection's generated tsvector column, used
+        next to search_by_vector for hybrid retrieval.
+        """
+        if not await self.is_collection_exist(collection_name):
+            self.logger.error(f"Can't search non-existed collection: {collection_name}")
+            return None
+
+        table_name, search_filter = self.get_search_scope(
+            collection_name, search_filter
+        )
+        search_sql, filter_values = self.query_builder.get_text_search_sql(
+            table_name, search_filter=search_filter
+        )
+
+        async with self.db_client() as session:
+            async with session.begin():
                 result = await session.execute(
                     search_sql,
                     {
+                        "query": text,
                         "limit": limit,
+                        **filter_values,
                     },
                 )
-
                 records = result.fetchall()
 
                 return [
                     RetrievedDocument(
                         text=record.text,
-                        score=record.score,
+                        score=record.rank,
+                        chunk_id=record.chunk_id,
                     )
                     for record in records
                 ]
+
+    async def is_search_using_index(
+        self, collection_name: str, vector: list | None = None, limit: int = 10
+    ) -> bool:
+        """
+        EXPLAIN the search statement and report whether the planner answers it
+        with a scan of the collection's vector index. Without a vector a unit
+        probe is planned, the statement isn't executed.
+        """
+        collection_metadata = await self.get_collection_metadata(collection_name)
+        if collection_metadata is None:
+            return False
+
+        if vector is None:
+            vector = [1.0] + [0.0] * (collection_metadata["embedding_size"] - 1)
+
+        search_sql, search_values = self._get_search_statement(
+            collection_name, collection_metadata, limit=limit
+        )
+        index_name = self.default_index_name(
+            await self.get_index_table(collection_name)
+        )
+
+        async with self.db_client() as session:
+            async with session.begin():
+                await self._get_vector_connection(session)
+
+                explain_sql = sql_text(f"EXPLAIN (FORMAT JSON) {search_sql.text}")
+                result = await session.execute(
+                    explain_sql, {"vector": vector, **search_values}
+                )
+                plan = result.scalar_one()
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        nodes = [plan[0]["Plan"]]
+        while nodes:
+            node = nodes.pop()
+            if node.get("Index Name") == index_name:
+                return True
+            nodes.extend(node.get("Plans", []))
+
+        return False
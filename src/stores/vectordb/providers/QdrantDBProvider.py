@@ -1,92 +1,178 @@
+import asyncio
 import logging
 
-from qdrant_client import QdrantClient, models
+import numpy as np
+from qdrant_client import AsyncQdrantClient, models
 
 from models.db_schemas import RetrievedDocument
 
-from ..VectorDBEnums import DistanceMethodEnums
+from ..CollectionGenerations import CollectionGenerations
+from ..VectorDBEnums import DistanceMethodEnums, QdrantQuantizationEnums
 from ..VectorDBInterface import VectorDBInterface
 
 
 class QdrantDBProvider(VectorDBInterface):
     def __init__(
         self,
-        db_client: str,
+        db_client: str | None = None,
         distance_method: str = None,
         default_vector_size: int = 786,
         index_threshold: int = 100,
+        metadata_index_keys: list | None = None,
+        url: str | None = None,
+        api_key: str | None = None,
+        prefer_grpc: bool = False,
+        upload_parallel: int = 1,
+        quantization: str | None = None,
+        quantization_always_ram: bool = True,
+        quantization_rescore: bool = True,
+        quantization_oversampling: float = 2.0,
+        on_disk: bool = False,
+        hnsw_m: int | None = None,
+        hnsw_ef_construct: int | None = None,
+        payload_schemas: dict | None = None,
+        collection_generations: CollectionGenerations | None = None,
     ):
         self.client = None
+        # Embedded storage path, used when no server url is configured
         self.db_client = db_client
+        self.url = url
+        self.api_key = api_key
+        self.prefer_grpc = prefer_grpc
+        self.upload_parallel = max(1, upload_parallel)
+        self.quantization = quantization
+        self.quantization_always_ram = quantization_always_ram
+        self.quantization_rescore = quantization_rescore
+        self.quantization_oversampling = quantization_oversampling
+        self.on_disk = on_disk
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construct = hnsw_ef_construct
+        # Payload index type per metadata key (keyword, integer, float, ...)
+        self.payload_schemas = payload_schemas or {}
         self.distance_method = None
         self.default_vector_size = default_vector_size
+        self.metadata_index_keys = metadata_index_keys or []
+        self.collection_generations = collection_generations or CollectionGenerations()
 
         if distance_method == DistanceMethodEnums.COSINE.value:
             self.distance_method = models.Distance.COSINE
         if distance_method == DistanceMethodEnums.DOT.value:
             self.distance_method = models.Distance.DOT
+        if distance_method == DistanceMethodEnums.EUCLIDEAN.value:
+            self.distance_method = models.Distance.EUCLID
 
         self.logger = logging.getLogger("uvicorn")
 
     async def connect(self):
-        self.client = QdrantClient(path=self.db_client)
+        if self.url:
+            # Server mode (HTTP, or gRPC when preferred), shareable between
+            # the API process and the Celery workers
+            self.client = AsyncQdrantClient(
+                url=self.url, api_key=self.api_key, prefer_grpc=self.prefer_grpc
+            )
+        else:
+            self.client = AsyncQdrantClient(path=self.db_client)
 
-    def disconnect(self):
+    async def disconnect(self):
+        if self.client is not None:
+            await self.client.close()
         self.client = None
+        await self.collection_generations.close()
+
+    async def is_collection_exist(self, collection_name: str) -> bool:
+        return await self.client.collection_exists(collection_name=collection_name)
+
+    async def list_all_collections(self) -> list:
+        return await self.client.get_collections()
 
-    def is_collection_exist(self, collection_name: str) -> bool:
-        return self.client.collection_exists(collection_name=collection_name)
+    async def get_collection_info(
+        self, collection_name: str, exact_count: bool = False
+    ) -> dict:
+        collection_info = await self.client.get_collection(
+            collection_name=collection_name
+        )
 
-    def list_all_collections(self) -> list:
-        return self.client.get_collections()
+        if exact_count:
+            count_result = await self.client.count(
+                collection_name=collection_name, exact=True
+            )
+            collection_info.points_count = count_result.count
 
-    def get_collection_info(self, collection_name: str) -> dict:
-        return self.client.get_collection(collection_name=collection_name)
+        return collection_info
 
-    def delete_collection(self, collection_name: str):
-        if self.is_collection_exist(collection_name):
-            return self.client.delete_collection(collection_name=collection_name)
+    async def delete_collection(self, collection_name: str):
+        if await self.is_collection_exist(collection_name):
+            result = await self.client.delete_collection(
+                collection_name=collection_name
+            )
+            await self.collection_generations.bump(collection_name)
+            return result
 
-    def create_collection(
+    async def create_collection(
         self, collection_name: str, embedding_size: int, is_reset: bool = False
     ):
         self.logger.info(f"Creating new Qdrant collection: {collection_name}")
 
         if is_reset:
-            _ = self.delete_collection(collection_name)
+            _ = await self.delete_collection(collection_name)
 
-        if not self.is_collection_exist(collection_name):
-            _ = self.client.create_collection(
+        if not await self.is_collection_exist(collection_name):
+            _ = await self.client.create_collection(
                 collection_name=collection_name,
+                # Original vectors can live on disk (mmap) when the quantized
+                # copy is kept in RAM for the search
                 vectors_config=models.VectorParams(
-                    size=embedding_size, distance=self.distance_method
+                    size=embedding_size,
+                    distance=self.distance_method,
+                    on_disk=self.on_disk,
                 ),
+                hnsw_config=models.HnswConfigDiff(
+                    m=self.hnsw_m, ef_construct=self.hnsw_ef_construct
+                ),
+                quantization_config=self._build_quantization_config(),
             )
+
+            # Payload indexes backing metadata filters in search_by_vector
+            for key in self.metadata_index_keys:
+                _ = await self.client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=f"metadata.{key}",
+                    field_schema=models.PayloadSchemaType(
+                        self.payload_schemas.get(
+                            key, models.PayloadSchemaType.INTEGER.value
+                        )
+                    ),
+                )
             return True
         return False
 
-    def insert_one(
+    async def insert_one(
         self,
         collection_name: str,
         text: str,
         vector: list,
         metadata: dict | None = None,
         record_id: str | None = None,
+        content_hash: str | None = None,
     ) -> bool:
-        if not self.is_collection_exist(collection_name):
+        if not await self.is_collection_exist(collection_name):
             self.logger.error(
                 f"Can't insert new record to non-existed collection: {collection_name}"
             )
 
             return False
         try:
-            _ = self.client.upload_records(
+            _ = await self.client.upsert(
                 collection_name=collection_name,
-                records=[
-                    models.Record(
-                        id=[record_id],
+                points=[
+                    models.PointStruct(
+                        id=record_id,
                         vector=vector,
-                        payload={"text": text, "metadata": metadata},
+                        payload={
+                            "text": text,
+                            "metadata": metadata,
+                            "content_hash": content_hash,
+                        },
                     )
                 ],
             )
@@ -95,9 +181,10 @@ class QdrantDBProvider(VectorDBInterface):
             self.logger.error(f"Error while inserting batch: {e}")
             return False
 
+        await self.collection_generations.bump(collection_name)
         return True
 
-    def insert_many(
+    async def insert_many(
         self,
         collection_name: str,
         texts: list,
@@ -105,44 +192,142 @@ class QdrantDBProvider(VectorDBInterface):
         metadata: list | None = None,
         record_ids: list | None = None,
         batch_size: int = 50,
+        content_hashes: list | None = None,
     ) -> bool:
         if metadata is None:
             metadata = [None] * len(texts)
 
+        if content_hashes is None:
+            content_hashes = [None] * len(texts)
+
         if record_ids is None:
             record_ids = list(range(0, len(texts)))
 
-        for i in range(0, len(texts), batch_size):
-            batch_end = i + batch_size
-            batch_texts = texts[i:batch_end]
-            batch_vectors = vectors[i:batch_end]
-            batch_metadata = metadata[i:batch_end]
-            batch_record_ids = record_ids[i:batch_end]
-
-            batch_records = [
-                models.Record(
-                    id=batch_record_ids[x],
-                    vector=batch_vectors[x],
-                    payload={"text": batch_texts[x], "metadata": batch_metadata[x]},
-                )
-                for x in range(len(batch_texts))
-            ]
-            try:
-                _ = self.client.upload_records(
-                    collection_name=collection_name, records=batch_records
+        # Points are keyed by chunk id, so re-uploading a chunk replaces it
+        points = [
+            models.PointStruct(
+                id=record_id,
+                vector=vector,
+                payload={
+                    "text": text,
+                    "metadata": _metadata,
+                    "content_hash": content_hash,
+                },
+            )
+            for text, vector, _metadata, record_id, content_hash in zip(
+                texts, vectors, metadata, record_ids, content_hashes
+            )
+        ]
+
+        # Up to `upload_parallel` batches are in flight at once
+        upload_slots = asyncio.Semaphore(self.upload_parallel)
+
+        async def upload_batch(batch_points):
+            async with upload_slots:
+                await self.client.upsert(
+                    collection_name=collection_name, points=batch_points, wait=True
                 )
 
-            except Exception as e:
-                self.logger.error(f"Error while inserting batch: {e}")
-                return False
+        try:
+            await asyncio.gather(
+                *(
+                    upload_batch(points[i : i + batch_size])
+                    for i in range(0, len(points), batch_size)
+                )
+            )
+        except Exception as e:
+            self.logger.error(f"Error while inserting batch: {e}")
+            return False
 
+        await self.collection_generations.bump(collection_name)
         return True
 
-    def search_by_vector(
-        self, collection_name: str, vector: list, limit: int
+    async def get_content_hashes(self, collection_name: str, record_ids: list) -> dict:
+        if not record_ids or not await self.is_collection_exist(collection_name):
+            return {}
+
+        points = await self.client.retrieve(
+            collection_name=collection_name,
+            ids=record_ids,
+            with_payload=["content_hash"],
+            with_vectors=False,
+        )
+
+        return {point.id: (point.payload or {}).get("content_hash") for point in points}
+
+    async def get_vectors(self, collection_name: str, record_ids: list) -> dict:
+        if not record_ids or not await self.is_collection_exist(collection_name):
+            return {}
+
+        points = await self.client.retrieve(
+            collection_name=collection_name,
+            ids=record_ids,
+            with_payload=False,
+            with_vectors=True,
+        )
+
+        return {point.id: point.vector for point in points}
+
+    async def iter_records(self, collection_name: str, batch_size: int = 1000):
+        if not await self.is_collection_exist(collection_name):
+            return
+
+        offset = None
+        while True:
+            points, offset = await self.client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            if not points:
+                return
+
+            payloads = [point.payload or {} for point in points]
+            yield {
+                "record_ids": [point.id for point in points],
+                "texts": [payload.get("text") for payload in payloads],
+                "metadata": [payload.get("metadata") for payload in payloads],
+                "content_hashes": [payload.get("content_hash") for payload in payloads],
+                "vectors": np.asarray(
+                    [point.vector for point in points], dtype=np.float32
+                ),
+            }
+
+            if offset is None:
+                return
+
+    async def delete_records(self, collection_name: str, record_ids: list) -> int:
+        if not record_ids or not await self.is_collection_exist(collection_name):
+            return 0
+
+        # Qdrant doesn't report how many points a delete matched
+        await self.client.delete(
+            collection_name=collection_name,
+            points_selector=models.PointIdsList(points=record_ids),
+            wait=True,
+        )
+
+        await self.collection_generations.bump(collection_name)
+        return len(record_ids)
+
+    async def search_by_vector(
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int,
+        search_params: dict | None = None,
+        search_filter: dict | None = None,
     ) -> list[RetrievedDocument] | None:
-        results = self.client.search(
-            collection_name=collection_name, query_vector=vector, limit=limit
+        qdrant_search_params = self._build_search_params(search_params)
+
+        results = await self.client.search(
+            collection_name=collection_name,
+            query_vector=vector,
+            limit=limit,
+            search_params=qdrant_search_params,
+            query_filter=self._build_filter(search_filter),
         )
 
         if not results:
@@ -153,7 +338,133 @@ class QdrantDBProvider(VectorDBInterface):
                 **{
                     "score": result.score,
                     "text": result.payload["text"],
+                    "chunk_id": result.id,
                 }
             )
             for result in results
         ]
+
+    async def search_many(
+        self,
+        collection_name: str,
+        vectors: list,
+        limit: int,
+        search_params: dict | None = None,
+        search_filter: dict | None = None,
+    ) -> list[list[RetrievedDocument]] | None:
+        if not vectors:
+            return []
+
+        qdrant_search_params = self._build_search_params(search_params)
+        query_filter = self._build_filter(search_filter)
+
+        batch_results = await self.client.search_batch(
+            collection_name=collection_name,
+            requests=[
+                models.SearchRequest(
+                    vector=vector,
+                    limit=limit,
+                    params=qdrant_search_params,
+                    filter=query_filter,
+                    with_payload=True,
+                )
+                for vector in vectors
+            ],
+        )
+
+        if batch_results is None:
+            return None
+
+        return [
+            [
+                RetrievedDocument(
+                    **{
+                        "score": result.score,
+                        "text": result.payload["text"],
+                        "chunk_id": result.id,
+                    }
+                )
+                for result in results
+            ]
+            for results in batch_results
+        ]
+
+    def _build_quantization_config(self):
+        if self.quantization == QdrantQuantizationEnums.SCALAR.value:
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=self.quantization_always_ram,
+                )
+            )
+
+        if self.quantization == QdrantQuantizationEnums.BINARY.value:
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(
+                    always_ram=self.quantization_always_ram
+                )
+            )
+
+        return None
+
+    def _build_search_params(
+        self, search_params: dict | None
+    ) -> models.SearchParams | None:
+        hnsw_ef = None
+        if search_params and search_params.get("ef_search") is not None:
+            hnsw_ef = int(search_params["ef_search"])
+
+        quantization = None
+        if self.quantization:
+            # Oversample on the quantized vectors, then rescore with the originals
+            quantization = models.QuantizationSearchParams(
+                rescore=self.quantization_rescore,
+                oversampling=self.quantization_oversampling,
+            )
+
+        if hnsw_ef is None and quantization is None:
+            return None
+
+        return models.SearchParams(hnsw_ef=hnsw_ef, quantization=quantization)
+
+    def _build_filter(self, search_filter: dict | None) -> models.Filter | None:
+        if not search_filter:
+            return None
+
+        conditions = []
+
+        # Points are stored with the chunk id as their id
+        if search_filter.get("chunk_ids"):
+            conditions.append(models.HasIdCondition(has_id=search_filter["chunk_ids"]))
+
+        for condition in search_filter.get("metadata") or []:
+            field_name = f"metadata.{condition['key']}"
+
+            if condition.get("eq") is not None:
+                conditions.append(
+                    models.FieldCondition(
+                        key=field_name, match=models.MatchValue(value=condition["eq"])
+                    )
+                )
+
+            if condition.get("any_of"):
+                conditions.append(
+                    models.FieldCondition(
+                        key=field_name, match=models.MatchAny(any=condition["any_of"])
+                    )
+                )
+
+            range_values = {
+                op: condition[op]
+                for op in ("gt", "gte", "lt", "lte")
+                if condition.get(op) is not None
+            }
+            if range_values:
+                conditions.append(
+                    models.FieldCondition(
+                        key=field_name, range=models.Range(**range_values)
+                    )
+                )
+
+        return models.Filter(must=conditions) if conditions else None
@@ -1,2 +1,5 @@
+from .HnswVectorProvider import HnswVectorProvider
+from .LocalVectorProvider import LocalVectorProvider
+from .PGVectorPartitionedProvider import PGVectorPartitionedProvider
 from .PGVectorProvider import PGVectorProvider
 from .QdrantDBProvider import QdrantDBProvider
@@ -0,0 +1,372 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+
+from celery import chain
+
+from celery_app import celery_app, get_startup_setup, settings
+from controllers import NLPController
+from controllers.BaseController import BaseController
+from models import AssetModel, ChunkModel, ProjectModel, ResponseMessageEnum
+from models.db_schemas import Asset, DataChunk
+from models.enums import AssetTypeEnum
+from stores.vectordb.CollectionSnapshot import CollectionSnapshot
+from tasks.vector_indexing import (
+    task_build_vector_index,
+    task_drop_collection,
+    task_swap_collection_alias,
+)
+
+logger = logging.getLogger("celery.task")
+
+
+def get_snapshot_path(project_id: int, snapshot_name: str) -> str:
+    snapshots_dir = BaseController().get_database_path(
+        db_name=settings.VECTOR_DB_SNAPSHOT_PATH
+    )
+    return os.path.join(snapshots_dir, str(project_id), snapshot_name)
+
+
+@celery_app.task(
+    bind=True,
+    name="tasks.collection_snapshots.task_export_collection_snapshot",
+)
+def task_export_collection_snapshot(
+    self, project_id: int, snapshot_name: str, vector_dtype: str = "float32"
+):
+    return asyncio.run(
+        _export_collection_snapshot(
+            self,
+            project_id=project_id,
+            snapshot_name=snapshot_name,
+            vector_dtype=vector_dtype,
+        )
+    )
+
+
+async def _export_collection_snapshot(
+    task_instance, project_id: int, snapshot_name: str, vector_dtype: str
+):
+    db_engine = vectordb_client = None
+    try:
+        (
+            db_engine,
+            db_client,
+            llm_provider_factory,
+            vectordb_provider_factory,
+            generation_client,
+            embedding_client,
+            vectordb_client,
+            template_parser,
+        ) = await get_startup_setup()
+
+        project_model = await ProjectModel.create_instance(db_client=db_client)
+        project = await project_model.get_project_or_create_one(project_id=project_id)
+
+        nlp_controller = NLPController(
+            vectordb_client=vectordb_client,
+            generation_client=generation_client,
+            embedding_client=embedding_client,
+            template_parser=template_parser,
+            db_client=db_client,
+        )
+        collection_name = await nlp_controller.get_collection_name(project=project)
+
+        # The chunk rows stay behind; their assets are exported so an import
+        # can recreate the chunks under them
+        asset_model = await AssetModel.create_instance(db_client=db_client)
+        project_assets = await asset_model.get_all_project_assets(
+            asset_project_id=project.id, asset_type=AssetTypeEnum.FILE.value
+        )
+
+        collection_snapshot = CollectionSnapshot(
+            vectordb_client=vectordb_client,
+            batch_size=settings.VECTOR_DB_SNAPSHOT_BATCH_SIZE,
+        )
+        stats = await collection_snapshot.export_collection(
+            collection_name=collection_name,
+            snapshot_path=get_snapshot_path(project_id, snapshot_name),
+            vector_dtype=vector_dtype,
+            extra_meta={
+                "project_id": project_id,
+                "embedding_model_id": embedding_client.embedding_model_id,
+                "assets": [
+                    {
+                        "asset_id": asset.id,
+                        "asset_type": asset.asset_type,
+                        "asset_name": asset.asset_name,
+                        "asset_size": asset.asset_size,
+                        "asset_config": asset.asset_config or {},
+                    }
+                    for asset in project_assets
+                ],
+            },
+        )
+
+        return {
+            "message": ResponseMessageEnum.SNAPSHOT_EXPORT_SUCCESS.value,
+            "collection_name": collection_name,
+            "snapshot_name": snapshot_name,
+            **stats,
+        }
+
+    except Exception as e:
+        logger.error(f"Task failed: {str(e)}")
+        raise
+    finally:
+        try:
+            if db_engine is not None and hasattr(db_engine, "dispose"):
+                await db_engine.dispose()
+
+            if vectordb_client is not None and hasattr(vectordb_client, "disconnect"):
+                await vectordb_client.disconnect()
+        except Exception as e:
+            logger.error(f"Task failed while cleaning: {str(e)}")
+
+
+@celery_app.task(
+    bind=True,
+    name="tasks.collection_snapshots.task_import_collection_snapshot",
+)
+def task_import_collection_snapshot(self, project_id: int, snapshot_name: str):
+    return asyncio.run(
+        _import_collection_snapshot(
+            self, project_id=project_id, snapshot_name=snapshot_name
+        )
+    )
+
+
+async def _import_collection_snapshot(
+    task_instance, project_id: int, snapshot_name: str
+):
+    db_engine = vectordb_client = None
+    shadow_collection_name = project = None
+    imported_chunk_ids = []
+    try:
+        (
+            db_engine,
+            db_client,
+            llm_provider_factory,
+            vectordb_provider_factory,
+            generation_client,
+            embedding_client,
+            vectordb_client,
+            template_parser,
+        ) = await get_startup_setup()
+
+        project_model = await ProjectModel.create_instance(db_client=db_client)
+        project = await project_model.get_project_or_create_one(project_id=project_id)
+
+        nlp_controller = NLPController(
+            vectordb_client=vectordb_client,
+            generation_client=generation_client,
+            embedding_client=embedding_client,
+            template_parser=template_parser,
+            db_client=db_client,
+        )
+
+        snapshot_path = get_snapshot_path(project_id, snapshot_name)
+        collection_snapshot = CollectionSnapshot(
+            vectordb_client=vectordb_client,
+            batch_size=settings.VECTOR_DB_SNAPSHOT_BATCH_SIZE,
+        )
+        snapshot_meta = collection_snapshot.read_meta(snapshot_path)
+        if snapshot_meta is None:
+            raise Exception(f"No snapshot {snapshot_name} for project {project_id}")
+
+        # Queries are embedded with the configured model; vectors from
+        # another model size could never be searched
+        if snapshot_meta["embedding_size"] != int(embedding_client.embedding_size):
+            raise Exception(
+                f"Snapshot {snapshot_name} has {snapshot_meta['embedding_size']}-d "
+                f"vectors, the embedding model {embedding_client.embedding_size}-d"
+            )
+        # Same size isn't enough: another model embeds into another space
+        if (
+            snapshot_meta.get("embedding_model_id")
+            != embedding_client.embedding_model_id
+        ):
+            raise Exception(
+                f"Snapshot {snapshot_name} was embedded with "
+                f"{snapshot_meta.get('embedding_model_id')}, the embedding model "
+                f"is {embedding_client.embedding_model_id}"
+            )
+        if "assets" not in snapshot_meta:
+            raise Exception(
+                f"Snapshot {snapshot_name} has no assets to recreate its chunks "
+                f"under, export it again"
+            )
+
+        chunk_model = await ChunkModel.create_instance(db_client=db_client)
+        asset_ids = await get_snapshot_asset_ids(
+            db_client=db_client, project=project, snapshot_meta=snapshot_meta
+        )
+        chunks_orders = {}
+
+        async def import_chunks(batch_records: list) -> list:
+            # The snapshot ids belong to the exporting database: every record
+            # gets a new chunk here, and the collection row its id
+            chunks = []
+            for record in batch_records:
+                metadata = dict(record["metadata"] or {})
+                asset_id = asset_ids.get(metadata.pop("asset_id", None))
+                if asset_id is None:
+                    raise Exception(
+                        f"Snapshot {snapshot_name} chunk {record['chunk_id']} "
+                        f"belongs to no exported asset"
+                    )
+                chunks_orders[asset_id] = chunks_orders.get(asset_id, 0) + 1
+                chunks.append(
+                    DataChunk(
+                        chunk_text=record["text"],
+                        chunk_metadata=metadata,
+                        chunk_order=chunks_orders[asset_id],
+                        chunk_project_id=project.id,
+                        chunk_asset_id=asset_id,
+                    )
+                )
+
+            _ = await chunk_model.insert_many_chunks(chunks=chunks)
+            imported_chunk_ids.extend(chunk.id for chunk in chunks)
+
+            return [
+                {
+                    **record,
+                    "chunk_id": chunk.id,
+                    "metadata": {
+                        **(record["metadata"] or {}),
+                        "asset_id": chunk.chunk_asset_id,
+                    },
+                }
+                for record, chunk in zip(batch_records, chunks)
+            ]
+
+        rebuild_started_at = datetime.now(timezone.utc)
+        if settings.VECTOR_DB_BLUE_GREEN_REBUILDS:
+            # Loaded aside and swapped in like a rebuild, so searches never
+            # see a partially imported collection
+            collection_name = shadow_collection_name = (
+                nlp_controller.create_shadow_collection_name(
+                    project_id=project.project_id,
+                    embedding_size=snapshot_meta["embedding_size"],
+                )
+            )
+            # Asset deletes reach the shadow until it is swapped in or dropped
+            await nlp_controller.collection_alias_model.add_shadow_collection(
+                alias_name=nlp_controller.create_collection_alias_name(
+                    project_id=project.project_id
+                ),
+                collection_name=shadow_collection_name,
+                default_collection_name=nlp_controller.create_collection_name(
+                    project_id=project.project_id
+                ),
+            )
+        else:
+            # Replaced in place, like a reset push
+            collection_name = await nlp_controller.get_collection_name(project=project)
+            _ = await vectordb_client.delete_collection(collection_name)
+            await chunk_model.delete_chunks_by_project_id(project_id=project.id)
+
+        stats = await collection_snapshot.import_collection(
+            collection_name=collection_name,
+            snapshot_path=snapshot_path,
+            is_reset=True,
+            prepare_records=import_chunks,
+        )
+
+        if shadow_collection_name is not None and imported_chunk_ids:
+            # The live collection keeps referencing the older chunks until
+            # the shadow is swapped in; they are deleted with it
+            await chunk_model.supersede_chunks_by_project_id(
+                project_id=project.id, to_chunk_id=min(imported_chunk_ids)
+            )
+
+        if shadow_collection_name is None:
+            index_task = task_build_vector_index.delay(collection_name=collection_name)
+        else:
+            index_task = chain(
+                task_build_vector_index.si(collection_name=collection_name),
+                task_swap_collection_alias.si(
+                    alias_name=nlp_controller.create_collection_alias_name(
+                        project_id=project.project_id
+                    ),
+                    collection_name=collection_name,
+                    default_collection_name=nlp_controller.create_collection_name(
+                        project_id=project.project_id
+                    ),
+                    embedding_model_id=snapshot_meta.get("embedding_model_id"),
+                    embedding_size=int(snapshot_meta["embedding_size"]),
+                    project_id=project.id,
+                    rebuild_started_at=rebuild_started_at.isoformat(),
+                ),
+            ).apply_async(
+                # A shadow whose build or swap failed is never served
+                link_error=task_drop_collection.si(collection_name=collection_name)
+            )
+
+        return {
+            "message": ResponseMessageEnum.SNAPSHOT_IMPORT_SUCCESS.value,
+            "collection_name": collection_name,
+            "snapshot_name": snapshot_name,
+            "index_task_id": index_task.id,
+            **stats,
+        }
+
+    except Exception as e:
+        logger.error(f"Task failed: {str(e)}")
+        if shadow_collection_name is not None:
+            drop_kwargs = {"collection_name": shadow_collection_name}
+            if imported_chunk_ids:
+                # The chunks the shadow references go once it is dropped
+                try:
+                    await chunk_model.supersede_chunks_by_project_id(
+                        project_id=project.id, from_chunk_id=min(imported_chunk_ids)
+                    )
+                    drop_kwargs.update(
+                        project_id=project.id,
+                        superseded_before=datetime.now(timezone.utc).isoformat(),
+                    )
+                except Exception as supersede_error:
+                    logger.error(
+                        f"Task failed while superseding imported chunks: "
+                        f"{str(supersede_error)}"
+                    )
+            task_drop_collection.apply_async(kwargs=drop_kwargs)
+        raise
+    finally:
+        try:
+            if db_engine is not None and hasattr(db_engine, "dispose"):
+                await db_engine.dispose()
+
+            if vectordb_client is not None and hasattr(vectordb_client, "disconnect"):
+                await vectordb_client.disconnect()
+        except Exception as e:
+            logger.error(f"Task failed while cleaning: {str(e)}")
+
+
+async def get_snapshot_asset_ids(db_client, project, snapshot_meta: dict) -> dict:
+    """
+    Map the snapshot's asset ids to the project's assets of the same name,
+    creating the missing ones (as records only, the files aren't copied).
+    """
+    asset_model = await AssetModel.create_instance(db_client=db_client)
+
+    asset_ids = {}
+    for snapshot_asset in snapshot_meta["assets"]:
+        asset = await asset_model.get_asset_record(
+            asset_project_id=project.id, asset_name=snapshot_asset["asset_name"]
+        )
+        if asset is None:
+            asset = await asset_model.create_asset(
+                Asset(
+                    asset_type=snapshot_asset["asset_type"],
+                    asset_name=snapshot_asset["asset_name"],
+                    asset_size=snapshot_asset["asset_size"],
+                    asset_config=snapshot_asset["asset_config"],
+                    asset_project_id=project.id,
+                )
+            )
+        asset_ids[snapshot_asset["asset_id"]] = asset.id
+
+    return asset_ids
@@ -1,15 +1,22 @@
 import asyncio
 import logging
+from datetime import datetime, timezone
 
+from celery import chain
 from tqdm.auto import tqdm
 
-from celery_app import celery_app, get_startup_setup
+from celery_app import celery_app, get_startup_setup, settings
 from controllers import NLPController
 from models import (
     ChunkModel,
     ProjectModel,
     ResponseMessageEnum,
 )
+from tasks.vector_indexing import (
+    task_build_vector_index,
+    task_drop_collection,
+    task_swap_collection_alias,
+)
 
 logger = logging.getLogger("celery.task")
 
@@ -26,6 +33,7 @@ def task_index_project(self, project_id, is_reset: bool):
 
 async def _index_project(task_instance, project_id, is_reset: bool):
     db_engine = vectordb_client = None
+    shadow_collection_name = None
     try:
         (
             db_engine,
@@ -56,6 +64,7 @@ async def _index_project(task_instance, project_id, is_reset: bool):
             generation_client=generation_client,
             embedding_client=embedding_client,
             template_parser=template_parser,
+            db_client=db_client,
         )
 
         has_records = True
@@ -64,10 +73,41 @@ async def _index_project(task_instance, project_id, is_reset: bool):
         inserted_items_count = 0
         idx = 0
 
-        collection_name = nlp_controller.create_collection_name(
-            project_id=project.project_id
+        # A reset while processing files only superseded the old chunks, the
+        # live collection still holds them: that push has to rebuild too
+        rebuild_started_at = datetime.now(timezone.utc)
+        is_rebuild = settings.VECTOR_DB_BLUE_GREEN_REBUILDS and (
+            is_reset
+            or await nlp_controller.collection_alias_model.is_rebuild_requested(
+                nlp_controller.create_collection_alias_name(
+                    project_id=project.project_id
+                )
+            )
         )
 
+        if is_rebuild:
+            # Rebuild into a shadow collection, with the embedding model the
+            # workers are configured with, while searches keep using the
+            # live one; it is swapped in once loaded and indexed
+            collection_name = shadow_collection_name = (
+                nlp_controller.create_shadow_collection_name(
+                    project_id=project.project_id,
+                    embedding_size=embedding_client.embedding_size,
+                )
+            )
+            # Asset deletes reach the shadow until it is swapped in or dropped
+            await nlp_controller.collection_alias_model.add_shadow_collection(
+                alias_name=nlp_controller.create_collection_alias_name(
+                    project_id=project.project_id
+                ),
+                collection_name=shadow_collection_name,
+                default_collection_name=nlp_controller.create_collection_name(
+                    project_id=project.project_id
+                ),
+            )
+        else:
+            collection_name = await nlp_controller.get_collection_name(project=project)
+
         _ = await vectordb_client.create_collection(
             collection_name=collection_name,
             embedding_size=embedding_client.embedding_size,
@@ -96,6 +136,7 @@ async def _index_project(task_instance, project_id, is_reset: bool):
                 project=project,
                 chunks=page_chunks,
                 chunks_ids=chunks_ids,
+                collection_name=collection_name,
             )
 
             if not is_inserted:
@@ -110,6 +151,38 @@ async def _index_project(task_instance, project_id, is_reset: bool):
             pbar.update(len(page_chunks))
             inserted_items_count += len(page_chunks)
 
+        # Build the ANN index once the bulk load is done, off the indexing task
+        if shadow_collection_name is None:
+            index_task = task_build_vector_index.delay(collection_name=collection_name)
+        else:
+            # The shadow only goes live once its index is built
+            index_task = chain(
+                task_build_vector_index.si(collection_name=collection_name),
+                task_swap_collection_alias.si(
+                    alias_name=nlp_controller.create_collection_alias_name(
+                        project_id=project.project_id
+                    ),
+                    collection_name=collection_name,
+                    default_collection_name=nlp_controller.create_collection_name(
+                        project_id=project.project_id
+                    ),
+                    embedding_model_id=embedding_client.embedding_model_id,
+                    embedding_size=int(embedding_client.embedding_size),
+                    project_id=project.id,
+                    rebuild_started_at=rebuild_started_at.isoformat(),
+                ),
+            ).apply_async(
+                # A shadow whose build or swap failed is never served
+                link_error=task_drop_collection.si(collection_name=collection_name)
+            )
+
+        embedding_cache_stats = nlp_controller.embedding_cache_stats
+        logger.info(
+            f"Embedding cache for project {project_id}: "
+            f"{embedding_cache_stats['hits']} hits, "
+            f"{embedding_cache_stats['misses']} misses"
+        )
+
         task_instance.update_state(
             state="SUCCESS",
             meta={"message": ResponseMessageEnum.INSERT_INTO_VECTORDB_SUCCESS.value},
@@ -119,10 +192,16 @@ async def _index_project(task_instance, project_id, is_reset: bool):
             {
                 "message": ResponseMessageEnum.INSERT_INTO_VECTORDB_SUCCESS.value,
                 "inserted_items_count": inserted_items_count,
+                "index_task_id": index_task.id,
+                "embedding_cache_hits": embedding_cache_stats["hits"],
+                "embedding_cache_misses": embedding_cache_stats["misses"],
             },
         )
     except Exception as e:
         logger.error(f"Task failed: {str(e)}")
+        if shadow_collection_name is not None:
+            # A partially loaded shadow is never swapped in
+            task_drop_collection.delay(collection_name=shadow_collection_name)
         task_instance.update_state(
             state="FAILURE",
             meta={
@@ -140,6 +219,6 @@ async def _index_project(task_instance, project_id, is_reset: bool):
 
             # Ensure vectordb_client is not None and has a disconnect method
             if vectordb_client is not None and hasattr(vectordb_client, "disconnect"):
-                vectordb_client.disconnect()
+                await vectordb_client.disconnect()
         except Exception as e:
             logger.error(f"Task failed while cleaning: {str(e)}")
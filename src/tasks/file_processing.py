@@ -121,6 +121,7 @@ async def _process_project_files(
             generation_client=generation_client,
             embedding_client=embedding_client,
             template_parser=template_parser,
+            db_client=db_client,
         )
 
         chunk_model = await ChunkModel.create_instance(db_client=db_client)
@@ -180,12 +181,25 @@ async def _process_project_files(
         processed_files = 0
 
         if is_reset:
-            collection_name = nlp_controller.create_collection_name(
-                project_id=project.project_id
-            )
-            _ = await vectordb_client.delete_collection(collection_name)
-
-            await chunk_model.delete_chunks_by_project_id(project_id=project.id)
+            if settings.VECTOR_DB_BLUE_GREEN_REBUILDS:
+                # The live collection keeps serving (and referencing) the old
+                # chunks until the rebuilt one is swapped in; they are deleted
+                # with it. The next index push rebuilds even without a reset
+                await chunk_model.supersede_chunks_by_project_id(project_id=project.id)
+                await nlp_controller.collection_alias_model.request_rebuild(
+                    alias_name=nlp_controller.create_collection_alias_name(
+                        project_id=project.project_id
+                    ),
+                    default_collection_name=nlp_controller.create_collection_name(
+                        project_id=project.project_id
+                    ),
+                )
+            else:
+                collection_name = await nlp_controller.get_collection_name(
+                    project=project
+                )
+                _ = await vectordb_client.delete_collection(collection_name)
+                await chunk_model.delete_chunks_by_project_id(project_id=project.id)
 
         for asset_id, file_id in project_file_ids.items():
             file_content = process_controller.get_file_content(file_id=file_id)
@@ -264,6 +278,6 @@ async def _process_project_files(
 
             # Ensure vectordb_client is not None and has a disconnect method
             if vectordb_client is not None and hasattr(vectordb_client, "disconnect"):
-                vectordb_client.disconnect()
+                await vectordb_client.disconnect()
         except Exception as e:
             logger.error(f"Task failed while cleaning: {str(e)}")
@@ -0,0 +1,259 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from celery_app import celery_app, get_startup_setup, settings
+from models import ChunkModel, CollectionAliasModel
+
+logger = logging.getLogger("celery.task")
+
+
+@celery_app.task(
+    bind=True,
+    name="tasks.vector_indexing.task_build_vector_index",
+    autoretry_for=(Exception,),
+    retry_kwargs={"max_retries": 3, "countdown": 60},
+    time_limit=settings.CELERY_INDEX_BUILD_TIME_LIMIT,
+)
+def task_build_vector_index(self, collection_name: str):
+    return asyncio.run(_build_vector_index(self, collection_name=collection_name))
+
+
+async def _build_vector_index(task_instance, collection_name: str):
+    db_engine = vectordb_client = None
+    try:
+        (
+            db_engine,
+            db_client,
+            llm_provider_factory,
+            vectordb_provider_factory,
+            generation_client,
+            embedding_client,
+            vectordb_client,
+            template_parser,
+        ) = await get_startup_setup()
+
+        maintain_vector_index = getattr(vectordb_client, "maintain_vector_index", None)
+        if not callable(maintain_vector_index):
+            # The backend maintains its own index (e.g. Qdrant)
+            return {"collection_name": collection_name, "is_built": False}
+
+        # Creates the index, or rebuilds it once the collection outgrew it
+        is_built = await maintain_vector_index(collection_name=collection_name)
+
+        # An index the planner ignores leaves every search a sequential scan
+        is_search_using_index = getattr(vectordb_client, "is_search_using_index", None)
+        if (
+            callable(is_search_using_index)
+            and await vectordb_client.is_index_existed(collection_name=collection_name)
+            and not await is_search_using_index(collection_name=collection_name)
+        ):
+            logger.error(
+                f"Searches on collection {collection_name} don't use its vector index"
+            )
+
+        return {"collection_name": collection_name, "is_built": bool(is_built)}
+
+    except Exception as e:
+        logger.error(f"Task failed: {str(e)}")
+        raise
+    finally:
+        try:
+            if db_engine is not None and hasattr(db_engine, "dispose"):
+                await db_engine.dispose()
+
+            if vectordb_client is not None and hasattr(vectordb_client, "disconnect"):
+                await vectordb_client.disconnect()
+        except Exception as e:
+            logger.error(f"Task failed while cleaning: {str(e)}")
+
+
+@celery_app.task(
+    bind=True,
+    name="tasks.vector_indexing.task_swap_collection_alias",
+    autoretry_for=(Exception,),
+    retry_kwargs={"max_retries": 3, "countdown": 60},
+)
+def task_swap_collection_alias(
+    self,
+    alias_name: str,
+    collection_name: str,
+    default_collection_name: str | None = None,
+    embedding_model_id: str | None = None,
+    embedding_size: int | None = None,
+    project_id: int | None = None,
+    rebuild_started_at: str | None = None,
+):
+    return asyncio.run(
+        _swap_collection_alias(
+            self,
+            alias_name=alias_name,
+            collection_name=collection_name,
+            default_collection_name=default_collection_name,
+            embedding_model_id=embedding_model_id,
+            embedding_size=embedding_size,
+            project_id=project_id,
+            rebuild_started_at=rebuild_started_at,
+        )
+    )
+
+
+async def _swap_collection_alias(
+    task_instance,
+    alias_name: str,
+    collection_name: str,
+    default_collection_name: str | None = None,
+    embedding_model_id: str | None = None,
+    embedding_size: int | None = None,
+    project_id: int | None = None,
+    rebuild_started_at: str | None = None,
+):
+    db_engine = vectordb_client = None
+    try:
+        (
+            db_engine,
+            db_client,
+            llm_provider_factory,
+            vectordb_provider_factory,
+            generation_client,
+            embedding_client,
+            vectordb_client,
+            template_parser,
+        ) = await get_startup_setup()
+
+        collection_alias_model = await CollectionAliasModel.create_instance(
+            db_client=db_client
+        )
+        previous_collection_name = await collection_alias_model.swap_alias(
+            alias_name=alias_name,
+            collection_name=collection_name,
+            embedding_model_id=embedding_model_id,
+            embedding_size=embedding_size,
+            default_collection_name=default_collection_name,
+            # Chunks replaced after the shadow started loading aren't in it
+            rebuild_started_at=(
+                datetime.fromisoformat(rebuild_started_at)
+                if rebuild_started_at is not None
+                else None
+            ),
+        )
+
+        drop_task = None
+        if previous_collection_name and previous_collection_name != collection_name:
+            # Processes cache the alias for a while; keep the old collection
+            # until none of them can still be searching it. The chunks it
+            # references were superseded before this swap and go with it
+            drop_task = task_drop_collection.apply_async(
+                kwargs={
+                    "collection_name": previous_collection_name,
+                    "project_id": project_id,
+                    "superseded_before": datetime.now(timezone.utc).isoformat(),
+                },
+                countdown=settings.VECTOR_DB_ALIAS_GC_DELAY,
+            )
+
+        return {
+            "alias_name": alias_name,
+            "collection_name": collection_name,
+            "previous_collection_name": previous_collection_name,
+            "drop_task_id": drop_task.id if drop_task is not None else None,
+        }
+
+    except Exception as e:
+        logger.error(f"Task failed: {str(e)}")
+        raise
+    finally:
+        try:
+            if db_engine is not None and hasattr(db_engine, "dispose"):
+                await db_engine.dispose()
+
+            if vectordb_client is not None and hasattr(vectordb_client, "disconnect"):
+                await vectordb_client.disconnect()
+        except Exception as e:
+            logger.error(f"Task failed while cleaning: {str(e)}")
+
+
+@celery_app.task(
+    bind=True,
+    name="tasks.vector_indexing.task_drop_collection",
+    autoretry_for=(Exception,),
+    retry_kwargs={"max_retries": 3, "countdown": 60},
+)
+def task_drop_collection(
+    self,
+    collection_name: str,
+    project_id: int | None = None,
+    superseded_before: str | None = None,
+):
+    return asyncio.run(
+        _drop_collection(
+            self,
+            collection_name=collection_name,
+            project_id=project_id,
+            superseded_before=superseded_before,
+        )
+    )
+
+
+async def _drop_collection(
+    task_instance,
+    collection_name: str,
+    project_id: int | None = None,
+    superseded_before: str | None = None,
+):
+    db_engine = vectordb_client = None
+    try:
+        (
+            db_engine,
+            db_client,
+            llm_provider_factory,
+            vectordb_provider_factory,
+            generation_client,
+            embedding_client,
+            vectordb_client,
+            template_parser,
+        ) = await get_startup_setup()
+
+        collection_alias_model = await CollectionAliasModel.create_instance(
+            db_client=db_client
+        )
+        if await collection_alias_model.is_collection_aliased(collection_name):
+            # Swapped back in since the drop was scheduled
+            return {"collection_name": collection_name, "is_dropped": False}
+
+        _ = await vectordb_client.delete_collection(collection_name)
+        await collection_alias_model.release_collection(collection_name)
+
+        deleted_chunks_count = 0
+        if project_id is not None and superseded_before is not None:
+            chunk_model = await ChunkModel.create_instance(db_client=db_client)
+            try:
+                deleted_chunks_count = await chunk_model.delete_superseded_chunks(
+                    project_id=project_id,
+                    superseded_before=datetime.fromisoformat(superseded_before),
+                )
+            except Exception as e:
+                # Still referenced by another retired collection; its own
+                # drop deletes them
+                logger.warning(
+                    f"Superseded chunks of project {project_id} kept: {str(e)}"
+                )
+
+        return {
+            "collection_name": collection_name,
+            "is_dropped": True,
+            "deleted_chunks_count": deleted_chunks_count,
+        }
+
+    except Exception as e:
+        logger.error(f"Task failed: {str(e)}")
+        raise
+    finally:
+        try:
+            if db_engine is not None and hasattr(db_engine, "dispose"):
+                await db_engine.dispose()
+
+            if vectordb_client is not None and hasattr(vectordb_client, "disconnect"):
+                await vectordb_client.disconnect()
+        except Exception as e:
+            logger.error(f"Task failed while cleaning: {str(e)}")
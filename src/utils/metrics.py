@@ -1,15 +1,63 @@
 import time
 
 from fastapi import FastAPI, Request, Response
-from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from stores.vectordb.SearchResultCache import SearchResultCache
+
 REQUEST_COUNT = Counter(
     "http_requests_total", "Total HTTP Requests", ["method", "endpoint", "status"]
 )
 REQUEST_LATENCY = Histogram(
     "http_request_duration_seconds", "HTTP Request Latency", ["method", "endpoint"]
 )
+SEARCH_LATENCY = Histogram(
+    "vectordb_search_duration_seconds",
+    "Retrieval latency (excluding query embedding)",
+    ["mode"],
+)
+SEARCH_CACHE_REQUESTS = Counter(
+    "vectordb_search_cache_requests_total",
+    "Search result cache lookups",
+    ["result"],
+)
+SEARCH_CACHE_ENTRIES = Gauge(
+    "vectordb_search_cache_entries", "Search results currently cached"
+)
+SEARCH_CACHE_SIZE = Gauge(
+    "vectordb_search_cache_size_bytes", "Approximate size of the cached results"
+)
+SEARCH_CACHE_HIT_RATIO = Gauge(
+    "vectordb_search_cache_hit_ratio", "Search result cache hits over lookups"
+)
+EMBEDDING_CACHE_REQUESTS = Counter(
+    "embedding_cache_requests_total",
+    "Embedding cache lookups of indexed document texts",
+    ["result"],
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections", "Database connections currently in use"
+)
+DB_POOL_IDLE = Gauge(
+    "db_pool_idle_connections", "Database connections idle in the pool"
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Database connections opened beyond pool_size (negative while the pool fills)",
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a database connection from the pool",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
 
 
 class PrometheusMiddleware(BaseHTTPMiddleware):
@@ -42,3 +90,28 @@ def setup_metrics(app: FastAPI):
     @app.get("/srYh433eI0cnoK", include_in_schema=False)
     def metrics():
         return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+def setup_db_pool_metrics(engine: AsyncEngine):
+    """
+    Report the connection pool state of the engine on every scrape
+    """
+
+    def get_pool_stat(stat_name: str):
+        # Read the current pool: it is replaced on dispose(), and pools
+        # without queueing (pgbouncer mode) have no stats
+        stat = getattr(engine.sync_engine.pool, stat_name, None)
+        return stat() if callable(stat) else 0
+
+    DB_POOL_CHECKED_OUT.set_function(lambda: get_pool_stat("checkedout"))
+    DB_POOL_IDLE.set_function(lambda: get_pool_stat("checkedin"))
+    DB_POOL_OVERFLOW.set_function(lambda: get_pool_stat("overflow"))
+
+
+def setup_search_cache_metrics(search_cache: SearchResultCache):
+    """
+    Report the search result cache state on every scrape
+    """
+    SEARCH_CACHE_ENTRIES.set_function(lambda: search_cache.get_stats()["size"])
+    SEARCH_CACHE_SIZE.set_function(lambda: search_cache.get_stats()["size_bytes"])
+    SEARCH_CACHE_HIT_RATIO.set_function(lambda: search_cache.get_stats()["hit_ratio"])